@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Benchmark embeddings, health checks and chat streaming against Ollama.
+
+By default a local Ollama stand-in (src/utils/ollama_standin.py) is started
+with the requested latency profile, so results are reproducible without a
+GPU. Pass --base-url to measure a real Ollama server instead.
+
+Usage:
+    python scripts/benchmark_ollama.py --texts 500 --embedding-latency lognormal:0.03,0.4
+    python scripts/benchmark_ollama.py --max-concurrency 4 --error-rate 0.02
+    python scripts/benchmark_ollama.py --base-url http://localhost:11434
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import src.api.main  # noqa: F401  (loads the routes package before importing a route module)
+from src.api.routes.health import check_ollama_health
+from src.pipeline.embedding_backends import OllamaBackend
+from src.pipeline.embeddings import EmbeddingGenerator
+from src.utils.ollama_standin import LatencyDistribution, StandinConfig, StandinServer
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summarize latency samples in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {
+        "p50_ms": round(pick(0.50), 2),
+        "p95_ms": round(pick(0.95), 2),
+        "p99_ms": round(pick(0.99), 2),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+    }
+
+
+class TimedOllamaBackend(OllamaBackend):
+    """Ollama backend that records per-request latency."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies: List[float] = []
+
+    async def embed(self, text: str) -> List[float]:
+        start = time.perf_counter()
+        try:
+            return await super().embed(text)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+async def bench_embeddings(base_url: str, n_texts: int, batch_size: int) -> Dict:
+    """Embed n_texts unique texts through EmbeddingGenerator with a cold cache."""
+    texts = [
+        f"Passage {i}: the company rode from Bree toward Weathertop " * (1 + i % 8)
+        for i in range(n_texts)
+    ]
+    backend = TimedOllamaBackend(base_url=base_url)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        generator = EmbeddingGenerator(
+            cache_dir=cache_dir, batch_size=batch_size, max_retries=1, backend=backend
+        )
+        start = time.perf_counter()
+        embeddings = await generator.batch_generate_embeddings(texts, ignore_errors=True)
+        elapsed = time.perf_counter() - start
+
+    return {
+        "texts": n_texts,
+        "embedded": len(embeddings),
+        "seconds": round(elapsed, 3),
+        "texts_per_second": round(len(embeddings) / elapsed, 1) if elapsed else None,
+        "request_latency": percentiles(backend.latencies),
+    }
+
+
+async def bench_health(base_url: str, rounds: int) -> Dict:
+    """Time repeated health checks."""
+    samples = []
+    healthy = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        healthy += await check_ollama_health(base_url)
+        samples.append(time.perf_counter() - start)
+    return {"rounds": rounds, "healthy": healthy, "latency": percentiles(samples)}
+
+
+async def bench_chat(base_url: str, model: str, streams: int) -> Dict:
+    """Measure time to first token and token rate of concurrent streamed chats."""
+
+    async def one_stream(client: httpx.AsyncClient) -> Dict[str, float]:
+        start = time.perf_counter()
+        first_token = None
+        tokens = 0
+        async with client.stream(
+            "POST", f"{base_url}/v1/chat/completions",
+            json={"model": model, "stream": True,
+                  "messages": [{"role": "user", "content": "Who is Aragorn?"}]},
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data: ") or line == "data: [DONE]":
+                    continue
+                delta = json.loads(line[6:])["choices"][0]["delta"]
+                if delta.get("content"):
+                    tokens += 1
+                    first_token = first_token or time.perf_counter() - start
+        total = time.perf_counter() - start
+        return {"ttft": first_token or total, "tokens": tokens, "total": total}
+
+    async with httpx.AsyncClient(timeout=120.0) as client:
+        results = await asyncio.gather(
+            *[one_stream(client) for _ in range(streams)], return_exceptions=True
+        )
+    ok = [r for r in results if isinstance(r, dict)]
+    return {
+        "streams": streams,
+        "failed": streams - len(ok),
+        "time_to_first_token": percentiles([r["ttft"] for r in ok]),
+        "tokens_per_second": round(
+            statistics.fmean(r["tokens"] / r["total"] for r in ok), 1
+        ) if ok else None,
+    }
+
+
+async def run(args: argparse.Namespace, base_url: str) -> Dict:
+    """Run all benchmarks against base_url."""
+    return {
+        "base_url": base_url,
+        "embeddings": await bench_embeddings(base_url, args.texts, args.batch_size),
+        "health": await bench_health(base_url, args.health_rounds),
+        "chat": await bench_chat(base_url, args.chat_model, args.chat_streams),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", help="Benchmark a real Ollama server instead of the stand-in")
+    parser.add_argument("--texts", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--health-rounds", type=int, default=20)
+    parser.add_argument("--chat-streams", type=int, default=4)
+    parser.add_argument("--chat-model", default="llama3.2:latest")
+    parser.add_argument("--embedding-latency", default="lognormal:0.02,0.5")
+    parser.add_argument("--chat-latency", default="lognormal:0.2,0.3")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.base_url:
+        report = asyncio.run(run(args, args.base_url.rstrip("/")))
+    else:
+        config = StandinConfig(
+            embedding_latency=LatencyDistribution.parse(args.embedding_latency),
+            chat_latency=LatencyDistribution.parse(args.chat_latency),
+            error_rate=args.error_rate,
+            max_concurrency=args.max_concurrency,
+            tokens_per_second=args.tokens_per_second,
+            seed=args.seed,
+        )
+        with StandinServer(config) as server:
+            report = asyncio.run(run(args, server.base_url))
+            report["standin"] = vars(server.stats)
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
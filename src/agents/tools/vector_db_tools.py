@@ -243,8 +243,8 @@ def create_chunk_context_tool(vector_store: VectorStore):
             return {
                 "chunk_id": chunk_id,
                 "chunk": target_chunk.to_dict() if target_chunk and hasattr(target_chunk, 'to_dict') else (asdict(target_chunk) if target_chunk else None),
-                "before_chunks": [asdict(c) for c in before_chunks],
-                "after_chunks": [asdict(c) for c in after_chunks],
+                "before_chunks": [c.to_dict() for c in before_chunks],
+                "after_chunks": [c.to_dict() for c in after_chunks],
                 "document_id": document_id,
                 "total_context": total_context.strip()
             }
@@ -45,6 +45,7 @@ except ImportError:
     Agent = None
 
 from src.utils.fastagent_client import initialize_fastagent, FastAgentError
+from src.pipeline.circuit_breaker import is_connection_failure, ollama_breaker
 
 logger = logging.getLogger(__name__)
 
@@ -395,7 +396,11 @@ Output Format:
             try:
                 # Call the agent with search query
                 # In production, this would trigger the MCP tools
-                response = await self.agent.run(f"Search for: {query}")
+                # Guarded by the shared Ollama breaker to fail fast during outages;
+                # only connection errors and timeouts count, since the run also
+                # executes search tools whose errors say nothing about Ollama
+                with ollama_breaker.guard(is_connection_failure):
+                    response = await self.agent.run(f"Search for: {query}")
                 # Parse response and return results
                 # For now, this is mainly for test compatibility
                 logger.info("Agent search executed")
@@ -2,7 +2,8 @@
 Dependency injection functions for FastAPI routes.
 
 This module provides FastAPI dependency functions that give routes access to
-shared services like VectorStore, DocumentRegistry, and QueryLogger.
+shared services like VectorStore, DocumentRegistry, QueryLogger and
+ExtractionCache.
 
 The dependencies are initialized during application startup in main.py and
 stored in app_state. These functions retrieve the initialized instances.
@@ -23,6 +24,7 @@ See Also:
     - src.database.vector_store: VectorStore implementation
     - src.database.document_registry: DocumentRegistry implementation
     - src.database.query_logger: QueryLogger implementation
+    - src.pipeline.extraction_cache: ExtractionCache implementation
 """
 
 from typing import TYPE_CHECKING
@@ -31,6 +33,7 @@ if TYPE_CHECKING:
     from src.database.vector_store import VectorStore
     from src.database.document_registry import DocumentRegistry
     from src.database.query_logger import QueryLogger
+    from src.pipeline.extraction_cache import ExtractionCache
 
 # Import app_state from main
 # This works because app_state is a module-level variable, not a class/function
@@ -125,3 +128,22 @@ def get_query_logger() -> "QueryLogger":
     if main.app_state.get("query_logger") is None:
         raise RuntimeError("Query logger not initialized")
     return main.app_state["query_logger"]
+
+
+def get_extraction_cache() -> "ExtractionCache":
+    """
+    Dependency injection for ExtractionCache.
+
+    Returns:
+        ExtractionCache instance from application state
+
+    Raises:
+        RuntimeError: If extraction cache not initialized
+
+    Note:
+        Documents are cached by the ingestion pipeline when it is given the
+        same cache directory; the API only reads it.
+    """
+    if main.app_state.get("extraction_cache") is None:
+        raise RuntimeError("Extraction cache not initialized")
+    return main.app_state["extraction_cache"]
@@ -41,6 +41,8 @@ from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
 from typing import Dict, Any
+from pathlib import Path
+import asyncio
 import time
 
 from src.api.routes import health_router, documents_router, search_router, chat_router
@@ -56,9 +58,31 @@ app_state: Dict[str, Any] = {
     "vector_store": None,  # VectorStore instance for semantic search
     "document_registry": None,  # DocumentRegistry for tracking document metadata
     "query_logger": None,  # QueryLogger for tracking user queries and analytics
+    "extraction_cache": None,  # ExtractionCache with extracted page text per document
+    "query_warmup_task": None,  # Background task pre-embedding popular queries
 }
 
 
+async def warm_query_embeddings(embedding_generator, query_logger, limit: int) -> int:
+    """
+    Pre-compute embeddings for the most popular logged queries.
+
+    Args:
+        embedding_generator: EmbeddingGenerator whose query cache to warm
+        query_logger: QueryLogger providing popular queries
+        limit: Number of popular queries to embed
+
+    Returns:
+        Number of queries warmed (0 on failure)
+    """
+    try:
+        popular = await query_logger.get_popular_queries(limit=limit)
+        return await embedding_generator.warm_query_cache(item["query"] for item in popular)
+    except Exception as e:
+        logger.warning(f"Query embedding warmup failed: {e}")
+        return 0
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -85,11 +109,19 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Buddharauer API...")
 
     try:
-        # Initialize VectorStore for semantic search
+        # Initialize VectorStore for semantic search, using the configured embedding backend
         from src.database.vector_store import VectorStore
+        from src.pipeline.embeddings import EmbeddingGenerator
+        from src.utils.config import load_config, ConfigError
+        try:
+            config = load_config()
+        except ConfigError:
+            config = {}
+        embedding_generator = EmbeddingGenerator.from_config(config)
         app_state["vector_store"] = VectorStore(
             persist_directory="./vector_db",
-            collection_name="documents"
+            collection_name="documents",
+            embedding_generator=embedding_generator
         )
         logger.info("Vector store initialized")
 
@@ -99,12 +131,25 @@ async def lifespan(app: FastAPI):
         await app_state["document_registry"].initialize()
         logger.info("Document registry initialized")
 
+        # Extracted page text, keyed by document ID (file hash)
+        from src.pipeline.extraction_cache import ExtractionCache
+        app_state["extraction_cache"] = ExtractionCache(Path("data_storage/extraction_cache"))
+        logger.info("Extraction cache initialized")
+
         # Initialize QueryLogger for tracking user queries
         from src.database.query_logger import QueryLogger
         app_state["query_logger"] = QueryLogger("data_storage/queries.db")
         await app_state["query_logger"].initialize()
         logger.info("Query logger initialized")
 
+        # Pre-embed the most popular queries in the background so startup
+        # does not wait on the embedding model
+        warmup = ((config.get("embeddings") or {}).get("queries") or {}).get("warmup", 100)
+        if warmup:
+            app_state["query_warmup_task"] = asyncio.create_task(
+                warm_query_embeddings(embedding_generator, app_state["query_logger"], warmup)
+            )
+
         # Initialize FastAgent agents for Phase 3 chat functionality
         try:
             from src.api.routes.chat import initialize_agents
@@ -136,6 +181,10 @@ async def lifespan(app: FastAPI):
         # Cleanup VectorStore resources
         # Note: Current VectorStore implementation doesn't require explicit cleanup
         # Future ChromaDB integration may need client.close() or similar
+        warmup_task = app_state.get("query_warmup_task")
+        if warmup_task and not warmup_task.done():
+            warmup_task.cancel()
+
         if app_state.get("vector_store"):
             logger.debug("VectorStore cleanup complete")
 
@@ -13,6 +13,7 @@ All models use Pydantic for automatic validation and OpenAPI schema generation.
 from .requests import SearchRequest, DocumentUploadRequest
 from .responses import (
     HealthResponse,
+    CircuitBreakerStatus,
     DocumentResponse,
     DocumentListResponse,
     SearchResponse,
@@ -27,6 +28,7 @@ __all__ = [
 
     # Responses
     "HealthResponse",
+    "CircuitBreakerStatus",
     "DocumentResponse",
     "DocumentListResponse",
     "SearchResponse",
@@ -27,6 +27,31 @@ from typing import Optional, Dict, List, Any
 from datetime import datetime
 
 
+class CircuitBreakerStatus(BaseModel):
+    """
+    State of a circuit breaker guarding an external service.
+
+    Attributes:
+        name: Circuit name (e.g. "ollama")
+        state: closed, open or half_open
+        consecutive_failures: Failures since the last success
+        total_failures: Failures since startup
+        rejected_calls: Calls failed fast while the circuit was open
+        retry_after_seconds: Time until an open circuit allows a probe
+        retry_budget_available: Retry tokens left in the shared budget
+    """
+    name: str = Field(..., description="Circuit name")
+    state: str = Field(..., description="closed, open or half_open")
+    consecutive_failures: int = Field(default=0, ge=0)
+    total_failures: int = Field(default=0, ge=0)
+    rejected_calls: int = Field(default=0, ge=0)
+    retry_after_seconds: float = Field(default=0.0, ge=0.0)
+    retry_budget_available: Optional[float] = Field(
+        default=None,
+        description="Retry tokens left in the shared retry budget"
+    )
+
+
 class HealthResponse(BaseModel):
     """
     Response model for system health checks.
@@ -37,6 +62,7 @@ class HealthResponse(BaseModel):
         vector_db_status: Vector database status
         documents_indexed: Number of documents in vector store
         uptime_seconds: API uptime in seconds
+        ollama_circuit: State of the Ollama circuit breaker
 
     Example:
         {
@@ -44,7 +70,8 @@ class HealthResponse(BaseModel):
             "ollama_connected": true,
             "vector_db_status": "operational",
             "documents_indexed": 47,
-            "uptime_seconds": 3600.5
+            "uptime_seconds": 3600.5,
+            "ollama_circuit": {"name": "ollama", "state": "closed", ...}
         }
     """
     status: str = Field(
@@ -69,6 +96,10 @@ class HealthResponse(BaseModel):
         ge=0.0,
         description="API uptime in seconds"
     )
+    ollama_circuit: Optional[CircuitBreakerStatus] = Field(
+        default=None,
+        description="Ollama circuit breaker state"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -29,6 +29,7 @@ Usage Example:
 from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Depends
 from typing import List, Optional
 from pathlib import Path
+import asyncio
 import time
 from datetime import datetime
 
@@ -42,7 +43,7 @@ from src.utils.logging import get_logger
 
 # Import dependency injection functions
 # These will be used to access shared services (DocumentRegistry, VectorStore)
-from src.api.dependencies import get_document_registry, get_vector_store
+from src.api.dependencies import get_document_registry, get_extraction_cache, get_vector_store
 
 logger = get_logger(__name__)
 
@@ -229,17 +230,22 @@ async def get_document(
 @router.get("/{document_id}/content", status_code=200)
 async def get_document_content(
     document_id: str,
-    format: str = Query(default="markdown", pattern="^(markdown|text)$")
+    format: str = Query(default="markdown", pattern="^(markdown|text)$"),
+    cache = Depends(get_extraction_cache)
 ):
     """
     Get the processed content of a document.
 
+    Content is read from the extraction cache filled at ingestion time, so
+    no PDF is parsed while serving the request.
+
     Args:
-        document_id: Unique document identifier
+        document_id: Unique document identifier (hash of file content)
         format: Output format (markdown or text)
+        cache: ExtractionCache instance (injected dependency)
 
     Returns:
-        Document content as text or markdown
+        Dict with the document ID, format, title, page count and content
 
     Raises:
         HTTPException 404: Document not found
@@ -255,28 +261,39 @@ async def get_document_content(
         ```
 
     Note:
-        - Markdown format includes formatting and structure
-        - Text format is plain text without formatting
-        - Content is cached after first generation
+        - Markdown format adds a title heading and a heading per page
+        - Text format is the page texts separated by blank lines
+        - Only documents ingested with an extraction cache have content
     """
     try:
-        # TODO: Implement content retrieval
-        # This would:
-        # 1. Check if document exists
-        # 2. Load processed content from disk
-        # 3. Convert to requested format
-        # 4. Return content
-
         logger.info(f"Retrieving content for {document_id} in {format} format")
 
-        raise HTTPException(
-            status_code=404,
-            detail=ErrorResponse(
-                error="NotFoundError",
-                message="Document content not found",
-                details={"document_id": document_id}
-            ).model_dump()
-        )
+        cached = await asyncio.to_thread(cache.load, document_id)
+        if cached is None:
+            raise HTTPException(
+                status_code=404,
+                detail=ErrorResponse(
+                    error="NotFoundError",
+                    message="Document content not found",
+                    details={"document_id": document_id}
+                ).model_dump()
+            )
+
+        metadata, pages = cached
+        if format == "markdown":
+            sections = [f"# {metadata.title or document_id}"] + [
+                f"## Page {page.number}\n\n{page.text.strip()}" for page in pages
+            ]
+        else:
+            sections = [page.text.strip() for page in pages]
+
+        return {
+            "document_id": document_id,
+            "format": format,
+            "title": metadata.title,
+            "pages": metadata.page_count,
+            "content": "\n\n".join(sections)
+        }
 
     except HTTPException:
         raise
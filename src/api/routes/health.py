@@ -22,16 +22,19 @@ Example Response:
         "ollama_connected": true,
         "vector_db_status": "operational",
         "documents_indexed": 47,
-        "uptime_seconds": 3600.5
+        "uptime_seconds": 3600.5,
+        "ollama_circuit": {"name": "ollama", "state": "closed", ...}
     }
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import time
 import httpx
 
-from src.api.models.responses import HealthResponse
+from src.api.models.responses import HealthResponse, CircuitBreakerStatus
+from src.pipeline.circuit_breaker import CircuitOpenError, ollama_breaker, retry_budget
+from src.utils.config import OLLAMA_BASE_URL
 from src.utils.logging import get_logger
 
 # Import dependency injection functions
@@ -53,22 +56,33 @@ router = APIRouter(
 API_START_TIME = time.time()
 
 
-async def check_ollama_health() -> bool:
+async def check_ollama_health(base_url: Optional[str] = None) -> bool:
     """
     Check if Ollama service is accessible.
 
+    Args:
+        base_url: Ollama server URL (defaults to OLLAMA_BASE_URL)
+
     Returns:
         bool: True if Ollama is responding, False otherwise
 
     Note:
         This makes a simple HTTP request to Ollama's API to verify connectivity.
         Timeout is set to 2 seconds to avoid blocking health checks.
+        The request goes through the shared Ollama circuit breaker: while the
+        circuit is open this returns False without touching the network.
     """
     try:
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            # Try to reach Ollama's API endpoint
-            response = await client.get("http://localhost:11434/api/tags")
-            return response.status_code == 200
+        with ollama_breaker:
+            async with httpx.AsyncClient(timeout=2.0) as client:
+                # Try to reach Ollama's API endpoint
+                response = await client.get(f"{(base_url or OLLAMA_BASE_URL).rstrip('/')}/api/tags")
+                # Server errors count as failures on the breaker
+                response.raise_for_status()
+                return response.status_code == 200
+    except CircuitOpenError as e:
+        logger.debug(f"Ollama health check skipped: {e}")
+        return False
     except Exception as e:
         logger.warning(f"Ollama health check failed: {e}")
         return False
@@ -176,7 +190,11 @@ async def health_check(
         ollama_connected=ollama_healthy,
         vector_db_status=vector_db_status,
         documents_indexed=documents_indexed,
-        uptime_seconds=uptime
+        uptime_seconds=uptime,
+        ollama_circuit=CircuitBreakerStatus(
+            **ollama_breaker.snapshot(),
+            retry_budget_available=retry_budget.snapshot()["available"]
+        )
     )
 
 
@@ -70,7 +70,7 @@ import aiosqlite
 import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Literal
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, asdict
 
 from src.utils.logging import get_logger
@@ -238,7 +238,7 @@ class QueryLogger:
             ...     user_id="faraday"
             ... )
         """
-        now = datetime.now(datetime.UTC).isoformat()
+        now = datetime.now(timezone.utc).isoformat()
         metadata_json = json.dumps(metadata) if metadata else None
 
         async with aiosqlite.connect(self.db_path) as db:
@@ -403,7 +403,7 @@ class QueryLogger:
 
         params = []
         if days is not None:
-            cutoff = (datetime.now(datetime.UTC) - timedelta(days=days)).isoformat()
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
             query += " WHERE timestamp >= ?"
             params.append(cutoff)
 
@@ -444,7 +444,7 @@ class QueryLogger:
         params = []
 
         if days is not None:
-            cutoff = (datetime.now(datetime.UTC) - timedelta(days=days)).isoformat()
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
             where_clause = " WHERE timestamp >= ?"
             params.append(cutoff)
 
@@ -528,7 +528,7 @@ class QueryLogger:
             >>> deleted = await logger.delete_old_queries(90)
             >>> print(f"Deleted {deleted} old queries")
         """
-        cutoff = (datetime.now(datetime.UTC) - timedelta(days=days)).isoformat()
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
 
         async with aiosqlite.connect(self.db_path) as db:
             cursor = await db.execute(
@@ -31,13 +31,16 @@ Example:
 """
 from pathlib import Path
 from typing import List, Dict, Optional, Any
+import asyncio
 import json
+import os
 import numpy as np
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import hashlib
 from typing import List, Dict, Optional, Any, TypeVar, Union
 
 from src.pipeline.embeddings import EmbeddingGenerator
+from src.pipeline.metadata import ChunkMetadata
 from src.pipeline.recovery import with_retry
 from src.utils.logging import get_logger
 
@@ -75,55 +78,158 @@ def cosine_similarity(a: Vector, b: Vector) -> float:
     # Compute cosine similarity: dot(a,b) / (||a|| * ||b||)
     return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """A document with its embedding and metadata."""
     text: str
     embedding: List[float]
-    metadata: Dict[str, Any]
+    metadata: Dict[str, Any]  # A plain dict or a ChunkMetadata over shared dicts
     id: str
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert document to a plain dictionary with flattened metadata."""
+        return {
+            'text': self.text,
+            'embedding': self.embedding,
+            'metadata': dict(self.metadata),
+            'id': self.id,
+        }
+
 
 class VectorStore:
     """A simple vector store implementation using numpy arrays."""
     
     def __init__(self, 
                 persist_directory: str | Path = "data/vector_db",
-                collection_name: str = "documents"):
+                collection_name: str = "documents",
+                embedding_generator: Optional[EmbeddingGenerator] = None):
         """
         Initialize the vector store.
         
         Args:
             persist_directory: Directory to store vector data
             collection_name: Name of the collection
+            embedding_generator: Generator used for document and query
+                embeddings (defaults to the Ollama backend)
         """
         self.persist_directory = Path(persist_directory)
         self.persist_directory.mkdir(parents=True, exist_ok=True)
         
         self.collection_path = self.persist_directory / f"{collection_name}.json"
-        self.embedding_generator = EmbeddingGenerator()
+        self.embedding_generator = embedding_generator or EmbeddingGenerator()
         
         # Load existing documents or initialize empty
         self.documents: List[Document] = []
         self._load_documents()
+        
+        # Serializes collection writes so concurrent flushes never interleave
+        # and the newest snapshot is always written last
+        self._save_lock = asyncio.Lock()
     
     def _load_documents(self):
         """Load documents from disk."""
         if self.collection_path.exists():
             with open(self.collection_path, 'r') as f:
                 data = json.load(f)
-                self.documents = [
-                    Document(**doc) for doc in data
-                ]
+            if isinstance(data, list):
+                # Collections saved before shared metadata layers
+                self.documents = [Document(**doc) for doc in data]
+                return
+            shared = data['shared']
+            self.documents = [
+                Document(
+                    text=doc['text'],
+                    embedding=doc['embedding'],
+                    metadata=(
+                        ChunkMetadata(doc['metadata'], *(shared[i] for i in doc['shared']))
+                        if doc.get('shared') else doc['metadata']
+                    ),
+                    id=doc['id'],
+                )
+                for doc in data['documents']
+            ]
     
-    def _save_documents(self):
-        """Save documents to disk."""
-        with open(self.collection_path, 'w') as f:
+    def _save_documents(self, documents: Optional[List[Document]] = None):
+        """
+        Save documents to disk.
+
+        Metadata layers shared between chunks (see ChunkMetadata) are
+        written once and referenced by index from each document. The file
+        is written to a temporary path and moved into place, so readers
+        never see a partially written collection.
+
+        Args:
+            documents: Documents to persist (defaults to the whole collection)
+        """
+        if documents is None:
+            documents = self.documents
+        shared: List[Dict[str, Any]] = []
+        refs: Dict[int, int] = {}
+
+        def ref(layer: Dict[str, Any]) -> int:
+            if id(layer) not in refs:
+                refs[id(layer)] = len(shared)
+                shared.append(dict(layer))
+            return refs[id(layer)]
+
+        rows = []
+        for doc in documents:
+            row = {'text': doc.text, 'embedding': doc.embedding, 'id': doc.id}
+            if isinstance(doc.metadata, ChunkMetadata):
+                row['metadata'] = doc.metadata.own
+                row['shared'] = [ref(layer) for layer in doc.metadata.layers]
+            else:
+                row['metadata'] = doc.metadata
+            rows.append(row)
+        tmp_path = self.collection_path.with_name(f"{self.collection_path.name}.tmp")
+        with open(tmp_path, 'w') as f:
             json.dump(
-                [asdict(doc) for doc in self.documents],
+                {'format': 2, 'shared': shared, 'documents': rows},
                 f,
                 indent=2
             )
+        os.replace(tmp_path, self.collection_path)
+
+    async def _persist(self) -> None:
+        """Write a snapshot of the collection in a worker thread, one write at a time."""
+        async with self._save_lock:
+            await asyncio.to_thread(self._save_documents, list(self.documents))
+
+    async def _flush_documents(self, batch: List[Document]):
+        """
+        Index a batch of documents and persist the collection.
+
+        Documents whose ID is already stored replace the stored copy, so
+        re-adding a document is an upsert. The file write runs in a worker
+        thread on a snapshot of the collection, so embedding requests keep
+        progressing meanwhile.
+
+        Args:
+            batch: Newly embedded documents to add
+        """
+        batch_ids = {doc.id for doc in batch}
+        if any(doc.id in batch_ids for doc in self.documents):
+            self.documents = [doc for doc in self.documents if doc.id not in batch_ids]
+        self.documents.extend(batch)
+        await self._persist()
+
+    async def delete_documents(self, doc_ids: List[str]) -> int:
+        """
+        Delete documents by ID and persist the collection.
+
+        Args:
+            doc_ids: IDs of the documents to delete (unknown IDs are ignored)
+
+        Returns:
+            Number of documents deleted
+        """
+        ids = set(doc_ids)
+        remaining = [doc for doc in self.documents if doc.id not in ids]
+        deleted = len(self.documents) - len(remaining)
+        if deleted:
+            self.documents = remaining
+            await self._persist()
+        return deleted
 
     def _validate_add_documents_input(
         self,
@@ -151,6 +257,54 @@ class VectorStore:
         if ids and len(ids) != len(texts):
             raise ValueError("If provided, ids must have same length as texts")
 
+    def _document_ids(self, texts: List[str], ids: Optional[List[str]] = None) -> List[str]:
+        """Use pre-provided IDs if available, otherwise deterministic content-hash IDs."""
+        return list(ids) if ids else [
+            hashlib.sha256(text.encode()).hexdigest()
+            for text in texts
+        ]
+
+    async def embed_documents(self,
+                              texts: List[str],
+                              metadata_list: List[Dict[str, Any]],
+                              ids: Optional[List[str]] = None) -> List[Document]:
+        """
+        Embed documents without adding them to the store.
+
+        Together with add_embedded_documents this splits add_documents into
+        an embedding step and an indexing step, so a pipeline can run them
+        as separate stages.
+
+        Args:
+            texts: List of text strings
+            metadata_list: List of metadata dictionaries
+            ids: Optional list of IDs (generated if not provided)
+
+        Returns:
+            Embedded documents in input order
+        """
+        self._validate_add_documents_input(texts, metadata_list, ids)
+        embeddings = await self.embedding_generator.batch_generate_embeddings(texts)
+        return [
+            Document(text=text, embedding=embeddings[text], metadata=metadata, id=doc_id)
+            for text, metadata, doc_id in zip(texts, metadata_list, self._document_ids(texts, ids))
+        ]
+
+    async def add_embedded_documents(self, documents: List[Document]) -> List[str]:
+        """
+        Index and persist documents embedded by embed_documents.
+
+        Args:
+            documents: Embedded documents (existing IDs are replaced)
+
+        Returns:
+            List of document IDs
+        """
+        if not documents:
+            raise ValueError("Documents list cannot be empty")
+        await self._flush_documents(documents)
+        return [doc.id for doc in documents]
+
     async def add_documents(self,
                           texts: List[str],
                           metadata_list: List[Dict[str, Any]],
@@ -159,75 +313,41 @@ class VectorStore:
         """
         Add multiple documents to the store with batched processing.
 
+        Embeddings are consumed from EmbeddingGenerator.stream_embeddings(),
+        so documents are indexed and persisted in batches as their
+        embeddings complete rather than after the whole input is embedded.
+
         Args:
             texts: List of text strings
             metadata_list: List of metadata dictionaries
             ids: Optional list of IDs (generated if not provided)
-            batch_size: Number of documents to process at once
+            batch_size: Number of embedded documents to index per persist
 
         Returns:
             List of document IDs
         """
         # Validate inputs using centralized validation
         self._validate_add_documents_input(texts, metadata_list, ids)
-            
-        doc_ids = []
-        
-        async def process_batch(batch_start: int) -> List[Document]:
-            """
-            Process a single batch of documents with embeddings.
-
-            Handles text slicing, ID generation, embedding computation,
-            and Document object creation for a subset of inputs.
-
-            Args:
-                batch_start: Starting index for this batch
-
-            Returns:
-                List of Document objects with computed embeddings
-            """
-            # Calculate batch boundaries (handle edge case of last batch)
-            batch_end = min(batch_start + batch_size, len(texts))
-            batch_texts = texts[batch_start:batch_end]
-            batch_metadata = metadata_list[batch_start:batch_end]
-
-            # Generate or use provided IDs for this batch
-            if ids:
-                # Use pre-provided IDs if available
-                batch_ids = ids[batch_start:batch_end]
-            else:
-                # Generate deterministic IDs from content hash
-                batch_ids = [
-                    hashlib.sha256(text.encode()).hexdigest()
-                    for text in batch_texts
-                ]
-
-            # Generate embeddings for all texts in batch (concurrent API call)
-            batch_embeddings_dict = await self.embedding_generator.batch_generate_embeddings(batch_texts)
-            # Preserve order by mapping back to original text order
-            batch_embeddings = [batch_embeddings_dict[text] for text in batch_texts]
-
-            # Create Document objects combining text, embeddings, metadata, and IDs
-            return [
-                Document(
-                    text=text,
-                    # Convert embeddings from list to numpy array
-                    embedding=embedding,
-                    metadata=metadata,
-                    id=doc_id
-                )
-                for text, embedding, metadata, doc_id 
-                in zip(batch_texts, batch_embeddings, batch_metadata, batch_ids)
-            ]
-            
-        # Process all batches
-        for i in range(0, len(texts), batch_size):
-            batch_docs = await process_batch(i)
-            doc_ids.extend(doc.id for doc in batch_docs)
-            self.documents.extend(batch_docs)
-            # Save after each batch
-            self._save_documents()
-            
+
+        doc_ids = self._document_ids(texts, ids)
+
+        # Consume embeddings as they complete so documents are indexed and
+        # persisted while the remaining embeddings are still being generated
+        pending: List[Document] = []
+        async for index, text, embedding in self.embedding_generator.stream_embeddings(texts):
+            pending.append(Document(
+                text=text,
+                embedding=embedding,
+                metadata=metadata_list[index],
+                id=doc_ids[index]
+            ))
+            if len(pending) >= batch_size:
+                await self._flush_documents(pending)
+                pending = []
+
+        if pending:
+            await self._flush_documents(pending)
+
         return doc_ids
     
     async def search(self,
@@ -260,11 +380,8 @@ class VectorStore:
             "distances": [[] for _ in query_texts]
         }
 
-        # Generate query embeddings
-        query_embeddings_dict = await self.embedding_generator.batch_generate_embeddings(query_texts)
-        logger.info(f"Generated query embeddings: {query_embeddings_dict}")
-        query_embeddings = [query_embeddings_dict[text] for text in query_texts]
-        logger.info(f"Query embeddings list: {query_embeddings}")
+        # Embed queries through the normalized in-memory query cache
+        query_embeddings = await self.embedding_generator.embed_queries(query_texts)
         
         # Filter documents by metadata first if needed
         docs_to_search = self.documents
@@ -325,7 +442,7 @@ class VectorStore:
             # Format results
             curr_ids = [doc.id for _, doc in top_n]
             curr_docs = [doc.text for _, doc in top_n]
-            curr_metadata = [doc.metadata for _, doc in top_n]
+            curr_metadata = [dict(doc.metadata) for _, doc in top_n]
             curr_distances = [1 - sim for sim, _ in top_n]
             
             # Add results
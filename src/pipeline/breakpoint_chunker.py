@@ -0,0 +1,290 @@
+"""
+Embedding-similarity breakpoint chunking.
+
+BreakpointChunker is an optional SemanticChunker that places chunk
+boundaries where the topic shifts instead of packing paragraphs by length.
+Sentences are embedded in batches (through the caller's EmbeddingGenerator,
+so its embedding cache is reused), the cosine distances between adjacent
+sentences are computed in one vectorized numpy pass, and chunks are cut
+after sentences whose distance to the next is above a percentile
+threshold, as long as the chunk has reached min_chunk_size. Chunks never
+exceed chunk_size.
+
+Pages are still streamed: sentences are buffered in windows of
+window_sentences, and the last, possibly unfinished, chunk of each window
+is carried into the next one.
+
+Usage Example:
+    >>> from src.pipeline.embeddings import EmbeddingGenerator
+    >>> chunker = BreakpointChunker(
+    ...     embedding_generator=EmbeddingGenerator(),
+    ...     chunk_size=800,
+    ...     min_chunk_size=200,
+    ...     breakpoint_percentile=90
+    ... )
+    >>> pipeline = ChunkPipeline(chunker)
+"""
+from typing import Any, Callable, Coroutine, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import threading
+
+import numpy as np
+
+from .chunker import SEPARATORS, SemanticChunker, TextChunk, _ChunkLayers, _SENTENCE_END
+from .embeddings import EmbeddingGenerator
+from .pdf_extractor import PDFPage
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Maps a batch of texts to an array of shape (len(texts), dim)
+EmbedFunction = Callable[[List[str]], np.ndarray]
+
+# (sentence, first_page, last_page, is_scanned, starts_paragraph)
+_Sentence = Tuple[str, int, int, bool, bool]
+
+
+class _LoopThread:
+    """An event loop running in a daemon thread, started on first use.
+
+    Every coroutine runs on the same loop, so streaming a document costs no
+    event loop setup per window and loop-bound state in the embedding
+    generator stays on one loop. Works both from plain threads and from
+    code already running inside another event loop.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the loop and wait for its result."""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="breakpoint-embed", daemon=True
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+
+def generator_embed_function(generator: EmbeddingGenerator) -> EmbedFunction:
+    """
+    Wrap an EmbeddingGenerator as a synchronous batch embedding function.
+
+    Embeddings go through batch_generate_embeddings, so cached sentence
+    vectors are reused and new ones are cached. All calls share one event
+    loop in a background thread.
+
+    Args:
+        generator: Embedding generator to use
+
+    Returns:
+        Function mapping a list of texts to a 2-D float32 array
+    """
+    loop = _LoopThread()
+
+    def embed(texts: List[str]) -> np.ndarray:
+        vectors = loop.run(generator.batch_generate_embeddings(texts))
+        return np.asarray([vectors[text] for text in texts], dtype=np.float32)
+    return embed
+
+
+def adjacent_cosine_distances(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Compute the cosine distance between each pair of adjacent rows.
+
+    Args:
+        embeddings: Array of shape (n, dim)
+
+    Returns:
+        Array of n - 1 distances; entry i compares rows i and i + 1
+    """
+    if len(embeddings) < 2:
+        return np.zeros(0, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = embeddings / np.where(norms == 0, 1, norms)
+    return 1.0 - np.einsum("ij,ij->i", unit[:-1], unit[1:])
+
+
+class BreakpointChunker(SemanticChunker):
+    """Splits text into chunks at embedding-similarity breakpoints."""
+
+    def __init__(self,
+                 embedding_generator: Optional[EmbeddingGenerator] = None,
+                 embed_function: Optional[EmbedFunction] = None,
+                 chunk_size: int = 500,
+                 chunk_overlap: int = 0,
+                 min_chunk_size: int = 100,
+                 breakpoint_percentile: float = 90.0,
+                 window_sentences: int = 256,
+                 embed_batch_size: int = 64,
+                 **kwargs: Any):
+        """
+        Initialize the breakpoint chunker.
+
+        Args:
+            embedding_generator: Generator used to embed sentences, e.g. the
+                vector store's, so both share one embedding cache; ignored if
+                embed_function is given
+            embed_function: Custom batch embedding function
+            chunk_size: Maximum size of each chunk, in size_unit
+            chunk_overlap: Size of the overlap between chunks, in size_unit
+            min_chunk_size: Chunks are not cut at a breakpoint before they
+                reach this size
+            breakpoint_percentile: Adjacent-sentence distances above this
+                percentile of a window's distances are breakpoints
+            window_sentences: Sentences buffered per breakpoint computation
+            embed_batch_size: Sentences sent per embedding call
+            **kwargs: Other SemanticChunker arguments (e.g. size_unit)
+
+        Raises:
+            ValueError: If neither embedding_generator nor embed_function
+                is given, or an argument is out of range
+        """
+        super().__init__(chunk_size=chunk_size, chunk_overlap=chunk_overlap, **kwargs)
+        if not 0 <= breakpoint_percentile <= 100:
+            raise ValueError("breakpoint_percentile must be between 0 and 100")
+        if min_chunk_size < 0:
+            raise ValueError("min_chunk_size must not be negative")
+        if window_sentences < 2 or embed_batch_size < 1:
+            raise ValueError("window_sentences must be at least 2 and embed_batch_size at least 1")
+        if embed_function is None:
+            if embedding_generator is None:
+                raise ValueError("BreakpointChunker needs an embedding_generator or embed_function")
+            embed_function = generator_embed_function(embedding_generator)
+        self.embed_function = embed_function
+        self.min_chunk_size = min_chunk_size
+        self.breakpoint_percentile = breakpoint_percentile
+        self.window_sentences = window_sentences
+        self.embed_batch_size = embed_batch_size
+
+    def _split_text(self, text: str) -> List[str]:
+        """Split text into chunks at breakpoints (used by create_chunks)."""
+        sentences = self._sentences(text, 0, 0, False)
+        if not sentences:
+            return []
+        chunks = [
+            self._join(group)
+            for group in self._group(sentences, self._embed([s[0] for s in sentences]))
+        ]
+        return [chunks[0]] + [
+            self._with_overlap(prev, chunk) for prev, chunk in zip(chunks, chunks[1:])
+        ]
+
+    def _stream_segment(self,
+                        pages: Iterable[PDFPage],
+                        layers: _ChunkLayers,
+                        first_index: int) -> Iterator[TextChunk]:
+        """Chunk pages at breakpoints, one window of sentences at a time."""
+        buffer: List[_Sentence] = []
+        vectors = np.zeros((0, 0), dtype=np.float32)
+        index = first_index
+        prev_text: Optional[str] = None
+
+        def flush(final: bool) -> Iterator[TextChunk]:
+            nonlocal buffer, vectors, index, prev_text
+            embedded = len(vectors)
+            if len(buffer) > embedded:
+                new = self._embed([s[0] for s in buffer[embedded:]])
+                vectors = new if not embedded else np.vstack([vectors, new])
+            groups = self._group(buffer, vectors)
+            # Carry the last, possibly unfinished, chunk into the next window
+            carry = [] if final else groups.pop()
+            for group in groups:
+                text = self._join(group)
+                yield self._make_chunk(
+                    text if prev_text is None else self._with_overlap(prev_text, text),
+                    index,
+                    group[0][1],
+                    group[-1][2],
+                    any(s[3] for s in group),
+                    layers,
+                )
+                prev_text, index = text, index + 1
+            vectors = vectors[len(buffer) - len(carry):]
+            buffer = carry
+
+        for text, start, end, scanned in self._paragraph_units(pages):
+            buffer.extend(self._sentences(text, start, end, scanned))
+            if len(buffer) >= self.window_sentences:
+                yield from flush(final=False)
+        if buffer:
+            yield from flush(final=True)
+
+    def _sentences(self, text: str, start: int, end: int, scanned: bool) -> List[_Sentence]:
+        """Split paragraphs into sentences, cutting any longer than a chunk."""
+        limit = self._limit()
+        sentences: List[_Sentence] = []
+        for paragraph in text.split("\n\n"):
+            first = True
+            for sentence in _SENTENCE_END.split(paragraph.strip()):
+                sentence = " ".join(sentence.split())
+                if not sentence:
+                    continue
+                pieces = (
+                    [sentence] if self.length_function(sentence) <= limit
+                    else self._split_recursive(sentence, SEPARATORS[3:], limit)
+                )
+                for piece in pieces:
+                    sentences.append((piece, start, end, scanned, first))
+                    first = False
+        return sentences
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts in batches of embed_batch_size."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        batches = [
+            np.asarray(self.embed_function(texts[i:i + self.embed_batch_size]), dtype=np.float32)
+            for i in range(0, len(texts), self.embed_batch_size)
+        ]
+        return np.vstack(batches)
+
+    def _group(self, sentences: List[_Sentence], vectors: np.ndarray) -> List[List[_Sentence]]:
+        """
+        Group consecutive sentences into chunks.
+
+        A chunk ends after a breakpoint once it holds at least
+        min_chunk_size, or earlier if the next sentence would push it past
+        chunk_size - chunk_overlap. Chunk lengths are kept as running sums
+        of sentence and separator lengths, so each sentence is measured once.
+        """
+        distances = adjacent_cosine_distances(vectors)
+        if len(distances):
+            is_break = distances > np.percentile(distances, self.breakpoint_percentile)
+        else:
+            is_break = np.zeros(0, dtype=bool)
+        limit = self._limit()
+        space, paragraph_break = self.length_function(" "), self.length_function("\n\n")
+
+        groups: List[List[_Sentence]] = []
+        current: List[_Sentence] = []
+        length = 0
+        for i, sentence in enumerate(sentences):
+            size = self.length_function(sentence[0])
+            if current:
+                joined = length + (paragraph_break if sentence[4] else space) + size
+                if joined > limit:
+                    groups.append(current)
+                    current = []
+                else:
+                    size = joined
+            current.append(sentence)
+            length = size
+            if i < len(is_break) and is_break[i] and length >= self.min_chunk_size:
+                groups.append(current)
+                current = []
+        if current:
+            groups.append(current)
+        return groups
+
+    @staticmethod
+    def _join(sentences: List[_Sentence]) -> str:
+        """Join sentences, keeping paragraph breaks between paragraphs."""
+        parts = []
+        for i, (text, _, _, _, starts_paragraph) in enumerate(sentences):
+            if i:
+                parts.append("\n\n" if starts_paragraph else " ")
+            parts.append(text)
+        return "".join(parts)
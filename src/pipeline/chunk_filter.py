@@ -0,0 +1,218 @@
+"""
+Boilerplate and low-information chunk filtering at ingest.
+
+Running headers, footers, page numbers, tables of contents and blank or
+noisy scanned pages produce many near-identical or empty chunks, each of
+which costs an embedding and pollutes search results. ChunkFilter removes
+them in two steps:
+
+1. strip_boilerplate drops lines repeated at the top or bottom of many
+   pages (compared with digits masked, so "Page 3 of 90" matches every
+   page) and bare page numbers, before the text is chunked.
+2. filter_chunks drops chunks that are too short, mostly non-letters,
+   have very low character entropy, or look like a table of contents.
+
+Repeated lines are learned from the first sample_pages pages of each
+document, so at most that many pages are buffered while streaming. Lines
+learned once (learn_boilerplate) can be passed back to strip_boilerplate,
+e.g. when only some pages of a document are re-chunked.
+
+Usage Example:
+    >>> pipeline = ChunkPipeline(chunker, chunk_filter=ChunkFilter(min_chars=40))
+    >>> chunks = pipeline.process_file(Path("report.pdf"))
+    >>> print(pipeline.filter_stats["report.pdf"].chunks_skipped)
+"""
+from collections import Counter
+from dataclasses import dataclass, replace
+from itertools import islice
+from typing import Collection, Iterable, Iterator, List, Optional, Set, TYPE_CHECKING
+import math
+import re
+
+from .pdf_extractor import PDFPage
+from src.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from .chunker import TextChunk
+
+logger = get_logger(__name__)
+
+_DIGITS = re.compile(r"\d+")
+_WHITESPACE = re.compile(r"\s+")
+# A line that is only a page number, e.g. "12", "- 12 -", "Page 12 of 90"
+_PAGE_NUMBER = re.compile(r"^[-–—\s]*(page\s*)?#(\s*(of|/)\s*#)?[-–—\s]*$")
+# A table of contents entry: title, dot leaders, page number
+_TOC_ENTRY = re.compile(r"(\.\s?){4,}\s*\d+\s*$")
+
+
+@dataclass
+class FilterStats:
+    """What ChunkFilter removed from a document."""
+    boilerplate_lines: int = 0  # Repeated header/footer and page number lines
+    chunks_skipped: int = 0     # Low-information chunks dropped
+
+
+def character_entropy(text: str) -> float:
+    """Shannon entropy of a text's characters, in bits per character."""
+    if not text:
+        return 0.0
+    counts = Counter(text)
+    total = len(text)
+    return -sum(n / total * math.log2(n / total) for n in counts.values())
+
+
+class ChunkFilter:
+    """Strips repeated page boilerplate and drops low-information chunks."""
+
+    def __init__(self,
+                 min_chars: int = 20,
+                 min_alpha_ratio: float = 0.4,
+                 min_entropy: float = 3.0,
+                 max_toc_ratio: float = 0.5,
+                 repeat_fraction: float = 0.5,
+                 min_repeat_pages: int = 3,
+                 sample_pages: int = 20,
+                 edge_lines: int = 3):
+        """
+        Initialize the filter.
+
+        Args:
+            min_chars: Minimum non-whitespace characters in a kept chunk
+            min_alpha_ratio: Minimum share of letters among non-whitespace
+                characters in a kept chunk
+            min_entropy: Minimum character entropy (bits) of a kept chunk
+            max_toc_ratio: Chunks with more than this share of lines that
+                look like table of contents entries are dropped
+            repeat_fraction: Share of sampled pages a line must appear on
+                to count as boilerplate
+            min_repeat_pages: Minimum number of pages a line must appear on
+                to count as boilerplate
+            sample_pages: Pages per document used to learn repeated lines
+            edge_lines: Lines at the top and bottom of a page that are
+                checked for boilerplate
+        """
+        if not 0 <= min_alpha_ratio <= 1 or not 0 <= max_toc_ratio <= 1:
+            raise ValueError("min_alpha_ratio and max_toc_ratio must be between 0 and 1")
+        if not 0 < repeat_fraction <= 1:
+            raise ValueError("repeat_fraction must be in (0, 1]")
+        if min_repeat_pages < 2 or sample_pages < 1 or edge_lines < 0:
+            raise ValueError(
+                "min_repeat_pages must be at least 2, sample_pages at least 1 "
+                "and edge_lines not negative"
+            )
+        self.min_chars = min_chars
+        self.min_alpha_ratio = min_alpha_ratio
+        self.min_entropy = min_entropy
+        self.max_toc_ratio = max_toc_ratio
+        self.repeat_fraction = repeat_fraction
+        self.min_repeat_pages = min_repeat_pages
+        self.sample_pages = sample_pages
+        self.edge_lines = edge_lines
+
+    @staticmethod
+    def _normalize(line: str) -> str:
+        """Compare lines case-insensitively with digits masked."""
+        return _DIGITS.sub("#", _WHITESPACE.sub(" ", line.strip().lower()))
+
+    def _edge_indices(self, lines: List[str]) -> List[int]:
+        """Indices of the first and last edge_lines non-empty lines."""
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        if len(filled) <= 2 * self.edge_lines:
+            return filled
+        return filled[:self.edge_lines] + filled[-self.edge_lines:]
+
+    def _learn_repeated(self, pages: List[PDFPage]) -> Set[str]:
+        """Normalized edge lines that repeat across enough sampled pages."""
+        counts: Counter = Counter()
+        for page in pages:
+            lines = page.text.split("\n")
+            counts.update({self._normalize(lines[i]) for i in self._edge_indices(lines)})
+        threshold = max(self.min_repeat_pages, math.ceil(self.repeat_fraction * len(pages)))
+        return {line for line, count in counts.items() if count >= threshold}
+
+    def learn_boilerplate(self, pages: Iterable[PDFPage]) -> Set[str]:
+        """
+        Learn a document's repeated header/footer lines.
+
+        Args:
+            pages: Pages of one document in order; only the first
+                sample_pages are read
+
+        Returns:
+            Normalized lines to strip (see strip_boilerplate)
+        """
+        sample = list(islice(pages, self.sample_pages))
+        return self._learn_repeated(sample) if len(sample) >= self.min_repeat_pages else set()
+
+    def _strip_page(self, page: PDFPage, repeated: Collection[str], stats: FilterStats) -> PDFPage:
+        """Remove boilerplate edge lines from a page."""
+        lines = page.text.split("\n")
+        drop = {
+            i for i in self._edge_indices(lines)
+            if (normalized := self._normalize(lines[i])) in repeated
+            or _PAGE_NUMBER.match(normalized)
+        }
+        if not drop:
+            return page
+        stats.boilerplate_lines += len(drop)
+        text = "\n".join(line for i, line in enumerate(lines) if i not in drop)
+        return replace(page, text=text.strip())
+
+    def strip_boilerplate(self,
+                          pages: Iterable[PDFPage],
+                          stats: FilterStats,
+                          repeated: Optional[Collection[str]] = None) -> Iterator[PDFPage]:
+        """
+        Remove repeated header/footer lines and page numbers from pages.
+
+        Args:
+            pages: Pages of one document in order
+            stats: Updated with the number of lines removed
+            repeated: Lines learned earlier with learn_boilerplate; by
+                default they are learned from the first pages given
+
+        Yields:
+            Pages with boilerplate lines removed
+        """
+        pages = iter(pages)
+        sample = list(islice(pages, self.sample_pages))
+        if repeated is None:
+            repeated = self.learn_boilerplate(sample)
+        else:
+            repeated = set(repeated)
+        if repeated:
+            logger.debug(f"Stripping {len(repeated)} repeated boilerplate lines")
+        for page in sample:
+            yield self._strip_page(page, repeated, stats)
+        for page in pages:
+            yield self._strip_page(page, repeated, stats)
+
+    def is_informative(self, text: str) -> bool:
+        """Whether a chunk carries enough information to be embedded."""
+        compact = _WHITESPACE.sub("", text)
+        if len(compact) < self.min_chars:
+            return False
+        if sum(c.isalpha() for c in compact) / len(compact) < self.min_alpha_ratio:
+            return False
+        if character_entropy(compact) < self.min_entropy:
+            return False
+        lines = [line for line in text.split("\n") if line.strip()]
+        toc_lines = sum(1 for line in lines if _TOC_ENTRY.search(line))
+        return toc_lines <= self.max_toc_ratio * len(lines)
+
+    def filter_chunks(self, chunks: Iterable['TextChunk'], stats: FilterStats) -> Iterator['TextChunk']:
+        """
+        Drop low-information chunks.
+
+        Args:
+            chunks: Chunks to filter
+            stats: Updated with the number of chunks dropped
+
+        Yields:
+            Chunks that pass is_informative
+        """
+        for chunk in chunks:
+            if self.is_informative(chunk.text):
+                yield chunk
+            else:
+                stats.chunks_skipped += 1
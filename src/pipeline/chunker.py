@@ -1,25 +1,105 @@
 """
 Text chunking module that handles semantic chunking of document content.
 Uses the LangChain inspired approach to split text into semantically meaningful chunks.
+
+Text is split recursively: on paragraphs first, then lines, sentences and
+words, and finally hard cuts, so no chunk (including its overlap) is longer
+than chunk_size.
+
+Sizes are measured in characters by default. With size_unit="tokens",
+chunk_size and chunk_overlap are token counts measured with a fast memoized
+tokenizer (see src.pipeline.tokenizer), so chunks can be packed up to a
+model's context budget without overflowing it.
+
+iter_chunks reads pages lazily and streams them through stream_chunks,
+which carries unfinished paragraphs and partly filled chunks across page
+boundaries, so memory stays bounded by a few pages. Chunks may therefore
+span several pages; page_number is the first page and page_end the last.
+process_pdf collects iter_chunks into a list.
+
+ChunkPipeline can chunk a directory in worker processes (max_workers > 1).
+Workers return serialize_chunks() batches: zlib-compressed JSON with the
+metadata shared by every chunk stored once. With a chunk_filter, the
+pipeline strips repeated page boilerplate before chunking and drops
+low-information chunks (see src.pipeline.chunk_filter). file_task builds
+the same whole-file job for any executor, so async callers can chunk in a
+process pool without blocking their event loop.
+
+Chunks are slotted records whose metadata is a ChunkMetadata: document-level
+fields and chunk settings live in one dict per document, page fields in one
+dict per page span, and only chunk-specific entries are stored per chunk.
 """
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from functools import partial
+from itertools import chain, groupby, islice
+from typing import Callable, Collection, Iterable, Iterator, List, Optional, Dict, Any, Sequence, Tuple
 from pathlib import Path
+import copy
+import json
+import os
+import re
+import statistics
+import zlib
 
+from .chunk_filter import ChunkFilter, FilterStats
+from .metadata import ChunkMetadata
+from .monitoring import monitor
 from .pdf_extractor import PDFExtractor, PDFPage, PDFMetadata
+from .tokenizer import Tokenizer, get_tokenizer
 from src.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Split boundaries from coarsest to finest; "" means a hard cut
+SENTENCE_SEPARATOR = "<sentence>"
+SEPARATORS = ("\n\n", "\n", SENTENCE_SEPARATOR, " ", "")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# A page whose last paragraph does not end like this continues on the next page
+_PARAGRAPH_END = re.compile(r"[.!?:;\"')\]]\s*$")
+
+# Units chunk_size and chunk_overlap can be measured in
+SIZE_UNITS = ("chars", "tokens")
+
 
-@dataclass
+@dataclass(slots=True)
 class TextChunk:
     """A semantically meaningful chunk of text."""
     text: str
     page_number: int
     chunk_index: int
     total_chunks: int
-    metadata: dict
+    metadata: Dict[str, Any]  # Usually a ChunkMetadata over shared dicts
+    page_end: Optional[int] = None  # Last page spanned; None means page_number
+
+    @property
+    def page_span(self) -> Tuple[int, int]:
+        """First and last page this chunk's text came from."""
+        return self.page_number, self.page_end or self.page_number
+
+
+class _ChunkLayers:
+    """Interns the shared metadata layers of one chunk stream."""
+
+    __slots__ = ("document", "_span_key", "_span")
+
+    def __init__(self, document: Dict[str, Any]):
+        self.document = document
+        self._span_key: Optional[Tuple[int, int, bool]] = None
+        self._span: Dict[str, Any] = {}
+
+    def span(self, page_start: int, page_end: int, is_scanned: bool) -> Dict[str, Any]:
+        """Page metadata shared by consecutive chunks with the same page span."""
+        key = (page_start, page_end, is_scanned)
+        if key != self._span_key:
+            self._span_key = key
+            self._span = {
+                'page': page_start,
+                'page_start': page_start,
+                'page_end': page_end,
+                'is_scanned': is_scanned,
+            }
+        return self._span
 
 
 class SemanticChunker:
@@ -28,79 +108,186 @@ class SemanticChunker:
     def __init__(self, 
                  chunk_size: int = 500,
                  chunk_overlap: int = 50,
-                 length_function=len):
+                 length_function=len,
+                 size_unit: str = "chars",
+                 tokenizer: "str | Tokenizer" = "auto"):
         """
         Initialize the chunker.
         
         Args:
-            chunk_size: Target size for each chunk in characters
-            chunk_overlap: Number of characters to overlap between chunks
+            chunk_size: Maximum size of each chunk, in size_unit
+            chunk_overlap: Size of the overlap between chunks, in size_unit
             length_function: Function to measure text length (default: len)
+            size_unit: "chars", or "tokens" to measure with the tokenizer
+            tokenizer: Tokenizer or tokenizer name used when size_unit is
+                "tokens" and no custom length_function is given
         """
         if chunk_size <= 0:
             raise ValueError("chunk_size must be positive")
         if chunk_overlap >= chunk_size:
             raise ValueError("chunk_overlap must be less than chunk_size")
+        if size_unit not in SIZE_UNITS:
+            raise ValueError(f"size_unit must be one of {SIZE_UNITS}, got {size_unit!r}")
+        if size_unit == "tokens" and length_function is len:
+            length_function = get_tokenizer(tokenizer) if isinstance(tokenizer, str) else tokenizer
             
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.length_function = length_function
+        self.size_unit = size_unit
+        # A token chunk_size is a model budget; optimization may only shrink it
+        self.max_chunk_size = chunk_size if size_unit == "tokens" else None
 
     def _split_text(self, text: str) -> List[str]:
         """
         Split text into chunks based on semantic boundaries.
-        
+
+        Pieces are packed into chunks of at most chunk_size - chunk_overlap,
+        so chunks stay within chunk_size after the overlap is prepended.
+
         Args:
             text: Text to split
-            
+
         Returns:
             List of text chunks
         """
-        # Start with basic paragraph splits
-        paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-        
-        chunks = []
-        current_chunk = []
-        current_length = 0
-        
-        for paragraph in paragraphs:
-            paragraph_length = self.length_function(paragraph)
-            
-            if current_length + paragraph_length <= self.chunk_size:
-                current_chunk.append(paragraph)
-                current_length += paragraph_length
-            else:
-                if current_chunk:
-                    chunks.append('\n\n'.join(current_chunk))
-                current_chunk = [paragraph]
-                current_length = paragraph_length
-                
-        if current_chunk:
-            chunks.append('\n\n'.join(current_chunk))
-            
+        limit = self._limit()
+        chunks = self._split_recursive(text.strip(), SEPARATORS, limit) if text.strip() else []
+
         # Add overlapping content
         if self.chunk_overlap > 0 and len(chunks) > 1:
-            overlapped_chunks = []
-            
-            for i in range(len(chunks)):
-                if i == 0:
-                    overlapped_chunks.append(chunks[i])
-                else:
-                    # Add overlap from previous chunk
-                    prev_chunk = chunks[i-1]
-                    overlap = prev_chunk[-self.chunk_overlap:]
-                    overlapped_chunks.append(overlap + chunks[i])
-                    
+            overlapped_chunks = [chunks[0]]
+
+            for i in range(1, len(chunks)):
+                # Add overlap from previous chunk
+                overlapped_chunks.append(self._with_overlap(chunks[i-1], chunks[i]))
+
             chunks = overlapped_chunks
-            
+
         return chunks
 
+    def _limit(self) -> int:
+        """
+        Get the size left for new text once the overlap is prepended.
+
+        Raises:
+            ValueError: If chunk_overlap leaves no room in chunk_size
+        """
+        limit = self.chunk_size - self.chunk_overlap
+        if limit < 1:
+            raise ValueError(
+                f"chunk_overlap ({self.chunk_overlap}) must be less than chunk_size ({self.chunk_size})"
+            )
+        return limit
+
+    def _with_overlap(self, prev_chunk: str, chunk: str) -> str:
+        """Prepend the tail of prev_chunk to chunk if the result fits chunk_size."""
+        if self.chunk_overlap <= 0:
+            return chunk
+        combined = self._tail(prev_chunk, self.chunk_overlap) + chunk
+        # Token counts are not strictly additive across the join
+        if (self.length_function is not len
+                and self.length_function(combined) > self.chunk_size):
+            return chunk
+        return combined
+
+    def _split_recursive(self, text: str, separators: Sequence[str], limit: int) -> List[str]:
+        """
+        Split text on the coarsest separator that yields pieces within limit.
+
+        Pieces still longer than limit are split again with the next finer
+        separator; adjacent small pieces are merged back up to limit.
+
+        Args:
+            text: Stripped, non-empty text to split
+            separators: Remaining separators, coarsest first
+            limit: Maximum length of each returned piece
+
+        Returns:
+            List of pieces, each at most limit long
+        """
+        if self.length_function(text) <= limit:
+            return [text]
+        separator, finer = separators[0], separators[1:]
+        if separator == "":
+            return self._hard_split(text, limit)
+
+        if separator == SENTENCE_SEPARATOR:
+            parts, joiner = _SENTENCE_END.split(text), " "
+        else:
+            parts, joiner = text.split(separator), separator
+        parts = [p.strip() for p in parts if p.strip()]
+
+        pieces: List[str] = []
+        for part in parts:
+            if self.length_function(part) > limit:
+                pieces.extend(self._split_recursive(part, finer, limit))
+            else:
+                pieces.append(part)
+        return self._merge(pieces, joiner, limit)
+
+    def _merge(self, pieces: List[str], joiner: str, limit: int) -> List[str]:
+        """Greedily join adjacent pieces with joiner while staying within limit."""
+        merged: List[str] = []
+        current = ""
+        for piece in pieces:
+            candidate = f"{current}{joiner}{piece}" if current else piece
+            if self.length_function(candidate) <= limit:
+                current = candidate
+            else:
+                if current:
+                    merged.append(current)
+                current = piece
+        if current:
+            merged.append(current)
+        return merged
+
+    def _hard_split(self, text: str, limit: int) -> List[str]:
+        """Cut text into consecutive pieces of at most limit length."""
+        if limit < 1:
+            raise ValueError(f"Cannot split text into pieces of at most {limit}")
+        pieces = []
+        while text:
+            end = self._fit(text, limit, from_end=False)
+            pieces.append(text[:end])
+            text = text[end:]
+        return pieces
+
+    def _tail(self, text: str, size: int) -> str:
+        """Get the longest suffix of text that is at most size long."""
+        if self.length_function is len:
+            return text[-size:]
+        return text[len(text) - self._fit(text, size, from_end=True):]
+
+    def _fit(self, text: str, limit: int, from_end: bool) -> int:
+        """
+        Find the most characters of a prefix (or suffix) that fit in limit.
+
+        Uses binary search, so custom length functions such as tokenizers
+        are called O(log n) times. Always returns at least 1 for a prefix so
+        hard splitting makes progress.
+        """
+        if self.length_function is len:
+            return min(len(text), limit)
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            part = text[-mid:] if from_end else text[:mid]
+            if self.length_function(part) <= limit:
+                low = mid
+            else:
+                high = mid - 1
+        return low if from_end else max(low, 1)
+
     def process_pdf(self, 
                    pdf_path: Path,
                    optimize_chunks: bool = True,
                    target_chunks_per_page: int = 5) -> List[TextChunk]:
         """
         Process a PDF file and create semantic chunks.
+
+        Collects iter_chunks into a list; use iter_chunks directly to keep
+        memory bounded on very large documents.
         
         Args:
             pdf_path: Path to PDF file
@@ -110,50 +297,234 @@ class SemanticChunker:
         Returns:
             List of TextChunk objects with metadata
         """
+        all_chunks = list(self.iter_chunks(pdf_path, optimize_chunks, target_chunks_per_page))
+        for chunk in all_chunks:
+            chunk.total_chunks = len(all_chunks)
+            
+        stats = chunk_length_stats(all_chunks, self.length_function)
+        logger.info(
+            f"Created {len(all_chunks)} chunks from {pdf_path} "
+            f"(length mean {stats['mean']:.0f}, p95 {stats['p95']:.0f}, max {stats['max']:.0f})"
+        )
+        return all_chunks
+
+    def iter_chunks(self,
+                    pdf_path: Path,
+                    optimize_chunks: bool = True,
+                    target_chunks_per_page: int = 5,
+                    page_numbers: Optional[Collection[int]] = None,
+                    segment_pages: Optional[int] = None,
+                    chunk_size: Optional[int] = None,
+                    page_filter: Optional[Callable[[Iterable[PDFPage]], Iterable[PDFPage]]] = None,
+                    extractor: Optional[PDFExtractor] = None) -> Iterator[TextChunk]:
+        """
+        Lazily chunk a PDF file with memory bounded by a few pages.
+
+        Pages are read one at a time with PDFExtractor.iter_document and passed
+        through stream_chunks, so chunks are yielded as soon as they fill.
+        An optimized or given chunk_size applies to this document only; it
+        is recorded in the chunks' metadata and the chunker is not changed.
+
+        Args:
+            pdf_path: Path to PDF file
+            optimize_chunks: Whether to optimize chunk size based on content
+            target_chunks_per_page: Target number of chunks per page when optimizing
+            page_numbers: Only read and chunk these pages (default: all)
+            segment_pages: Keep chunks within segments of this many pages
+                (see stream_chunks)
+            chunk_size: Use this chunk size instead of optimizing, e.g. to
+                re-chunk pages exactly as they were chunked before
+            page_filter: Optional transform applied to the page stream
+                before chunking (e.g. ChunkFilter.strip_boilerplate)
+            extractor: Extractor to read the PDF with (e.g. an
+                IsolatedExtractor); defaults to an in-process PDFExtractor
+
+        Yields:
+            TextChunk objects with metadata (total_chunks is 0 while streaming)
+        """
         logger.info(f"Processing PDF: {pdf_path}")
         
-        # Extract text and metadata from PDF
-        extractor = PDFExtractor()
-        metadata = extractor.extract_metadata(pdf_path)
-        pages = extractor.extract_pages(pdf_path)
-        
-        # Optimize chunk size if requested
-        if optimize_chunks:
-            # Sample first few pages for optimization
-            sample_text = "\n\n".join(page.text for page in pages[:3])
-            optimal_size = get_optimal_chunk_size(
-                sample_text,
-                target_chunks=target_chunks_per_page * len(pages[:3])
-            )
-            logger.info(f"Optimized chunk size: {optimal_size}")
-            self.chunk_size = optimal_size
-        
-        # Process each page
-        all_chunks = []
+        # Open the PDF once: metadata comes first, then pages are streamed
+        extractor = extractor or PDFExtractor(monitoring=monitor)
+        page_iter = extractor.iter_document(pdf_path, page_numbers=page_numbers)
+        pages: Iterator[PDFPage] = page_iter
         
-        for page in pages:
-            # Create base metadata
-            page_metadata = {
+        try:
+            metadata = next(page_iter)
+            if page_filter:
+                pages = iter(page_filter(page_iter))
+            size = chunk_size
+            # Optimize chunk size if requested
+            if size is None and optimize_chunks:
+                # Sample first few pages for optimization
+                sample = list(islice(pages, 3))
+                pages = chain(sample, pages)
+                sample_text = "\n\n".join(page.text for page in sample)
+                optimal_size = get_optimal_chunk_size(
+                    sample_text,
+                    target_chunks=target_chunks_per_page * len(sample),
+                    length_function=self.length_function
+                )
+                if self.max_chunk_size is not None:
+                    optimal_size = min(optimal_size, self.max_chunk_size)
+                logger.info(f"Optimized chunk size: {optimal_size}")
+                size = optimal_size
+            # The document's size goes on a copy, so it never leaks into
+            # later or concurrent calls on this chunker
+            chunker = self if size is None else self._with_chunk_size(size)
+            
+            document_metadata = {
                 'source': str(pdf_path),
-                'page': page.number,
                 'total_pages': metadata.page_count,
-                'is_scanned': page.is_scanned,
                 'title': metadata.title,
                 'author': metadata.author,
                 'creation_date': metadata.creation_date.isoformat() if metadata.creation_date else None,
             }
-            
-            # Create chunks for this page
-            page_chunks = self.create_chunks(
-                text=page.text,
-                page_number=page.number,
-                metadata=page_metadata
-            )
-            
-            all_chunks.extend(page_chunks)
-            
-        logger.info(f"Created {len(all_chunks)} chunks from {metadata.page_count} pages")
-        return all_chunks
+            yield from chunker.stream_chunks(pages, document_metadata, segment_pages)
+        finally:
+            page_iter.close()
+
+    def _with_chunk_size(self, chunk_size: int) -> 'SemanticChunker':
+        """
+        Get a copy of this chunker that chunks with chunk_size.
+
+        A smaller size scales the overlap down in proportion, so an
+        optimized size below chunk_overlap still leaves room for text.
+        """
+        chunker = copy.copy(self)
+        chunker.chunk_size = chunk_size
+        if chunk_size < self.chunk_size:
+            chunker.chunk_overlap = self.chunk_overlap * chunk_size // self.chunk_size
+        return chunker
+
+    def stream_chunks(self,
+                      pages: Iterable[PDFPage],
+                      metadata: Optional[Dict[str, Any]] = None,
+                      segment_pages: Optional[int] = None) -> Iterator[TextChunk]:
+        """
+        Chunk a stream of pages, carrying partial content across page boundaries.
+
+        A page's last paragraph is joined with the next page's first
+        paragraph unless it ends like a sentence, and paragraphs are packed
+        into chunks regardless of which page they came from. A chunk is
+        yielded as soon as it is full, so pages are consumed lazily.
+
+        Args:
+            pages: Pages in document order (any iterable, e.g. a generator)
+            metadata: Optional document-level metadata to attach to chunks
+            segment_pages: If set, pages are grouped into fixed segments of
+                this many pages (1-10, 11-20, ... for 10) and no chunk or
+                overlap crosses a segment boundary, so each segment can be
+                re-chunked on its own
+
+        Yields:
+            TextChunk objects numbered across the whole document. Their
+            total_chunks is 0 because it is only known once the stream ends.
+        """
+        layers = _ChunkLayers(self._document_layer(metadata))
+        if segment_pages is None:
+            yield from self._stream_segment(pages, layers, 0)
+            return
+        if segment_pages < 1:
+            raise ValueError("segment_pages must be at least 1")
+
+        index = 0
+        for _, segment in groupby(pages, key=lambda page: (page.number - 1) // segment_pages):
+            for chunk in self._stream_segment(segment, layers, index):
+                index = chunk.chunk_index + 1
+                yield chunk
+
+    def _stream_segment(self,
+                        pages: Iterable[PDFPage],
+                        layers: '_ChunkLayers',
+                        first_index: int) -> Iterator[TextChunk]:
+        """Chunk pages as one continuous stream, numbering chunks from first_index."""
+        limit = self._limit()
+        current = ""
+        span_start = span_end = 0
+        span_scanned = False
+        prev_text: Optional[str] = None
+        index = first_index
+
+        def emit() -> TextChunk:
+            text = current if prev_text is None else self._with_overlap(prev_text, current)
+            return self._make_chunk(text, index, span_start, span_end, span_scanned, layers)
+
+        for text, start, end, scanned in self._paragraph_units(pages):
+            if self.length_function(text) <= limit:
+                pieces = [text]
+            else:
+                pieces = self._split_recursive(text, SEPARATORS[1:], limit)
+            for piece in pieces:
+                candidate = f"{current}\n\n{piece}" if current else piece
+                if current and self.length_function(candidate) > limit:
+                    yield emit()
+                    prev_text, index = current, index + 1
+                    current, span_start, span_scanned = piece, start, scanned
+                else:
+                    if not current:
+                        span_start, span_scanned = start, scanned
+                    current = candidate
+                    span_scanned = span_scanned or scanned
+                span_end = end
+
+        if current:
+            yield emit()
+
+    def _make_chunk(self,
+                    text: str,
+                    index: int,
+                    page_start: int,
+                    page_end: int,
+                    is_scanned: bool,
+                    layers: '_ChunkLayers') -> TextChunk:
+        """Build a streamed chunk over the shared document and page-span metadata."""
+        return TextChunk(
+            text=text,
+            page_number=page_start,
+            chunk_index=index,
+            total_chunks=0,
+            metadata=ChunkMetadata(
+                None, layers.span(page_start, page_end, is_scanned), layers.document
+            ),
+            page_end=page_end,
+        )
+
+    def _document_layer(self, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Shared metadata for every chunk of a document, with the chunk settings."""
+        return {
+            **(metadata or {}),
+            'chunk_size': self.chunk_size,
+            'chunk_overlap': self.chunk_overlap,
+            'size_unit': self.size_unit,
+        }
+
+    def _paragraph_units(self, pages: Iterable[PDFPage]) -> Iterator[Tuple[str, int, int, bool]]:
+        """
+        Yield (paragraph, first_page, last_page, is_scanned) across pages.
+
+        A page's trailing paragraph that does not end like a sentence is
+        held back and joined to the first paragraph of the next page with
+        text on it.
+        """
+        carry: Optional[Tuple[str, int, int, bool]] = None
+        for page in pages:
+            units = [
+                (paragraph.strip(), page.number, page.number, page.is_scanned)
+                for paragraph in page.text.split("\n\n") if paragraph.strip()
+            ]
+            if not units:
+                continue
+            if carry is not None:
+                text, start, _, scanned = carry
+                first_text, _, end, first_scanned = units[0]
+                units[0] = (f"{text} {first_text}", start, end, scanned or first_scanned)
+                carry = None
+            if not _PARAGRAPH_END.search(units[-1][0]):
+                carry = units.pop()
+            yield from units
+        if carry is not None:
+            yield carry
 
     def create_chunks(self, 
                      text: str,
@@ -173,7 +544,7 @@ class SemanticChunker:
         chunks = self._split_text(text)
         
         chunk_objects = []
-        metadata = metadata or {}
+        shared = self._document_layer(metadata)
         
         for i, chunk_text in enumerate(chunks):
             chunk = TextChunk(
@@ -181,21 +552,181 @@ class SemanticChunker:
                 page_number=page_number,
                 chunk_index=i,
                 total_chunks=len(chunks),
-                metadata={
-                    **metadata,
-                    'chunk_size': self.chunk_size,
-                    'chunk_overlap': self.chunk_overlap,
-                }
+                metadata=ChunkMetadata(None, shared)
             )
             chunk_objects.append(chunk)
             
         return chunk_objects
 
 
+def chunk_length_stats(chunks: List[TextChunk],
+                       length_function: Callable[[str], int] = len) -> Dict[str, float]:
+    """
+    Summarize the distribution of chunk lengths.
+
+    Args:
+        chunks: Chunks to measure
+        length_function: Function used to measure chunk length
+
+    Returns:
+        Dictionary with count, min, max, mean, p50 and p95 (zeros if empty)
+    """
+    return summarize_lengths(length_function(chunk.text) for chunk in chunks)
+
+
+def summarize_lengths(lengths: Iterable[int]) -> Dict[str, float]:
+    """
+    Summarize a distribution of lengths as chunk_length_stats does.
+
+    Args:
+        lengths: Lengths to summarize
+
+    Returns:
+        Dictionary with count, min, max, mean, p50 and p95 (zeros if empty)
+    """
+    lengths = sorted(lengths)
+    if not lengths:
+        return {'count': 0, 'min': 0, 'max': 0, 'mean': 0.0, 'p50': 0, 'p95': 0}
+
+    def percentile(q: float) -> int:
+        return lengths[min(len(lengths) - 1, int(q * len(lengths)))]
+
+    return {
+        'count': len(lengths),
+        'min': lengths[0],
+        'max': lengths[-1],
+        'mean': statistics.fmean(lengths),
+        'p50': percentile(0.50),
+        'p95': percentile(0.95),
+    }
+
+
+def serialize_chunks(chunks: List[TextChunk], compression_level: int = 6) -> bytes:
+    """
+    Pack chunks into a compact batch for transfer between processes.
+
+    Metadata entries that are equal across all chunks are stored once;
+    each row keeps only its text, position and differing metadata.
+
+    Args:
+        chunks: Chunks to pack (metadata must be JSON-serializable)
+        compression_level: zlib compression level
+
+    Returns:
+        zlib-compressed JSON bytes, read back with deserialize_chunks
+    """
+    shared = dict(chunks[0].metadata) if chunks else {}
+    for chunk in chunks[1:]:
+        shared = {
+            key: value for key, value in shared.items()
+            if key in chunk.metadata and chunk.metadata[key] == value
+        }
+    rows = [
+        [
+            chunk.text, chunk.page_number, chunk.page_end, chunk.chunk_index,
+            chunk.total_chunks,
+            {key: value for key, value in chunk.metadata.items() if key not in shared},
+        ]
+        for chunk in chunks
+    ]
+    payload = json.dumps({'shared': shared, 'rows': rows}, separators=(",", ":"))
+    return zlib.compress(payload.encode("utf-8"), compression_level)
+
+
+def deserialize_chunks(data: bytes) -> List[TextChunk]:
+    """
+    Rebuild chunks packed by serialize_chunks.
+
+    Args:
+        data: Bytes returned by serialize_chunks
+
+    Returns:
+        List of TextChunk objects
+    """
+    payload = json.loads(zlib.decompress(data).decode("utf-8"))
+    shared = payload['shared']
+    return [
+        TextChunk(
+            text=text,
+            page_number=page_number,
+            chunk_index=chunk_index,
+            total_chunks=total_chunks,
+            metadata=ChunkMetadata(own, shared),
+            page_end=page_end,
+        )
+        for text, page_number, page_end, chunk_index, total_chunks, own in payload['rows']
+    ]
+
+
+def _filtered_chunks(chunker: SemanticChunker,
+                     pdf_path: Path,
+                     chunk_filter: Optional[ChunkFilter],
+                     stats: FilterStats,
+                     boilerplate: Optional[Collection[str]] = None,
+                     **options: Any) -> Iterator[TextChunk]:
+    """Chunk a PDF, stripping boilerplate and dropping low-information chunks."""
+    if chunk_filter is None:
+        yield from chunker.iter_chunks(pdf_path, **options)
+        return
+    chunks = chunker.iter_chunks(
+        pdf_path,
+        page_filter=lambda pages: chunk_filter.strip_boilerplate(pages, stats, boilerplate),
+        **options
+    )
+    yield from chunk_filter.filter_chunks(chunks, stats)
+
+
+# Per-process state for ChunkPipeline worker processes
+_worker_chunker: Optional[SemanticChunker] = None
+_worker_filter: Optional[ChunkFilter] = None
+_worker_options: Dict[str, Any] = {}
+
+
+def _init_chunk_worker(chunker: SemanticChunker,
+                       chunk_filter: Optional[ChunkFilter],
+                       extractor: Optional[PDFExtractor],
+                       optimize_chunks: bool,
+                       target_chunks_per_page: int) -> None:
+    """Receive the pipeline's chunker, filter and extractor once per worker process."""
+    global _worker_chunker, _worker_filter, _worker_options
+    _worker_chunker = chunker
+    _worker_filter = chunk_filter
+    _worker_options = {
+        'optimize_chunks': optimize_chunks,
+        'target_chunks_per_page': target_chunks_per_page,
+        'extractor': extractor,
+    }
+
+
+def _chunk_file(chunker: SemanticChunker,
+                chunk_filter: Optional[ChunkFilter],
+                pdf_path: Path,
+                **options: Any) -> Tuple[bytes, int, Dict[str, float], FilterStats]:
+    """
+    Extract and chunk one whole PDF, e.g. in a worker process.
+
+    Returns:
+        Tuple of (serialized chunks, chunk count, chunk length stats,
+        filter stats)
+    """
+    filter_stats = FilterStats()
+    chunks = list(_filtered_chunks(chunker, pdf_path, chunk_filter, filter_stats, **options))
+    for chunk in chunks:
+        chunk.total_chunks = len(chunks)
+    stats = chunk_length_stats(chunks, chunker.length_function)
+    return serialize_chunks(chunks), len(chunks), stats, filter_stats
+
+
+def _chunk_file_in_worker(pdf_path: Path) -> Tuple[bytes, int, Dict[str, float], FilterStats]:
+    """Extract and chunk one PDF with the worker process's pipeline settings."""
+    return _chunk_file(_worker_chunker, _worker_filter, pdf_path, **_worker_options)
+
+
 def get_optimal_chunk_size(text: str,
                           target_chunks: int = 10,
                           min_size: int = 100,
-                          max_size: int = 2000) -> int:
+                          max_size: int = 2000,
+                          length_function: Callable[[str], int] = len) -> int:
     """
     Calculate optimal chunk size to get approximately target_chunks.
     
@@ -204,11 +735,12 @@ def get_optimal_chunk_size(text: str,
         target_chunks: Desired number of chunks
         min_size: Minimum chunk size to consider
         max_size: Maximum chunk size to consider
+        length_function: Function to measure text length (default: len)
         
     Returns:
         Recommended chunk size
     """
-    text_length = len(text)
+    text_length = length_function(text)
     
     # Aim for chunk size that would give us target number of chunks
     chunk_size = text_length // target_chunks
@@ -225,7 +757,10 @@ class ChunkPipeline:
     def __init__(self,
                  chunker: SemanticChunker,
                  optimize_chunks: bool = True,
-                 target_chunks_per_page: int = 5):
+                 target_chunks_per_page: int = 5,
+                 max_workers: Optional[int] = 1,
+                 chunk_filter: Optional[ChunkFilter] = None,
+                 extractor: Optional[PDFExtractor] = None):
         """
         Initialize the pipeline.
         
@@ -233,26 +768,127 @@ class ChunkPipeline:
             chunker: SemanticChunker instance
             optimize_chunks: Whether to optimize chunk size based on content
             target_chunks_per_page: Target number of chunks per page when optimizing
+            max_workers: Worker processes used by process_directory; 1 runs
+                in the calling thread, None uses every CPU. The chunker
+                must be picklable (e.g. no lambda length_function) to use
+                more than one worker.
+            chunk_filter: Optional filter that strips repeated page
+                boilerplate and drops low-information chunks
+            extractor: Optional extractor used to read PDFs, e.g. an
+                IsolatedExtractor to enforce extraction deadlines
         """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
         self.chunker = chunker
         self.optimize_chunks = optimize_chunks
         self.target_chunks_per_page = target_chunks_per_page
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.total_processed = 0
         self.total_chunks = 0
+        self.chunk_filter = chunk_filter
+        self.extractor = extractor
+        self.total_skipped = 0
+        # Chunk length distribution and filter results per processed file
+        self.document_stats: Dict[str, Dict[str, float]] = {}
+        self.filter_stats: Dict[str, FilterStats] = {}
         
     def process_file(self, pdf_path: Path) -> List[TextChunk]:
         """Process a single PDF file."""
-        chunks = self.chunker.process_pdf(
+        chunks = list(self.iter_file(pdf_path))
+        for chunk in chunks:
+            chunk.total_chunks = len(chunks)
+        return chunks
+
+    def iter_file(self, pdf_path: Path, **options: Any) -> Iterator[TextChunk]:
+        """
+        Lazily process a single PDF file with bounded memory.
+
+        Statistics are updated once the file has been fully consumed.
+
+        Args:
+            pdf_path: Path to PDF file
+            **options: Extra SemanticChunker.iter_chunks options
+                (page_numbers, segment_pages, chunk_size), or boilerplate:
+                lines from ChunkFilter.learn_boilerplate to strip instead
+                of learning them from the pages read
+        """
+        lengths: List[int] = []
+        filter_stats = FilterStats()
+        for chunk in _filtered_chunks(
+            self.chunker,
             pdf_path,
+            self.chunk_filter,
+            filter_stats,
             optimize_chunks=self.optimize_chunks,
-            target_chunks_per_page=self.target_chunks_per_page
+            target_chunks_per_page=self.target_chunks_per_page,
+            extractor=self.extractor,
+            **options
+        ):
+            lengths.append(self.chunker.length_function(chunk.text))
+            yield chunk
+        self._record_file(pdf_path, len(lengths), summarize_lengths(lengths), filter_stats)
+
+    def file_task(self, pdf_path: Path, **options: Any) -> Callable[[], Tuple[bytes, int, Dict[str, float], FilterStats]]:
+        """
+        Build a picklable task that chunks a whole file in any executor.
+
+        Unlike iter_file, the task holds the whole document's chunks, so it
+        can run in a worker process (e.g. loop.run_in_executor with a
+        ProcessPoolExecutor). Pass its result to collect_task.
+
+        Args:
+            pdf_path: Path to PDF file
+            **options: Extra SemanticChunker.iter_chunks options
+                (page_numbers, segment_pages, chunk_size), or boilerplate
+                (see iter_file)
+
+        Returns:
+            Callable returning (serialized chunks, chunk count, chunk
+            length stats, filter stats)
+        """
+        return partial(
+            _chunk_file,
+            self.chunker,
+            self.chunk_filter,
+            pdf_path,
+            optimize_chunks=self.optimize_chunks,
+            target_chunks_per_page=self.target_chunks_per_page,
+            extractor=self.extractor,
+            **options
         )
+
+    def collect_task(self,
+                     pdf_path: Path,
+                     result: Tuple[bytes, int, Dict[str, float], FilterStats]) -> List[TextChunk]:
+        """Record statistics for a finished file_task and return its chunks."""
+        batch, chunk_count, stats, filter_stats = result
+        self._record_file(pdf_path, chunk_count, stats, filter_stats)
+        return deserialize_chunks(batch)
+
+    def _record_file(self,
+                     pdf_path: Path,
+                     chunk_count: int,
+                     stats: Dict[str, float],
+                     filter_stats: FilterStats) -> None:
+        """Update statistics for a fully processed file."""
         self.total_processed += 1
-        self.total_chunks += len(chunks)
-        return chunks
+        self.total_chunks += chunk_count
+        self.total_skipped += filter_stats.chunks_skipped
+        self.document_stats[str(pdf_path)] = stats
+        self.filter_stats[str(pdf_path)] = filter_stats
+        if filter_stats.chunks_skipped or filter_stats.boilerplate_lines:
+            logger.info(
+                f"Filtered {pdf_path}: skipped {filter_stats.chunks_skipped} chunks, "
+                f"stripped {filter_stats.boilerplate_lines} boilerplate lines"
+            )
         
     def process_directory(self, dir_path: Path) -> Dict[str, List[TextChunk]]:
-        """Process all PDFs in a directory."""
+        """Process all PDFs in a directory, in parallel if max_workers > 1."""
+        if self.max_workers > 1:
+            return {
+                path: deserialize_chunks(batch)
+                for path, batch in self.process_directory_batches(dir_path).items()
+            }
         results = {}
         for pdf_path in dir_path.glob('**/*.pdf'):
             try:
@@ -262,11 +898,58 @@ class ChunkPipeline:
                 logger.error(f"Failed to process {pdf_path}: {str(e)}")
                 continue
         return results
+
+    def process_directory_batches(self, dir_path: Path) -> Dict[str, bytes]:
+        """
+        Process all PDFs in a directory in worker processes.
+
+        Each worker extracts and chunks whole files with its own copy of the
+        chunker, so per-document chunk parameters never race.
+
+        Args:
+            dir_path: Directory to search recursively for PDFs
+
+        Returns:
+            Dictionary mapping file paths to serialize_chunks() batches
+        """
+        pdf_paths = sorted(dir_path.glob('**/*.pdf'))
+        results: Dict[str, bytes] = {}
+        if not pdf_paths:
+            return results
+
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(pdf_paths)),
+            initializer=_init_chunk_worker,
+            initargs=(
+                self.chunker, self.chunk_filter, self.extractor,
+                self.optimize_chunks, self.target_chunks_per_page
+            ),
+        ) as executor:
+            futures = {
+                executor.submit(_chunk_file_in_worker, pdf_path): pdf_path
+                for pdf_path in pdf_paths
+            }
+            for future in as_completed(futures):
+                pdf_path = futures[future]
+                try:
+                    batch, chunk_count, stats, filter_stats = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to process {pdf_path}: {str(e)}")
+                    continue
+                results[str(pdf_path)] = batch
+                self._record_file(pdf_path, chunk_count, stats, filter_stats)
+
+        logger.info(
+            f"Chunked {len(results)}/{len(pdf_paths)} PDFs with "
+            f"{min(self.max_workers, len(pdf_paths))} worker processes"
+        )
+        return results
         
     def get_stats(self) -> Dict[str, int]:
         """Get processing statistics."""
         return {
             'files_processed': self.total_processed,
             'total_chunks': self.total_chunks,
-            'avg_chunks_per_file': self.total_chunks // max(1, self.total_processed)
+            'avg_chunks_per_file': self.total_chunks // max(1, self.total_processed),
+            'skipped_chunks': self.total_skipped
         }
\ No newline at end of file
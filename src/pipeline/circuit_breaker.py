@@ -0,0 +1,387 @@
+"""
+Circuit breaker and retry budget for calls to Ollama.
+
+When Ollama is down, every caller retrying independently multiplies the
+wait: per-text embedding retries inside batch retries inside document
+retries. A shared circuit breaker makes all callers fail fast once the
+service is known to be unavailable, and a shared retry budget caps the total
+number of retries across layers.
+
+Breaker States:
+    - CLOSED: Calls pass through; consecutive failures are counted
+    - OPEN: Calls fail immediately with CircuitOpenError until
+      recovery_timeout has elapsed
+    - HALF_OPEN: A limited number of probe calls are let through; a success
+      closes the circuit, a failure opens it again
+
+Usage Example:
+    >>> from src.pipeline.circuit_breaker import ollama_breaker, retry_budget
+    >>>
+    >>> with ollama_breaker:  # Raises CircuitOpenError while open
+    ...     response = await client.post(url, json=payload)
+    >>>
+    >>> if retry_budget.try_acquire():
+    ...     # Retry allowed
+    ...     ...
+
+Shared Instances:
+    - ollama_breaker: Guards embeddings, health checks and agent calls
+    - retry_budget: Limits retries made by with_retry and EmbeddingGenerator
+"""
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Callable, Dict, Iterator
+import threading
+import time
+
+import httpx
+
+from src.utils.logging import get_logger
+from src.pipeline.monitoring import monitor, Metric, MetricType
+
+logger = get_logger(__name__)
+
+
+class CircuitState(Enum):
+    """States of a circuit breaker."""
+    CLOSED = "closed"        # Normal operation
+    OPEN = "open"            # Failing fast
+    HALF_OPEN = "half_open"  # Probing whether the service recovered
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(
+            f"Circuit '{name}' is open; retry in {retry_after:.1f}s"
+        )
+
+
+def is_service_failure(exc: BaseException) -> bool:
+    """
+    Decide whether an exception indicates the service itself is unhealthy.
+
+    Client errors (HTTP 4xx) mean the service answered, so they do not count
+    towards opening the circuit.
+
+    Args:
+        exc: Exception raised by the guarded call
+
+    Returns:
+        True if the exception should count as a failure
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return isinstance(exc, Exception)
+
+
+def is_connection_failure(exc: BaseException) -> bool:
+    """
+    Decide whether an exception means the service could not be reached in time.
+
+    Use for guarded calls that do more than talk to the service, where any
+    other error may come from the caller's own work.
+
+    Args:
+        exc: Exception raised by the guarded call
+
+    Returns:
+        True for connection errors and timeouts
+    """
+    return isinstance(exc, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker.
+
+    Use as a context manager around a call (sync or async body), or call
+    before_call()/record_success()/record_failure() directly.
+    """
+
+    def __init__(self,
+                 name: str,
+                 failure_threshold: int = 5,
+                 recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1,
+                 is_failure: Callable[[BaseException], bool] = is_service_failure,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Name used in errors, logs and metrics
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before probing
+            half_open_max_calls: Concurrent probe calls allowed when half-open
+            is_failure: Predicate deciding which exceptions count as failures
+            clock: Monotonic time source (injectable for tests)
+        """
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.is_failure = is_failure
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._transitions = []
+        self.reset()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the lock, then log and record transitions made under it."""
+        with self._lock:
+            yield
+            transitions, self._transitions = self._transitions, []
+        for old, new in transitions:
+            logger.warning(f"Circuit '{self.name}' {old.value} -> {new.value}")
+            monitor.record_metric(Metric(
+                "circuit_breaker_transitions",
+                1,
+                MetricType.COUNTER,
+                labels={"circuit": self.name, "state": new.value}
+            ))
+
+    def reset(self) -> None:
+        """Return to the closed state and clear all counters."""
+        with self._locked():
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = 0.0
+            self._half_open_calls = 0
+            self.total_failures = 0
+            self.rejected_calls = 0
+
+    def _current_state(self) -> CircuitState:
+        """Get the state, moving OPEN to HALF_OPEN once the timeout elapsed (lock held)."""
+        if (self._state is CircuitState.OPEN
+                and self._clock() - self._opened_at >= self.recovery_timeout):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: CircuitState) -> None:
+        """Change state, queueing the transition for _locked to record (lock held)."""
+        if state is self._state:
+            return
+        self._transitions.append((self._state, state))
+        self._state = state
+        self._half_open_calls = 0
+        if state is CircuitState.OPEN:
+            self._opened_at = self._clock()
+
+    @property
+    def state(self) -> CircuitState:
+        """Current breaker state."""
+        with self._locked():
+            return self._current_state()
+
+    def _retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through (lock held)."""
+        if self._current_state() is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (self._clock() - self._opened_at))
+
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through (0 if not open)."""
+        with self._locked():
+            return self._retry_after()
+
+    def before_call(self) -> None:
+        """
+        Check that a call may proceed.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all
+                probe slots taken
+        """
+        with self._locked():
+            state = self._current_state()
+            if state is CircuitState.CLOSED:
+                return
+            if (state is CircuitState.HALF_OPEN
+                    and self._half_open_calls < self.half_open_max_calls):
+                self._half_open_calls += 1
+                return
+            self.rejected_calls += 1
+            retry_after = self._retry_after()
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        """Record a successful call, closing a half-open circuit."""
+        with self._locked():
+            self._consecutive_failures = 0
+            if self._current_state() is CircuitState.HALF_OPEN:
+                self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit past the threshold."""
+        with self._locked():
+            self._consecutive_failures += 1
+            self.total_failures += 1
+            state = self._current_state()
+            if (state is CircuitState.HALF_OPEN
+                    or self._consecutive_failures >= self.failure_threshold):
+                self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """End a call with no verdict (e.g. cancelled), freeing its probe slot."""
+        with self._locked():
+            if self._state is CircuitState.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def __enter__(self) -> "CircuitBreaker":
+        self.before_call()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc is None:
+            self.record_success()
+        elif not isinstance(exc, Exception):
+            # Cancellation says nothing about the service's health
+            self.release()
+        elif self.is_failure(exc):
+            self.record_failure()
+        else:
+            self.record_success()
+        return False
+
+    @contextmanager
+    def guard(self, is_failure: Callable[[BaseException], bool]) -> Iterator["CircuitBreaker"]:
+        """
+        Guard a call with a narrower failure predicate than the breaker's own.
+
+        Errors the predicate rejects end the call with no verdict, so a body
+        that also runs the caller's own work only reports failures that are
+        really the service's.
+
+        Args:
+            is_failure: Predicate deciding which exceptions count as failures
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        self.before_call()
+        try:
+            yield self
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure()
+            else:
+                self.release()
+            raise
+        except BaseException:
+            self.release()
+            raise
+        else:
+            self.record_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a serializable view of the breaker.
+
+        Returns:
+            Dictionary with name, state, failure counters and retry_after
+        """
+        with self._locked():
+            return {
+                "name": self.name,
+                "state": self._current_state().value,
+                "consecutive_failures": self._consecutive_failures,
+                "total_failures": self.total_failures,
+                "rejected_calls": self.rejected_calls,
+                "retry_after_seconds": round(self._retry_after(), 3),
+            }
+
+
+class RetryBudget:
+    """Process-wide token bucket limiting retries across all layers.
+
+    Each retry takes one token. Tokens refill at min_per_second, and every
+    successful call deposits `ratio` tokens, so retries stay proportional to
+    real traffic instead of multiplying when a dependency is down.
+    """
+
+    def __init__(self,
+                 capacity: float = 20.0,
+                 ratio: float = 0.2,
+                 min_per_second: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the retry budget.
+
+        Args:
+            capacity: Maximum stored retry tokens
+            ratio: Tokens deposited per successful call
+            min_per_second: Tokens refilled per second regardless of traffic
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.capacity = capacity
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Refill the budget and clear counters."""
+        with self._lock:
+            self._tokens = self.capacity
+            self._updated = self._clock()
+            self.exhausted = 0
+
+    def _refill(self) -> None:
+        """Add tokens for the time elapsed since the last update (lock held)."""
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.min_per_second
+        )
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """
+        Take a retry token if one is available.
+
+        Returns:
+            True if the retry may proceed, False if the budget is exhausted
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            self.exhausted += 1
+        logger.warning("Retry budget exhausted; failing without retry")
+        monitor.record_metric(Metric("retry_budget_exhausted", self.exhausted, MetricType.COUNTER))
+        return False
+
+    def deposit(self) -> None:
+        """Credit the budget for a successful call."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    @property
+    def available(self) -> float:
+        """Retry tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get a serializable view of the budget."""
+        return {
+            "available": round(self.available, 2),
+            "capacity": self.capacity,
+            "exhausted": self.exhausted,
+        }
+
+
+# Shared breaker for every call to the Ollama server
+ollama_breaker = CircuitBreaker("ollama")
+
+# Shared budget for retries of Ollama-dependent work
+retry_budget = RetryBudget()
@@ -0,0 +1,235 @@
+"""
+Pluggable embedding backends for the embedding generator.
+
+A backend turns a single text into a fixed-dimension vector. The
+EmbeddingGenerator handles caching, batching, retries and truncation on top
+of any backend, so backends only implement the model call itself.
+
+Available Backends:
+    - ollama: Ollama's /api/embeddings endpoint (default, nomic-embed-text)
+    - hashing: Deterministic in-process CPU embedder using feature hashing
+      plus a fixed random projection. No server, no model download; useful
+      for ingest benchmarks and CI-scale load tests. Vectors are only
+      comparable with other vectors from the same hashing configuration.
+
+Usage Example:
+    >>> from src.pipeline.embedding_backends import create_backend
+    >>> backend = create_backend("hashing", dim=384)
+    >>> vector = await backend.embed("Who is Aragorn?")
+    >>> len(vector)
+    384
+
+Cache Namespacing:
+    Each backend exposes a cache_namespace derived from its name and model,
+    and EmbeddingGenerator keeps each namespace in its own cache
+    subdirectory, so vectors from different backends or models never mix.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Type
+import re
+import zlib
+
+import httpx
+import numpy as np
+
+from src.utils.config import OLLAMA_BASE_URL
+from .circuit_breaker import CircuitBreaker, ollama_breaker
+from .embedding_errors import EmbeddingAPIError
+
+
+class EmbeddingBackend(ABC):
+    """Interface for embedding model backends."""
+
+    #: Short backend identifier used in config and cache namespaces
+    name: str = ""
+
+    def __init__(self, model: str):
+        """
+        Initialize the backend.
+
+        Args:
+            model: Model identifier for this backend
+        """
+        self.model = model
+
+    @property
+    def cache_namespace(self) -> str:
+        """Directory-safe identifier for cache entries produced by this backend."""
+        return re.sub(r"[^A-Za-z0-9._-]+", "_", f"{self.name}__{self.model}")
+
+    @abstractmethod
+    async def embed(self, text: str) -> List[float]:
+        """
+        Generate an embedding for a single text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            List of floating point values representing the embedding
+
+        Raises:
+            EmbeddingAPIError: If the backend returns an invalid response
+            httpx.HTTPError: For transport errors from remote backends
+        """
+
+
+class OllamaBackend(EmbeddingBackend):
+    """Embeddings from an Ollama server's /api/embeddings endpoint.
+
+    Calls go through a circuit breaker shared with the other Ollama callers,
+    so they fail fast with CircuitOpenError while the server is down.
+    """
+
+    name = "ollama"
+
+    def __init__(self,
+                 model: str = "nomic-embed-text",
+                 base_url: Optional[str] = None,
+                 timeout: float = 30.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        Initialize the Ollama backend.
+
+        Args:
+            model: Ollama embedding model name
+            base_url: Ollama server URL (defaults to OLLAMA_BASE_URL)
+            timeout: Timeout in seconds for each API call
+            breaker: Circuit breaker guarding calls (defaults to ollama_breaker)
+        """
+        super().__init__(model)
+        self.base_url = (base_url or OLLAMA_BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.breaker = breaker or ollama_breaker
+
+    @property
+    def embeddings_url(self) -> str:
+        """Full URL of the embeddings endpoint."""
+        return f"{self.base_url}/api/embeddings"
+
+    async def embed(self, text: str) -> List[float]:
+        """Generate an embedding through the Ollama API."""
+        with self.breaker:
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    self.embeddings_url,
+                    json={"model": self.model, "prompt": text},
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                result = response.json()
+
+            if "embedding" not in result:
+                raise EmbeddingAPIError(f"No embedding in response: {result}")
+
+            return result["embedding"]
+
+
+class HashingBackend(EmbeddingBackend):
+    """Deterministic CPU embedder: feature hashing plus random projection.
+
+    Word unigrams and bigrams are hashed (CRC32, stable across processes)
+    into a sparse count vector of n_features signed buckets, then projected
+    to dim dimensions with a fixed Gaussian matrix drawn from seed, and
+    L2-normalized. Texts sharing vocabulary get similar vectors, which is
+    enough to exercise retrieval end to end without a model.
+    """
+
+    name = "hashing"
+
+    _TOKEN_PATTERN = re.compile(r"\w+")
+
+    def __init__(self,
+                 model: str = "feature-hash-v1",
+                 dim: int = 768,
+                 n_features: int = 4096,
+                 seed: int = 0):
+        """
+        Initialize the hashing backend.
+
+        Args:
+            model: Label for the hashing scheme (part of the cache namespace)
+            dim: Output vector dimension
+            n_features: Number of hashed feature buckets before projection
+            seed: Seed for the projection matrix
+        """
+        if dim <= 0 or n_features <= 0:
+            raise ValueError("dim and n_features must be positive")
+        super().__init__(model)
+        self.dim = dim
+        self.n_features = n_features
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        self._projection = (
+            rng.standard_normal((n_features, dim)) / np.sqrt(dim)
+        ).astype(np.float32)
+
+    @property
+    def cache_namespace(self) -> str:
+        """Include the projection parameters so differently configured hashers never mix."""
+        return f"{super().cache_namespace}-d{self.dim}-f{self.n_features}-s{self.seed}"
+
+    def _features(self, text: str) -> np.ndarray:
+        """Hash a text's unigrams and bigrams into a signed count vector."""
+        tokens = self._TOKEN_PATTERN.findall(text.lower())
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        if not grams:
+            return np.zeros(self.n_features, dtype=np.float32)
+
+        hashes = np.fromiter(
+            (zlib.crc32(gram.encode()) for gram in grams),
+            dtype=np.uint32,
+            count=len(grams)
+        )
+        indices = (hashes % self.n_features).astype(np.intp)
+        # Use the top bit as the sign to reduce collision bias
+        signs = np.where(hashes >> 31, -1.0, 1.0)
+        return np.bincount(indices, weights=signs, minlength=self.n_features).astype(np.float32)
+
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed several texts with one matrix multiplication.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), dim) with L2-normalized rows
+        """
+        features = np.stack([self._features(text) for text in texts])
+        vectors = features @ self._projection
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms != 0)
+
+    async def embed(self, text: str) -> List[float]:
+        """Generate an embedding in-process."""
+        return self.embed_batch([text])[0].tolist()
+
+
+BACKENDS: Dict[str, Type[EmbeddingBackend]] = {
+    OllamaBackend.name: OllamaBackend,
+    HashingBackend.name: HashingBackend,
+}
+
+
+def create_backend(name: str, **options: Any) -> EmbeddingBackend:
+    """
+    Create an embedding backend by name.
+
+    Args:
+        name: Backend identifier ("ollama" or "hashing")
+        **options: Backend constructor arguments (model, base_url, dim, ...)
+
+    Returns:
+        Configured EmbeddingBackend instance
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    try:
+        backend_cls = BACKENDS[name.lower()]
+    except KeyError as e:
+        raise ValueError(
+            f"Unknown embedding backend {name!r}; available: {', '.join(BACKENDS)}"
+        ) from e
+    return backend_cls(**options)
@@ -0,0 +1,26 @@
+"""
+Custom exceptions for the embedding generation pipeline.
+"""
+from .circuit_breaker import CircuitOpenError
+
+class EmbeddingError(Exception):
+    """Base class for embedding generation errors."""
+    pass
+
+class EmbeddingAPIError(EmbeddingError):
+    """Error from the embedding backend API."""
+    pass
+
+class EmbeddingTimeoutError(EmbeddingError):
+    """Timeout during embedding generation."""
+    pass
+
+class EmbeddingInputTooLongError(EmbeddingError):
+    """Input exceeds max_tokens and the truncation policy is "error"."""
+    pass
+
+class EmbeddingCircuitOpenError(EmbeddingAPIError, CircuitOpenError):
+    """The embedding backend's circuit is open; the call was not attempted."""
+
+    def __init__(self, error: CircuitOpenError):
+        CircuitOpenError.__init__(self, error.name, error.retry_after)
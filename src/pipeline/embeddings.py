@@ -1,55 +1,177 @@
-"""Embeddings generation module using Ollama's nomic-embed-text model."""
-from typing import List, Dict, Optional, Callable
+"""Embeddings generation module using pluggable backends (Ollama's nomic-embed-text by default)."""
+from typing import Any, Iterable, List, Dict, Optional, Callable, AsyncIterator, Tuple
+from collections import OrderedDict
 import httpx
 import asyncio
 from pathlib import Path
+import re
 import time
+import unicodedata
 from src.utils.logging import get_logger
+from src.pipeline.monitoring import monitor, Metric, MetricType
 from .embeddings_cache import EmbeddingsCache
+from .embedding_backends import EmbeddingBackend, OllamaBackend, create_backend
+from .circuit_breaker import CircuitOpenError, retry_budget
+from .embedding_errors import (
+    EmbeddingAPIError,
+    EmbeddingTimeoutError,
+    EmbeddingInputTooLongError,
+    EmbeddingCircuitOpenError,
+)
 
 logger = get_logger(__name__)
 
+# Rough characters-per-token ratio for English text with nomic's tokenizer
+CHARS_PER_TOKEN = 4
 
-class EmbeddingError(Exception):
-    """Base class for embedding generation errors."""
-    pass
+# Policies for inputs longer than max_tokens
+TRUNCATION_POLICIES = ("truncate", "error")
 
 
-class EmbeddingAPIError(EmbeddingError):
-    """Error from the Ollama API."""
-    pass
+def estimate_token_count(text: str) -> int:
+    """Estimate the number of model tokens in a text.
 
+    Args:
+        text: Text to measure
 
-class EmbeddingTimeoutError(EmbeddingError):
-    """Timeout during embedding generation."""
-    pass
+    Returns:
+        Estimated token count (at least 1 for non-empty text)
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivial variations share one embedding.
+
+    Applies Unicode NFKC normalization, case folding and whitespace
+    collapsing, e.g. ``"  Who is  GANDALF? "`` becomes ``"who is gandalf?"``.
+
+    Args:
+        query: Raw query string
+
+    Returns:
+        Normalized query
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query).casefold()).strip()
+
+
+# Backend and model whose vectors were cached before per-backend namespacing
+LEGACY_CACHE_BACKEND = ("ollama", "nomic-embed-text")
 
 
 class EmbeddingGenerator:
-    """Generate embeddings using Ollama's nomic-embed-text model."""
+    """Generate embeddings through a pluggable backend (Ollama by default)."""
 
     def __init__(self,
                 cache_dir: str | Path = "data/cache/embeddings",
                 batch_size: int = 50,
                 max_retries: int = 3,
                 timeout: float = 30.0,
-                progress_callback: Optional[Callable[[int, int], None]] = None):
+                progress_callback: Optional[Callable[[int, int], None]] = None,
+                max_tokens: Optional[int] = 8192,
+                truncation_policy: str = "truncate",
+                backend: Optional[EmbeddingBackend] = None,
+                cache_options: Optional[Dict[str, Any]] = None,
+                query_cache_size: int = 1024):
         """Initialize the embedding generator.
 
         Args:
-            cache_dir: Directory to store embedding cache files
+            cache_dir: Root directory for embedding cache files; entries are
+                stored in a per-backend, per-model subdirectory
             batch_size: Number of texts to process in parallel
             max_retries: Maximum number of retries for failed API calls
             timeout: Timeout in seconds for each API call
             progress_callback: Optional callback for tracking progress
+            max_tokens: Maximum estimated tokens sent to the model per text
+                (None disables the limit)
+            truncation_policy: What to do with longer inputs: "truncate"
+                cuts them to max_tokens, "error" raises EmbeddingInputTooLongError
+            backend: Embedding backend (defaults to Ollama with nomic-embed-text)
+            cache_options: Extra EmbeddingsCache arguments, e.g. max_bytes,
+                max_entries, low_water or verify_on_start
+            query_cache_size: Number of normalized query vectors kept in the
+                in-memory LRU used by embed_query (0 disables it)
         """
-        self.base_url = "http://localhost:11434/api/embeddings"
-        self.model = "nomic-embed-text"
+        if truncation_policy not in TRUNCATION_POLICIES:
+            raise ValueError(
+                f"truncation_policy must be one of {TRUNCATION_POLICIES}, "
+                f"got {truncation_policy!r}"
+            )
+        self.backend = backend or OllamaBackend(timeout=timeout)
         self.batch_size = batch_size
         self.max_retries = max_retries
         self.timeout = timeout
         self.progress_callback = progress_callback
-        self.cache = EmbeddingsCache(cache_dir)
+        self.max_tokens = max_tokens
+        self.truncation_policy = truncation_policy
+        self.truncated_inputs = 0
+        # Namespace the cache so vectors from different backends/models never mix;
+        # the default backend still reads entries cached before namespacing
+        cache_root = Path(cache_dir)
+        legacy_dir = (
+            cache_root
+            if (self.backend.name, self.backend.model) == LEGACY_CACHE_BACKEND
+            else None
+        )
+        self.cache = EmbeddingsCache(
+            cache_root / self.backend.cache_namespace, legacy_dir, **(cache_options or {})
+        )
+        # Single-flight registry: text hash -> task shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.coalesced_requests = 0
+        # Hot LRU of query vectors: normalized query -> embedding
+        self.query_cache_size = query_cache_size
+        self._query_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.query_cache_hits = 0
+        self.query_cache_misses = 0
+
+    @classmethod
+    def from_config(cls,
+                    config: Optional[Dict[str, Any]] = None,
+                    **kwargs: Any) -> "EmbeddingGenerator":
+        """Create a generator with the backend and model selected in config.
+
+        Reads the ``embeddings`` section of fastagent.config.yaml, where
+        ``backend`` names the backend, an optional ``cache`` mapping holds
+        EmbeddingsCache options (e.g. ``max_bytes``), an optional ``queries``
+        mapping sets ``cache_size`` of the query LRU, and the remaining keys
+        are passed to the backend (e.g. ``model``, ``base_url``, ``dim``).
+        The flat environment overrides ``BUDDHARAUER_EMBEDDINGS_BACKEND``
+        and ``BUDDHARAUER_EMBEDDINGS_MODEL`` take precedence.
+
+        Args:
+            config: Loaded configuration (defaults to load_config())
+            **kwargs: Additional EmbeddingGenerator arguments
+
+        Returns:
+            Configured EmbeddingGenerator
+        """
+        if config is None:
+            from src.utils.config import load_config
+            config = load_config()
+
+        options = dict(config.get("embeddings") or {})
+        name = config.get("embeddings_backend") or options.pop("backend", "ollama")
+        options.pop("backend", None)
+        if "cache" in options:
+            kwargs.setdefault("cache_options", options.pop("cache") or {})
+        queries = options.pop("queries", None) or {}
+        if "cache_size" in queries:
+            kwargs.setdefault("query_cache_size", queries["cache_size"])
+        if config.get("embeddings_model"):
+            options["model"] = config["embeddings_model"]
+        if name == OllamaBackend.name and "timeout" in kwargs:
+            options.setdefault("timeout", kwargs["timeout"])
+
+        return cls(backend=create_backend(name, **options), **kwargs)
+
+    @property
+    def model(self) -> str:
+        """Get the model name of the active backend."""
+        return self.backend.model
 
     @property
     def cache_dir(self) -> Path:
@@ -75,32 +197,30 @@ class EmbeddingGenerator:
         Raises:
             EmbeddingAPIError: If API call fails after all retries
             EmbeddingTimeoutError: If API call times out
+            EmbeddingCircuitOpenError: If the backend's circuit is open
+
+        Note:
+            Retries draw from the shared retry_budget, so an outage fails
+            fast instead of every text sleeping through its own retries.
         """
         start_time = time.time()
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.base_url,
-                    json={"model": self.model, "prompt": text},
-                    timeout=self.timeout
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                if "embedding" not in result:
-                    raise EmbeddingAPIError(f"No embedding in response: {result}")
-                    
-                return result["embedding"]
-                
+            embedding = await self.backend.embed(text)
+            retry_budget.deposit()
+            return embedding
+
+        except CircuitOpenError as e:
+            raise EmbeddingCircuitOpenError(e) from None
+
         except httpx.TimeoutException:
-            if retry_count < self.max_retries:
+            if retry_count < self.max_retries and retry_budget.try_acquire():
                 await asyncio.sleep(2 ** retry_count)  # Exponential backoff
                 return await self._generate_single(text, retry_count + 1)
             raise EmbeddingTimeoutError(f"Timeout after {self.timeout}s")
             
         except httpx.HTTPError as e:
-            if retry_count < self.max_retries:
+            if retry_count < self.max_retries and retry_budget.try_acquire():
                 await asyncio.sleep(2 ** retry_count)
                 return await self._generate_single(text, retry_count + 1)
             raise EmbeddingAPIError(f"API error: {str(e)}")
@@ -110,6 +230,116 @@ class EmbeddingGenerator:
             if elapsed > self.timeout / 2:  # Log slow requests
                 logger.warning(f"Slow embedding generation ({elapsed:.1f}s): {text[:100]}...")
     
+    def _prepare_input(self, text: str) -> str:
+        """Apply the max_tokens policy to a text before it is sent to the model.
+
+        Args:
+            text: Original text
+
+        Returns:
+            Text that fits within max_tokens
+
+        Raises:
+            EmbeddingInputTooLongError: If the text is too long and the
+                truncation policy is "error"
+        """
+        if self.max_tokens is None:
+            return text
+        token_count = estimate_token_count(text)
+        if token_count <= self.max_tokens:
+            return text
+        if self.truncation_policy == "error":
+            raise EmbeddingInputTooLongError(
+                f"Input has ~{token_count} tokens, exceeding max_tokens={self.max_tokens}"
+            )
+
+        # Cut at the character budget, backing off to a word boundary if one is close
+        limit = self.max_tokens * CHARS_PER_TOKEN
+        truncated = text[:limit]
+        boundary = truncated.rfind(" ")
+        if boundary > limit * 0.9:
+            truncated = truncated[:boundary]
+
+        self.truncated_inputs += 1
+        monitor.record_metric(Metric(
+            "embedding_truncated_inputs",
+            self.truncated_inputs,
+            MetricType.COUNTER,
+            labels={"model": self.model}
+        ))
+        logger.warning(
+            f"Truncated embedding input from ~{token_count} to {self.max_tokens} tokens: "
+            f"{text[:100]}..."
+        )
+        return truncated
+
+    def _bucket_by_length(self, texts: List[str]) -> List[List[str]]:
+        """Group texts into dispatch batches of similar estimated length.
+
+        Texts are sorted by estimated token count and split into
+        power-of-two length buckets, so a batch of short texts never waits
+        on one very long text. Each bucket is then cut into batch_size batches.
+
+        Args:
+            texts: Texts to group
+
+        Returns:
+            List of batches, shortest texts first
+        """
+        buckets: Dict[int, List[str]] = {}
+        for text in sorted(texts, key=estimate_token_count):
+            bucket = estimate_token_count(text).bit_length()
+            buckets.setdefault(bucket, []).append(text)
+
+        return [
+            bucket_texts[i:i + self.batch_size]
+            for _, bucket_texts in sorted(buckets.items())
+            for i in range(0, len(bucket_texts), self.batch_size)
+        ]
+
+    async def _generate_coalesced(self, text: str) -> List[float]:
+        """Generate and cache an embedding, sharing in-flight work per text.
+
+        Concurrent callers asking for the same text await a single task
+        instead of each calling the API and writing the cache file. Every
+        caller, the first included, awaits it through asyncio.shield, so
+        cancelling one caller never cancels the others.
+
+        Args:
+            text: Text to generate embedding for
+
+        Returns:
+            List of floating point values representing the embedding
+
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        key = self.cache.text_hash(text)
+        task = self._inflight.get(key)
+        # A task on another event loop (e.g. a BreakpointChunker's) cannot be awaited here
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced_requests += 1
+        else:
+            task = asyncio.create_task(self._generate_and_cache(text))
+            self._inflight[key] = task
+
+            def forget(done: asyncio.Task) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+                if not done.cancelled():
+                    # Mark retrieved so a failure nobody awaited does not log a warning
+                    done.exception()
+
+            task.add_done_callback(forget)
+        return await asyncio.shield(task)
+
+    async def _generate_and_cache(self, text: str) -> List[float]:
+        """Generate an embedding and cache it under the original text."""
+        # Only the model input is truncated
+        embedding = await self._generate_single(self._prepare_input(text))
+        await self.cache.put(text, embedding)
+        return embedding
+
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a single text.
         
@@ -123,13 +353,12 @@ class EmbeddingGenerator:
             EmbeddingError: If embedding generation fails
         """
         # Try cache first
-        if cached := await self.cache.get(text):
-            return cached
+        cached = await self.cache.get(text)
+        if cached is not None:
+            return cached.tolist()
             
-        # Generate new embedding
-        embedding = await self._generate_single(text)
-        await self.cache.put(text, embedding)
-        return embedding
+        # Generate new embedding (shared with any identical in-flight request)
+        return await self._generate_coalesced(text)
 
     async def batch_generate_embeddings(self, 
                                       texts: List[str], 
@@ -154,24 +383,26 @@ class EmbeddingGenerator:
         results = {}
         errors = []
         
+        # Collapse duplicate texts so each is looked up and dispatched once
+        unique_texts = list(dict.fromkeys(texts))
+
         # Get cached embeddings first
-        cached = await self.cache.get_batch(texts)
-        results.update(cached)
+        cached = await self.cache.get_batch(unique_texts)
+        results.update((text, embedding.tolist()) for text, embedding in cached.items())
         
         # Generate embeddings for uncached texts
-        uncached = [t for t in texts if t not in cached]
+        uncached = [t for t in unique_texts if t not in cached]
         if not uncached:
             return results
             
         logger.info(f"Found {len(cached)} cached embeddings, generating {len(uncached)} new")
         processed = len(cached)
         
-        # Process in batches
-        for i in range(0, len(uncached), self.batch_size):
-            batch = uncached[i:i + self.batch_size]
+        # Process in batches of similar-length texts
+        for batch in self._bucket_by_length(uncached):
             
-            # Generate embeddings in parallel
-            tasks = [self._generate_single(text) for text in batch]
+            # Generate embeddings in parallel (results are cached as they complete)
+            tasks = [self._generate_coalesced(text) for text in batch]
             batch_results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Process results
@@ -185,11 +416,8 @@ class EmbeddingGenerator:
                 
             processed += len(batch)
             if self.progress_callback:
-                self.progress_callback(processed, len(texts))
+                self.progress_callback(processed, len(unique_texts))
                 
-        # Cache new embeddings
-        await self.cache.put_batch({t: e for t, e in results.items() if t in uncached})
-        
         elapsed = time.time() - start_time
         logger.info(
             f"Generated {len(results)} embeddings in {elapsed:.1f}s "
@@ -203,4 +431,163 @@ class EmbeddingGenerator:
             if len(errors) > 5:
                 logger.warning(f"  ...and {len(errors)-5} more errors")
                 
-        return results
\ No newline at end of file
+        return results
+
+    def _remember_query(self, key: str, embedding: List[float]) -> None:
+        """Store a query vector in the hot LRU, evicting the oldest if full."""
+        if self.query_cache_size <= 0:
+            return
+        self._query_cache[key] = embedding
+        self._query_cache.move_to_end(key)
+        while len(self._query_cache) > self.query_cache_size:
+            self._query_cache.popitem(last=False)
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Embed a search query through the in-memory query cache.
+
+        Queries are normalized with normalize_query() first, so case and
+        whitespace variations share one vector. Hits are served from memory;
+        misses go through generate_embedding() (disk cache, then the backend).
+
+        Args:
+            query: Raw query string
+
+        Returns:
+            Embedding of the normalized query (shared; do not modify)
+
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        key = normalize_query(query)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            self.query_cache_hits += 1
+            return cached
+
+        self.query_cache_misses += 1
+        embedding = await self.generate_embedding(key)
+        self._remember_query(key, embedding)
+        return embedding
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed several search queries concurrently via embed_query().
+
+        Args:
+            queries: Raw query strings
+
+        Returns:
+            Embeddings in the same order as queries
+        """
+        return list(await asyncio.gather(*(self.embed_query(q) for q in queries)))
+
+    async def warm_query_cache(self, queries: Iterable[str]) -> int:
+        """Pre-compute vectors for likely queries, e.g. the most popular ones.
+
+        Args:
+            queries: Queries ordered from most to least important; only the
+                first query_cache_size are used
+
+        Returns:
+            Number of queries added to the cache
+        """
+        keys = list(dict.fromkeys(normalize_query(q) for q in queries))
+        keys = [k for k in keys[:self.query_cache_size] if k not in self._query_cache]
+        if not keys:
+            return 0
+
+        embeddings = await self.batch_generate_embeddings(keys, ignore_errors=True)
+        # Insert least important first so the top queries are most recently used
+        warmed = 0
+        for key in reversed(keys):
+            if key in embeddings:
+                self._remember_query(key, embeddings[key])
+                warmed += 1
+        logger.info(f"Warmed query embedding cache with {warmed}/{len(keys)} queries")
+        return warmed
+
+    async def stream_embeddings(self,
+                                texts: List[str],
+                                ignore_errors: bool = False,
+                                buffer_size: Optional[int] = None
+                                ) -> AsyncIterator[Tuple[int, str, List[float]]]:
+        """Generate embeddings and yield them as they complete.
+
+        Cached texts are yielded first, then newly generated embeddings in
+        completion order. At most ``batch_size`` API calls are in flight, and
+        at most ``buffer_size`` finished results wait for the consumer; when
+        the buffer is full, workers pause until the consumer catches up.
+
+        Args:
+            texts: List of texts to generate embeddings for
+            ignore_errors: If True, failed embeddings will be skipped
+            buffer_size: Maximum number of buffered results (default: batch_size)
+
+        Yields:
+            Tuples of (index into texts, text, embedding). Duplicate texts
+            are generated once but yielded for every index.
+
+        Raises:
+            EmbeddingError: If any embedding fails and ignore_errors is False
+        """
+        if not texts:
+            return
+
+        # Map each unique text to every position it occupies
+        positions: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            positions.setdefault(text, []).append(index)
+
+        cached = await self.cache.get_batch(list(positions))
+        for text, embedding in cached.items():
+            embedding = embedding.tolist()
+            for index in positions[text]:
+                yield index, text, embedding
+
+        # Dispatch shortest first so concurrently in-flight texts have similar lengths
+        pending = sorted(
+            (t for t in positions if t not in cached),
+            key=estimate_token_count
+        )
+        if not pending:
+            return
+
+        logger.info(f"Streaming {len(pending)} new embeddings ({len(cached)} from cache)")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size or self.batch_size)
+        work = iter(pending)
+
+        async def worker() -> None:
+            for text in work:
+                try:
+                    result = await self._generate_coalesced(text)
+                except Exception as e:
+                    result = e
+                await queue.put((text, result))
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.batch_size, len(pending)))
+        ]
+        processed = len(cached)
+        errors = 0
+        try:
+            for _ in range(len(pending)):
+                text, result = await queue.get()
+                processed += 1
+                if self.progress_callback:
+                    self.progress_callback(processed, len(positions))
+                if isinstance(result, Exception):
+                    if not ignore_errors:
+                        raise result
+                    errors += 1
+                    logger.warning(f"Failed to generate embedding for {text[:100]}...: {result}")
+                    continue
+                for index in positions[text]:
+                    yield index, text, result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        if errors:
+            logger.warning(f"Skipped {errors} texts that failed to embed")
@@ -1,32 +1,679 @@
-"""Cache management for embeddings."""
-from typing import List, Dict, Optional, Set
+"""Cache management for embeddings.
+
+Entries are one file per text, named by the text's SHA-256. An in-memory
+index of entry sizes in least-recently-used order is built when the cache is
+opened, so the cache can be capped by total bytes and/or entry count:
+
+    - Reads and writes move entries to the most-recently-used end. Access is
+      persisted by touching the file's mtime at most once per touch_interval,
+      so LRU order survives restarts without a write per hit.
+    - When a put pushes the cache over a cap, a background task evicts the
+      least-recently-used entries in bulk down to low_water of the cap.
+    - An optional integrity sweep decodes every entry in a worker thread and
+      removes corrupted files, instead of finding them one read at a time.
+
+Membership checks (get, get_batch, get_uncached_texts) are answered from
+memory, so misses never touch the filesystem. Small caches use the exact
+key index; caches above bloom_threshold entries without size caps use a
+Bloom filter instead of holding every key, falling back to the filesystem
+only for (rare) false positives. The structure is loaded when the cache is
+opened and kept in sync on put, eviction and corrupt-entry removal; files
+written by other processes after opening are not seen until reopened.
+
+Entries are stored in a compact binary format (``.emb``): a fixed header
+followed by the vector as float16 or float32, optionally zstd-compressed.
+The source text is not stored (the file name is its hash) unless store_text
+is enabled for debugging. Reads decode straight to a float32 numpy array.
+Entries in the older JSON format (``.json``) are still read, and are
+rewritten in the binary format when hit.
+
+Cache size, evictions and corrupted entries are exported through the
+monitoring system as embedding_cache_* metrics.
+"""
+from typing import Iterable, List, Dict, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 import json
 import hashlib
+import math
+import os
+import struct
 import time
 import asyncio
+import numpy as np
 from contextlib import asynccontextmanager
 import aiofiles
 import aiofiles.os
 
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+from src.utils.logging import get_logger
+from src.pipeline.monitoring import monitor, Metric, MetricType
+
+logger = get_logger(__name__)
+
+ENTRY_SUFFIX = ".emb"
+JSON_SUFFIX = ".json"  # Entries written before the binary format
+
+# Binary entry header: magic, version, dtype code, flags, pad, dimension,
+# timestamp, SHA-256 of the text
+_HEADER = struct.Struct("<4sBBBxId32s")
+_MAGIC = b"EMBC"
+_VERSION = 1
+_FLAG_ZSTD = 0x01
+_FLAG_TEXT = 0x02
+
+# Supported storage dtypes and their header codes
+ENTRY_DTYPES = {"float16": 1, "float32": 2}
+_DTYPE_BY_CODE = {code: np.dtype(name).newbyteorder("<") for name, code in ENTRY_DTYPES.items()}
+COMPRESSION_MODES = ("none", "zstd")
+
+# Membership structures for cache lookups
+MEMBERSHIP_MODES = ("auto", "exact", "bloom")
+
+
+class BloomFilter:
+    """Bloom filter over hex SHA-256 keys.
+
+    Bit positions come from double hashing the first 128 bits of the key, so
+    no extra hashing is needed for cache keys. Deletions are not supported;
+    removed keys stay as false positives.
+    """
+
+    _MASK = (1 << 64) - 1
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Initialize an empty filter.
+
+        Args:
+            capacity: Expected number of keys
+            error_rate: Target false positive rate at capacity
+        """
+        capacity = max(capacity, 1)
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    @staticmethod
+    def _halves(key: str) -> Tuple[int, int]:
+        """Split a key into two 64-bit hashes."""
+        try:
+            return int(key[:16], 16), int(key[16:32], 16) | 1
+        except ValueError:
+            digest = hashlib.sha256(key.encode()).hexdigest()
+            return int(digest[:16], 16), int(digest[16:32], 16) | 1
+
+    def _positions(self, key: str) -> List[int]:
+        h1, h2 = self._halves(key)
+        return [((h1 + i * h2) & self._MASK) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        """Add a key."""
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        """Add many keys at once using vectorized bit arithmetic."""
+        halves = np.array([self._halves(k) for k in keys], dtype=np.uint64).reshape(-1, 2)
+        if not len(halves):
+            return
+        i = np.arange(self.num_hashes, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            positions = (halves[:, :1] + i * halves[:, 1:]) % np.uint64(self.num_bits)
+        positions = positions.ravel()
+        np.bitwise_or.at(
+            self._bits, (positions >> np.uint64(3)).astype(np.intp),
+            (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8))
+        )
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+@dataclass
+class CacheEntry:
+    """A decoded cache entry."""
+    embedding: np.ndarray
+    timestamp: float
+    text_hash: str
+    text: Optional[str] = None
+
+
+def encode_entry(text: str,
+                 embedding: "List[float] | np.ndarray",
+                 dtype: str = "float16",
+                 compression: str = "none",
+                 store_text: bool = False,
+                 compression_level: int = 3) -> bytes:
+    """Serialize an embedding in the binary cache format.
+
+    Vectors with values outside the float16 range are stored as float32.
+
+    Args:
+        text: Text the embedding was generated for
+        embedding: Embedding vector
+        dtype: Storage dtype, "float16" or "float32"
+        compression: "none" or "zstd"
+        store_text: Keep the text in the entry (for debugging)
+        compression_level: zstd compression level
+
+    Returns:
+        Encoded entry
+
+    Raises:
+        ValueError: If the embedding is not one-dimensional
+    """
+    vector = np.asarray(embedding, dtype="<f4")
+    if vector.ndim != 1:
+        raise ValueError(f"Embedding must be one-dimensional, got shape {vector.shape}")
+    # Checked before casting, as an overflowing cast warns on every write
+    if dtype == "float16" and vector.size and not np.abs(vector).max() <= np.finfo(np.float16).max:
+        dtype = "float32"
+    vector = vector.astype(np.dtype(dtype).newbyteorder("<"), copy=False)
+
+    flags = 0
+    payload = vector.tobytes()
+    if store_text:
+        flags |= _FLAG_TEXT
+        payload += text.encode()
+    if compression == "zstd":
+        flags |= _FLAG_ZSTD
+        payload = zstandard.ZstdCompressor(level=compression_level).compress(payload)
+
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, ENTRY_DTYPES[dtype], flags, len(vector),
+        time.time(), hashlib.sha256(text.encode()).digest()
+    )
+    return header + payload
+
+
+def _decode_binary(data: bytes, with_text: bool = False) -> CacheEntry:
+    """Decode a binary cache entry."""
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated cache entry")
+    magic, version, dtype_code, flags, dim, timestamp, digest = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION or dtype_code not in _DTYPE_BY_CODE:
+        raise ValueError("Unrecognized cache entry header")
+
+    payload = memoryview(data)[_HEADER.size:]
+    if flags & _FLAG_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Cache entry is zstd-compressed but zstandard is not installed")
+        try:
+            payload = memoryview(zstandard.ZstdDecompressor().decompress(payload))
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Corrupted compressed cache entry: {e}") from e
+
+    dtype = _DTYPE_BY_CODE[dtype_code]
+    vector_bytes = dim * dtype.itemsize
+    if len(payload) < vector_bytes:
+        raise ValueError("Truncated cache entry payload")
+    embedding = np.frombuffer(payload, dtype=dtype, count=dim).astype(np.float32)
+
+    text = None
+    if with_text and flags & _FLAG_TEXT:
+        text = bytes(payload[vector_bytes:]).decode()
+    return CacheEntry(embedding, timestamp, digest.hex(), text)
+
+
+def _decode_json(data: bytes) -> CacheEntry:
+    """Decode a cache entry in the older JSON format."""
+    entry = json.loads(data)
+    text = entry.get("text")
+    return CacheEntry(
+        np.asarray(entry["embedding"], dtype=np.float32),
+        entry.get("timestamp", 0.0),
+        hashlib.sha256(text.encode()).hexdigest() if text is not None else "",
+        text,
+    )
+
+
+def decode_entry(data: bytes, with_text: bool = True) -> CacheEntry:
+    """Deserialize a cache entry in either the binary or the JSON format.
+
+    Args:
+        data: Raw entry bytes
+        with_text: Decode the stored text, if any
+
+    Returns:
+        Decoded entry with a float32 embedding
+
+    Raises:
+        ValueError, KeyError, TypeError: If the entry is corrupted
+    """
+    if data[:len(_MAGIC)] == _MAGIC:
+        return _decode_binary(data, with_text)
+    return _decode_json(data)
+
+
+def read_entry(path: str | Path) -> CacheEntry:
+    """Read and decode a cache file, e.g. for inspection while debugging.
+
+    Args:
+        path: Cache file path
+
+    Returns:
+        Decoded entry
+    """
+    return decode_entry(Path(path).read_bytes())
+
+
+@dataclass
+class _IndexEntry:
+    """Size and last persisted access time of one cache file."""
+    __slots__ = ("size", "mtime")
+    size: int
+    mtime: float
+
+
 class EmbeddingsCache:
     """Manages caching of embeddings with optimized async I/O."""
-    
-    def __init__(self, cache_dir: str | Path):
+
+    def __init__(self,
+                 cache_dir: str | Path,
+                 legacy_dir: Optional[str | Path] = None,
+                 max_bytes: Optional[int] = None,
+                 max_entries: Optional[int] = None,
+                 low_water: float = 0.8,
+                 touch_interval: float = 3600.0,
+                 verify_on_start: bool = False,
+                 membership: str = "auto",
+                 bloom_threshold: int = 1_000_000,
+                 bloom_error_rate: float = 0.001,
+                 dtype: str = "float16",
+                 compression: str = "none",
+                 compression_level: int = 3,
+                 store_text: bool = False):
         """Initialize the embeddings cache.
-        
+
         Args:
             cache_dir: Directory to store embedding cache files
+            legacy_dir: Optional read-only fallback directory holding entries
+                written before the cache was namespaced per backend and model.
+                Hits there are copied into cache_dir.
+            max_bytes: Cap on the total size of cache files (None for no cap)
+            max_entries: Cap on the number of cache files (None for no cap)
+            low_water: Fraction of each cap that garbage collection evicts
+                down to, so eviction runs in bulk rather than on every put
+            touch_interval: Minimum seconds between mtime updates that persist
+                an entry's access time
+            verify_on_start: Run an integrity sweep in a worker thread the
+                first time the cache is used
+            membership: "exact" keeps every key in memory, "bloom" uses a
+                Bloom filter, "auto" picks bloom above bloom_threshold
+                entries when no size cap requires the full LRU index
+            bloom_threshold: Entry count above which "auto" uses a Bloom filter
+            bloom_error_rate: Target false positive rate of the Bloom filter
+            dtype: Storage precision of vectors, "float16" (half the size,
+                ample for cosine similarity) or "float32"
+            compression: "none" or "zstd" (requires the zstandard package)
+            compression_level: zstd compression level
+            store_text: Keep the source text in each entry for debugging;
+                by default only its hash (the file name) is kept
         """
+        if not 0.0 < low_water <= 1.0:
+            raise ValueError("low_water must be in (0, 1]")
+        if membership not in MEMBERSHIP_MODES:
+            raise ValueError(f"membership must be one of {MEMBERSHIP_MODES}, got {membership!r}")
+        if dtype not in ENTRY_DTYPES:
+            raise ValueError(f"dtype must be one of {tuple(ENTRY_DTYPES)}, got {dtype!r}")
+        if compression not in COMPRESSION_MODES:
+            raise ValueError(
+                f"compression must be one of {COMPRESSION_MODES}, got {compression!r}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError(
+                "zstd compression requires the zstandard package: pip install zstandard")
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.legacy_dir = Path(legacy_dir) if legacy_dir is not None else None
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.low_water = low_water
+        self.touch_interval = touch_interval
+        self.membership = membership
+        self.bloom_threshold = bloom_threshold
+        self.bloom_error_rate = bloom_error_rate
+        self.dtype = dtype
+        self.compression = compression
+        self.compression_level = compression_level
+        self.store_text = store_text
         self._write_locks: Dict[str, asyncio.Lock] = {}
-        
+
+        # LRU index: key -> entry, least recently used first. Not kept in
+        # Bloom mode without caps, where only the counters are maintained.
+        self._index: "OrderedDict[str, _IndexEntry]" = OrderedDict()
+        self._track_lru = True
+        self._bloom: Optional[BloomFilter] = None
+        self._legacy_keys: Set[str] = set()
+        self._entry_count = 0
+        self.total_bytes = 0
+        self.evictions = 0
+        self.corrupt_entries = 0
+        self._gc_task: Optional[asyncio.Task] = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self._sweep_pending = verify_on_start
+        self._load_index()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Get the content hash used to key a text in the cache.
+
+        Args:
+            text: Text to hash
+
+        Returns:
+            Hex-encoded SHA-256 digest of the text
+        """
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def _path_for_key(self, key: str) -> Path:
+        """Get cache file path for a text hash."""
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
     def _get_cache_path(self, text: str) -> Path:
         """Get cache file path for text content."""
-        text_hash = hashlib.sha256(text.encode()).hexdigest()
-        return self.cache_dir / f"{text_hash}.json"
-    
+        return self._path_for_key(self.text_hash(text))
+
+    def _json_path_for_key(self, key: str) -> Path:
+        """Get the path of an entry written in the older JSON format."""
+        return self.cache_dir / f"{key}{JSON_SUFFIX}"
+
+    def _get_legacy_path(self, text: str) -> Optional[Path]:
+        """Get the legacy cache file path for text content, if a legacy dir is set."""
+        if self.legacy_dir is None:
+            return None
+        return self.legacy_dir / f"{self.text_hash(text)}{JSON_SUFFIX}"
+
+    def _exists(self, text: str) -> bool:
+        """Check whether a text has an entry in the cache or legacy dir."""
+        key = self.text_hash(text)
+        if self._path_for_key(key).exists() or self._json_path_for_key(key).exists():
+            return True
+        legacy_path = self._get_legacy_path(text)
+        return legacy_path is not None and legacy_path.exists()
+
+    # ------------------------------------------------------------------
+    # Index and size accounting
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _scan(directory: Path) -> List[Tuple[float, str, int]]:
+        """List (mtime, key, size) for every entry file in a directory.
+
+        Both binary and JSON entries are listed; a key present in both
+        formats is listed once, with the combined size.
+        """
+        found: Dict[str, Tuple[float, int]] = {}
+        with os.scandir(directory) as it:
+            for dirent in it:
+                key, suffix = os.path.splitext(dirent.name)
+                if suffix not in (ENTRY_SUFFIX, JSON_SUFFIX) or not dirent.is_file():
+                    continue
+                try:
+                    stat = dirent.stat()
+                except OSError:
+                    continue
+                mtime, size = found.get(key, (0.0, 0))
+                found[key] = (max(mtime, stat.st_mtime), size + stat.st_size)
+        return [(mtime, key, size) for key, (mtime, size) in found.items()]
+
+    def _load_index(self) -> None:
+        """Build the LRU index and membership structure from disk."""
+        entries = self._scan(self.cache_dir)
+        legacy_keys = (
+            [key for _, key, _ in self._scan(self.legacy_dir)]
+            if self.legacy_dir is not None and self.legacy_dir.is_dir() else []
+        )
+
+        has_caps = self.max_bytes is not None or self.max_entries is not None
+        use_bloom = self.membership == "bloom" or (
+            self.membership == "auto"
+            and not has_caps
+            and len(entries) + len(legacy_keys) > self.bloom_threshold
+        )
+        self._entry_count = len(entries)
+        self.total_bytes = sum(size for _, _, size in entries)
+
+        if use_bloom:
+            self._bloom = BloomFilter(
+                2 * (len(entries) + len(legacy_keys)) + 1024, self.bloom_error_rate
+            )
+            self._bloom.add_many(key for _, key, _ in entries)
+            self._bloom.add_many(legacy_keys)
+            self._track_lru = has_caps
+        else:
+            self._legacy_keys = set(legacy_keys)
+
+        if self._track_lru:
+            for mtime, key, size in sorted(entries):
+                self._index[key] = _IndexEntry(size, mtime)
+
+    def _may_contain(self, key: str) -> bool:
+        """Check membership in memory; False means a guaranteed miss."""
+        if self._bloom is not None:
+            return key in self._bloom
+        return key in self._index or key in self._legacy_keys
+
+    def _may_contain_legacy(self, key: str) -> bool:
+        """Check whether the legacy dir may hold a key."""
+        if self.legacy_dir is None:
+            return False
+        if self._bloom is not None:
+            return key in self._bloom
+        return key in self._legacy_keys
+
+    def _record_access(self, key: str, size: Optional[int] = None) -> None:
+        """Mark an entry as most recently used, adding or resizing it if needed."""
+        if not self._track_lru:
+            if size is not None and key not in self._bloom:
+                self._entry_count += 1
+                self.total_bytes += size
+            self._bloom.add(key)
+            return
+
+        if self._bloom is not None:
+            self._bloom.add(key)
+        now = time.time()
+        entry = self._index.get(key)
+        if entry is None:
+            self._index[key] = _IndexEntry(size or 0, now)
+            self._entry_count += 1
+            self.total_bytes += size or 0
+            return
+
+        self._index.move_to_end(key)
+        if size is not None:
+            self.total_bytes += size - entry.size
+            entry.size = size
+            entry.mtime = now
+        elif now - entry.mtime > self.touch_interval:
+            # Persist the access so LRU order survives restarts
+            try:
+                os.utime(self._path_for_key(key))
+                entry.mtime = now
+            except OSError:
+                pass
+
+    def _forget(self, key: str, size: Optional[int] = None) -> None:
+        """Drop an entry from the index.
+
+        Args:
+            key: Entry key
+            size: Size of a removed file, needed to keep the counters right
+                when the LRU index is not tracked
+        """
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._entry_count -= 1
+            self.total_bytes -= entry.size
+        elif not self._track_lru and size is not None:
+            self._entry_count -= 1
+            self.total_bytes -= size
+
+    @property
+    def entry_count(self) -> int:
+        """Number of entries in the cache directory."""
+        return self._entry_count
+
+    def _over_limit(self, fraction: float = 1.0) -> bool:
+        """Check whether the cache exceeds fraction of either cap."""
+        return (
+            (self.max_bytes is not None and self.total_bytes > self.max_bytes * fraction)
+            or (self.max_entries is not None and self._entry_count > self.max_entries * fraction)
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """Get cache size and maintenance counters.
+
+        Returns:
+            Dictionary with entries, bytes, caps, evictions and corrupt_entries
+        """
+        return {
+            "entries": self._entry_count,
+            "membership": "bloom" if self._bloom is not None else "exact",
+            "bytes": self.total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "corrupt_entries": self.corrupt_entries,
+        }
+
+    def _record_size_metrics(self) -> None:
+        """Export cache size gauges."""
+        labels = {"cache": self.cache_dir.name}
+        monitor.record_metric(Metric(
+            "embedding_cache_bytes", self.total_bytes, MetricType.GAUGE, labels=labels))
+        monitor.record_metric(Metric(
+            "embedding_cache_entries", self._entry_count, MetricType.GAUGE, labels=labels))
+
+    # ------------------------------------------------------------------
+    # Background maintenance
+    # ------------------------------------------------------------------
+
+    def _start_background_tasks(self) -> None:
+        """Start the startup sweep and/or garbage collection when due."""
+        if self._sweep_pending:
+            self._sweep_pending = False
+            self._sweep_task = asyncio.get_running_loop().create_task(self.verify_integrity())
+        if self._over_limit() and (self._gc_task is None or self._gc_task.done()):
+            self._gc_task = asyncio.get_running_loop().create_task(self.collect_garbage())
+
+    @staticmethod
+    def _unlink_all(paths: List[Path]) -> None:
+        """Delete files, ignoring ones that are already gone."""
+        for path in paths:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not delete cache entry {path}: {e}")
+
+    async def collect_garbage(self) -> int:
+        """Evict least-recently-used entries until the cache is under low_water.
+
+        Returns:
+            Number of entries evicted
+        """
+        if not self._over_limit():
+            return 0
+
+        victims: List[Path] = []
+        while self._index and self._over_limit(self.low_water):
+            key, entry = self._index.popitem(last=False)
+            self._entry_count -= 1
+            self.total_bytes -= entry.size
+            victims.append(self._path_for_key(key))
+            victims.append(self._json_path_for_key(key))
+
+        await asyncio.to_thread(self._unlink_all, victims)
+        evicted = len(victims) // 2
+        self.evictions += evicted
+        logger.info(
+            f"Evicted {evicted} embedding cache entries from {self.cache_dir} "
+            f"({self._entry_count} entries, {self.total_bytes} bytes remain)"
+        )
+        monitor.record_metric(Metric(
+            "embedding_cache_evictions", self.evictions, MetricType.COUNTER,
+            labels={"cache": self.cache_dir.name}))
+        self._record_size_metrics()
+        return evicted
+
+    def _find_corrupt(self) -> List[Tuple[str, int]]:
+        """Decode every entry and delete the ones that fail (runs in a worker thread).
+
+        Returns:
+            (key, size) of each removed entry
+        """
+        corrupt = []
+        for _, key, size in self._scan(self.cache_dir):
+            for path in (self._path_for_key(key), self._json_path_for_key(key)):
+                try:
+                    self._decode(path.read_bytes())
+                except FileNotFoundError:
+                    continue
+                except (ValueError, KeyError, TypeError, OSError):
+                    corrupt.append((key, size))
+                    break
+        self._unlink_all([
+            path for key, _ in corrupt
+            for path in (self._path_for_key(key), self._json_path_for_key(key))
+        ])
+        return corrupt
+
+    async def verify_integrity(self) -> int:
+        """Decode every entry in a worker thread and remove corrupted ones.
+
+        Returns:
+            Number of corrupted entries removed
+        """
+        corrupt = await asyncio.to_thread(self._find_corrupt)
+        for key, size in corrupt:
+            self._forget(key, size)
+        self.corrupt_entries += len(corrupt)
+        if corrupt:
+            logger.warning(f"Removed {len(corrupt)} corrupted embedding cache entries")
+        monitor.record_metric(Metric(
+            "embedding_cache_corrupt_entries", self.corrupt_entries, MetricType.COUNTER,
+            labels={"cache": self.cache_dir.name}))
+        self._record_size_metrics()
+        return len(corrupt)
+
+    async def close(self) -> None:
+        """Wait for background maintenance to finish."""
+        tasks = [t for t in (self._sweep_task, self._gc_task) if t is not None]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Entry encoding
+    # ------------------------------------------------------------------
+
+    def _encode(self, text: str, embedding: "List[float] | np.ndarray") -> bytes:
+        """Serialize a cache entry with this cache's storage settings."""
+        return encode_entry(
+            text, embedding, self.dtype, self.compression,
+            self.store_text, self.compression_level
+        )
+
+    @staticmethod
+    def _decode(data: bytes) -> np.ndarray:
+        """Deserialize a cache entry's embedding (binary or JSON format).
+
+        Raises:
+            ValueError, KeyError, TypeError: If the entry is corrupted
+        """
+        return decode_entry(data, with_text=False).embedding
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
     @asynccontextmanager
     async def _get_write_lock(self, cache_path: str):
         """Get a lock for writing to a specific cache file."""
@@ -37,94 +684,149 @@ class EmbeddingsCache:
             yield
         finally:
             self._write_locks[cache_path].release()
-            
-    async def get(self, text: str) -> Optional[List[float]]:
+
+    async def get(self, text: str) -> Optional[np.ndarray]:
         """Get embedding from cache if it exists.
-        
+
         Args:
             text: Text to get embedding for
-            
+
         Returns:
-            Cached embedding or None if not found
+            Cached embedding as a float32 array, or None if not found
         """
-        cache_path = self._get_cache_path(text)
-        if not cache_path.exists():
+        self._start_background_tasks()
+        key = self.text_hash(text)
+        if not self._may_contain(key):
+            return None
+
+        cache_path = self._path_for_key(key)
+        embedding, size = await self._read(cache_path, remove_corrupt=True)
+        if embedding is not None:
+            self._record_access(key, None if key in self._index else size)
+            return embedding
+
+        if size is None:
+            # Entries written before the binary format are rewritten on hit
+            json_path = self._json_path_for_key(key)
+            embedding, size = await self._read(json_path, remove_corrupt=True)
+            if embedding is not None:
+                await self.put(text, embedding)
+                await asyncio.to_thread(self._unlink_all, [json_path])
+                return embedding
+        self._forget(key, size)
+
+        if not self._may_contain_legacy(key):
             return None
-            
+        # Legacy entries are never deleted here; other namespaces may not own them
+        embedding, _ = await self._read(self.legacy_dir / f"{key}{JSON_SUFFIX}",
+                                        remove_corrupt=False)
+        if embedding is not None:
+            await self.put(text, embedding)
+        return embedding
+
+    async def _read(self,
+                    cache_path: Path,
+                    remove_corrupt: bool) -> Tuple[Optional[np.ndarray], Optional[int]]:
+        """Read the embedding stored in a cache file.
+
+        Args:
+            cache_path: Cache file to read
+            remove_corrupt: Whether to delete the file if it cannot be parsed
+
+        Returns:
+            Tuple of (embedding, file size). The embedding is None if the
+            file is missing or unreadable; the size is None if it is missing.
+        """
+        data = None
         try:
-            async with aiofiles.open(cache_path, 'r') as f:
-                data = json.loads(await f.read())
-                return data["embedding"]
-        except (json.JSONDecodeError, KeyError, IOError):
+            async with aiofiles.open(cache_path, 'rb') as f:
+                data = await f.read()
+            return self._decode(data), len(data)
+        except FileNotFoundError:
+            return None, None
+        except (ValueError, KeyError, TypeError, IOError):
             # If cache is corrupted, delete it
-            try:
-                await aiofiles.os.remove(cache_path)
-            except IOError:
-                pass
-            return None
-            
-    async def put(self, text: str, embedding: List[float]):
+            if remove_corrupt:
+                self.corrupt_entries += 1
+                try:
+                    await aiofiles.os.remove(cache_path)
+                except IOError:
+                    pass
+            return None, len(data) if data is not None else None
+
+    async def put(self, text: str, embedding: "List[float] | np.ndarray"):
         """Cache an embedding.
-        
+
+        Starts background garbage collection if the write pushes the cache
+        over its size caps.
+
         Args:
             text: Original text
-            embedding: Generated embedding
+            embedding: Generated embedding (list or array)
         """
-        cache_path = self._get_cache_path(text)
-        cache_data = {
-            "text": text,
-            "embedding": embedding,
-            "timestamp": time.time()
-        }
-        
+        key = self.text_hash(text)
+        cache_path = self._path_for_key(key)
+        payload = self._encode(text, embedding)
+
         async with self._get_write_lock(str(cache_path)):
             try:
-                async with aiofiles.open(cache_path, 'w') as f:
-                    await f.write(json.dumps(cache_data))
+                async with aiofiles.open(cache_path, 'wb') as f:
+                    await f.write(payload)
             except IOError:
                 # Log error but don't fail - caching is optional
-                pass
-                
-    async def get_batch(self, texts: List[str]) -> Dict[str, List[float]]:
+                return
+        self._record_access(key, len(payload))
+        self._start_background_tasks()
+
+    async def get_batch(self, texts: List[str]) -> Dict[str, np.ndarray]:
         """Get multiple embeddings from cache.
-        
+
         Args:
             texts: List of texts to get embeddings for
-            
+
         Returns:
-            Dictionary mapping texts to their cached embeddings
+            Dictionary mapping texts to their cached float32 embeddings
         """
-        tasks = [self.get(text) for text in texts]
+        # Guaranteed misses are filtered in memory before any file is opened
+        candidates = [text for text in texts if self._may_contain(self.text_hash(text))]
+        tasks = [self.get(text) for text in candidates]
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        
+
         cached = {}
-        for text, result in zip(texts, results):
-            if isinstance(result, list):  # Valid embedding
+        for text, result in zip(candidates, results):
+            if isinstance(result, np.ndarray):  # Valid embedding
                 cached[text] = result
         return cached
-        
+
     async def put_batch(self, text_embeddings: Dict[str, List[float]]):
         """Cache multiple embeddings.
-        
+
         Args:
             text_embeddings: Dictionary mapping texts to embeddings
         """
         await asyncio.gather(*[
-            self.put(text, embedding) 
+            self.put(text, embedding)
             for text, embedding in text_embeddings.items()
         ])
-        
+
     def get_uncached_texts(self, texts: List[str]) -> Set[str]:
         """Get texts that are not in the cache.
-        
+
         Args:
             texts: List of texts to check
-            
+
         Returns:
             Set of texts not found in cache
+
+        Note:
+            With exact membership this never touches the filesystem. In
+            Bloom mode only possible hits are confirmed on disk.
         """
         uncached = set()
         for text in texts:
-            if not self._get_cache_path(text).exists():
+            key = self.text_hash(text)
+            if not self._may_contain(key):
+                uncached.add(text)
+            elif self._bloom is not None and not self._exists(text):
                 uncached.add(text)
-        return uncached
\ No newline at end of file
+        return uncached
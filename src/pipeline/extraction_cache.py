@@ -0,0 +1,279 @@
+"""
+Persistent cache of extracted PDF text, keyed by file hash.
+
+Re-chunking with new parameters or retrying a failed embedding step would
+otherwise re-parse the PDF. ExtractionCache stores one gzip-compressed
+JSON Lines file per document: a header line with the document metadata,
+then one line per page. Entries are keyed by the SHA256 file hash
+(DocumentRegistry.compute_file_hash, which is also the registry's
+document ID) and EXTRACTOR_VERSION, so a changed file or extractor never
+reads stale text.
+
+CachedExtractor is a drop-in PDFExtractor that serves documents from the
+cache and otherwise streams them from an inner extractor, writing the
+cache entry as pages go by. Both directions stream, so memory stays
+bounded by one page.
+
+Usage Example:
+    >>> cache = ExtractionCache(Path("data/extraction_cache"))
+    >>> extractor = CachedExtractor(cache, inner=IsolatedExtractor())
+    >>> pipeline = ChunkPipeline(chunker, extractor=extractor)
+    >>> # Re-chunking the same file later reads pages from the cache
+"""
+from collections.abc import Collection
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+import gzip
+import json
+import os
+import tempfile
+
+from src.database.document_registry import DocumentRegistry
+from src.utils.logging import get_logger
+from .pdf_errors import PDFExtractionError
+from .pdf_extractor import EXTRACTOR_VERSION, PDFExtractor, PDFMetadata, PDFPage
+
+logger = get_logger(__name__)
+
+
+def _metadata_to_dict(metadata: PDFMetadata) -> Dict:
+    """Convert PDF metadata to JSON-serializable form."""
+    data = asdict(metadata)
+    for key in ('creation_date', 'modification_date'):
+        if data[key] is not None:
+            data[key] = data[key].isoformat()
+    return data
+
+
+def _metadata_from_dict(data: Dict) -> PDFMetadata:
+    """Rebuild PDF metadata stored by _metadata_to_dict."""
+    data = dict(data)
+    for key in ('creation_date', 'modification_date'):
+        if data[key] is not None:
+            data[key] = datetime.fromisoformat(data[key])
+    return PDFMetadata(**data)
+
+
+class ExtractionCache:
+    """Stores extracted page text as one compressed file per document."""
+
+    def __init__(self, cache_dir: Path, version: str = EXTRACTOR_VERSION):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files
+            version: Extractor version; entries from other versions are ignored
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.version = version
+
+    def _path(self, file_hash: str) -> Path:
+        """Cache file for a document."""
+        return self.cache_dir / f"{file_hash}.jsonl.gz"
+
+    def iter_document(self,
+                      file_hash: str,
+                      page_numbers: Optional[Collection] = None
+                      ) -> Optional[Iterator[Union[PDFMetadata, PDFPage]]]:
+        """
+        Stream a cached document like PDFExtractor.iter_document.
+
+        Args:
+            file_hash: SHA256 hash of the PDF file
+            page_numbers: Only yield these (1-based) pages
+
+        Returns:
+            Iterator of PDFMetadata followed by PDFPage objects, or None if
+            the document is not cached for this extractor version
+        """
+        path = self._path(file_hash)
+        if not path.exists():
+            return None
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                header = json.loads(f.readline())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable extraction cache entry {path.name}: {e}")
+            return None
+        if header.get('version') != self.version or header.get('file_hash') != file_hash:
+            return None
+
+        def stream() -> Iterator[Union[PDFMetadata, PDFPage]]:
+            # Opened only once iteration starts, so an unused stream holds no file
+            try:
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    f.readline()
+                    yield _metadata_from_dict(header['metadata'])
+                    for line in f:
+                        number, text, is_scanned = json.loads(line)
+                        if page_numbers is None or number in page_numbers:
+                            yield PDFPage(number=number, text=text, is_scanned=is_scanned)
+            except (OSError, EOFError, ValueError, KeyError, TypeError) as e:
+                # Drop the damaged entry so the next attempt re-extracts
+                self.delete(file_hash)
+                raise PDFExtractionError(f"Corrupt extraction cache entry {path.name}: {e}") from e
+        return stream()
+
+    def load(self, file_hash: str) -> Optional[Tuple[PDFMetadata, list]]:
+        """
+        Load a whole cached document.
+
+        Args:
+            file_hash: SHA256 hash of the PDF file
+
+        Returns:
+            Tuple of (PDFMetadata, list of PDFPage objects), or None if the
+            document is not cached or its entry is unreadable
+        """
+        document = self.iter_document(file_hash)
+        if document is None:
+            return None
+        try:
+            metadata = next(document)
+            return metadata, list(document)
+        except PDFExtractionError as e:
+            logger.warning(str(e))
+            return None
+
+    def write_through(self,
+                      file_hash: str,
+                      document: Iterator[Union[PDFMetadata, PDFPage]]
+                      ) -> Iterator[Union[PDFMetadata, PDFPage]]:
+        """
+        Pass a document stream through, caching it once it completes.
+
+        The entry is written to a temporary file and only moved into place
+        if the whole stream was consumed, so interrupted extractions never
+        leave partial entries.
+
+        Args:
+            file_hash: SHA256 hash of the PDF file
+            document: Stream from PDFExtractor.iter_document for all pages
+
+        Yields:
+            The items of document, unchanged
+        """
+        path = self._path(file_hash)
+        # A unique name, as other threads or processes may cache the same file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        completed = False
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                for item in document:
+                    if isinstance(item, PDFMetadata):
+                        header = {
+                            'version': self.version,
+                            'file_hash': file_hash,
+                            'metadata': _metadata_to_dict(item),
+                        }
+                        f.write(json.dumps(header) + "\n")
+                    else:
+                        f.write(json.dumps([item.number, item.text, item.is_scanned]) + "\n")
+                    yield item
+            completed = True
+            os.replace(tmp_path, path)
+        finally:
+            if not completed and tmp_path.exists():
+                tmp_path.unlink()
+
+    def delete(self, file_hash: str) -> None:
+        """Remove a document's cache entry if it exists."""
+        path = self._path(file_hash)
+        if path.exists():
+            path.unlink()
+
+
+class CachedExtractor(PDFExtractor):
+    """Serves extracted text from an ExtractionCache, falling back to an inner extractor."""
+
+    def __init__(self, cache: ExtractionCache, inner: Optional[PDFExtractor] = None):
+        """
+        Initialize the cached extractor.
+
+        Args:
+            cache: Cache to read and fill
+            inner: Extractor used on cache misses (defaults to PDFExtractor())
+        """
+        inner = inner or PDFExtractor()
+        super().__init__(
+            progress_callback=inner.progress_callback,
+            timeout=inner.timeout,
+            monitoring=inner.monitoring,
+            page_metrics=inner.page_metrics
+        )
+        self.cache = cache
+        self.inner = inner
+        self.hits = 0
+        self.misses = 0
+        # (path, size, mtime) -> file hash, so unchanged files are hashed once
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+
+    def file_hash(self, pdf_path: Path) -> str:
+        """Return the SHA256 hash of a file, memoized by size and mtime."""
+        stat = pdf_path.stat()
+        key = (str(pdf_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._hashes:
+            self._hashes[key] = DocumentRegistry.compute_file_hash(pdf_path)
+        return self._hashes[key]
+
+    def iter_document(self,
+                      pdf_path: Path,
+                      page_numbers: Optional[Collection] = None
+                      ) -> Iterator[Union[PDFMetadata, PDFPage]]:
+        """
+        Yield a PDF's metadata, then its pages, from the cache if possible.
+
+        On a miss the document is read with the inner extractor; if all
+        pages were requested, the stream is written to the cache.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: Only read these (1-based) pages
+
+        Yields:
+            PDFMetadata, then PDFPage objects
+        """
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        file_hash = self.file_hash(pdf_path)
+        cached = self.cache.iter_document(file_hash, page_numbers)
+        if cached is not None:
+            self.hits += 1
+            logger.debug(f"Extraction cache hit for {pdf_path}")
+            yield from cached
+            return
+
+        self.misses += 1
+        document = self.inner.iter_document(pdf_path, page_numbers)
+        if page_numbers is None:
+            document = self.cache.write_through(file_hash, document)
+        yield from document
+
+    def extract_text(self, pdf_path: Path) -> Tuple[list, PDFMetadata]:
+        """
+        Extract text and metadata, from the cache if possible.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Tuple of (list of PDFPage objects, PDFMetadata object)
+        """
+        document = self.iter_document(pdf_path)
+        try:
+            metadata = next(document)
+            return list(document), metadata
+        finally:
+            document.close()
+
+    def close(self) -> None:
+        """Close the inner extractor if it holds resources (e.g. a worker)."""
+        close = getattr(self.inner, "close", None)
+        if close is not None:
+            close()
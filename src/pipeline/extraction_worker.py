@@ -0,0 +1,240 @@
+"""
+PDF extraction in a killable worker process with hard deadlines.
+
+PyMuPDF can hang or leak memory on pathological PDFs, and a hung
+page.get_text() cannot be interrupted from the same process.
+IsolatedExtractor is a drop-in PDFExtractor that runs extraction in a
+separate worker process and streams the results back over a pipe:
+
+- page_timeout bounds the wait for any single page (or the metadata).
+- document_timeout bounds the total time spent waiting for a document.
+  Time the caller spends between pages (e.g. embedding chunks) is not
+  counted, only time spent blocked on the worker.
+- On a deadline the worker is killed and PDFExtractionTimeout is raised;
+  the next document starts a fresh worker, so one bad file never stalls
+  the rest of a batch.
+- The worker is recycled after max_documents_per_worker documents to cap
+  memory leaked by the PDF library.
+
+Usage Example:
+    >>> extractor = IsolatedExtractor(page_timeout=30, document_timeout=600)
+    >>> pipeline = ChunkPipeline(chunker, extractor=extractor)
+    >>> orchestrator = PipelineOrchestrator(pipeline, vector_store)
+    >>> # A hanging PDF now fails with PDFExtractionTimeout after 30s
+"""
+from collections.abc import Collection
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+import multiprocessing
+import time
+
+from .monitoring import MonitoringSystem
+from .pdf_errors import PDFExtractionError, PDFExtractionTimeout
+from .pdf_extractor import PDFExtractor, PDFMetadata, PDFPage, _ExtractionTiming
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def _serve(conn: Connection) -> None:
+    """
+    Worker loop: extract requested documents and stream them back.
+
+    Each request is (pdf_path, page_numbers); the reply is a sequence of
+    ("item", metadata_or_page, seconds) messages followed by ("done",) or
+    ("error", exception). None stops the worker.
+    """
+    extractor = PDFExtractor()
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        pdf_path, page_numbers = request
+        try:
+            document = extractor.iter_document(pdf_path, page_numbers)
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(document)
+                except StopIteration:
+                    break
+                conn.send(("item", item, time.perf_counter() - start))
+            conn.send(("done",))
+        except Exception as e:
+            if not isinstance(e, (PDFExtractionError, FileNotFoundError)):
+                # Library exceptions may not survive pickling
+                e = PDFExtractionError(f"{type(e).__name__}: {e}")
+            conn.send(("error", e))
+
+
+class IsolatedExtractor(PDFExtractor):
+    """Extracts PDFs in a recycled worker process with enforced deadlines."""
+
+    def __init__(self,
+                 page_timeout: float = 30.0,
+                 document_timeout: float = 600.0,
+                 max_documents_per_worker: int = 50,
+                 progress_callback=None,
+                 monitoring: Optional[MonitoringSystem] = None,
+                 page_metrics: bool = False):
+        """
+        Initialize the isolated extractor.
+
+        Args:
+            page_timeout: Seconds to wait for the metadata or any one page
+            document_timeout: Seconds to wait for a whole document, not
+                counting time spent by the caller between pages
+            max_documents_per_worker: Documents extracted before the worker
+                process is replaced
+            progress_callback: Optional callback function(current, total)
+            monitoring: Optional monitoring system that receives each
+                document's extraction time measured in the worker
+            page_metrics: Also record every page's extraction time
+        """
+        if page_timeout <= 0 or document_timeout <= 0:
+            raise ValueError("page_timeout and document_timeout must be positive")
+        if max_documents_per_worker < 1:
+            raise ValueError("max_documents_per_worker must be at least 1")
+        super().__init__(
+            progress_callback=progress_callback,
+            timeout=document_timeout,
+            monitoring=monitoring,
+            page_metrics=page_metrics
+        )
+        self.page_timeout = page_timeout
+        self.document_timeout = document_timeout
+        self.max_documents_per_worker = max_documents_per_worker
+        self._process: Optional[multiprocessing.Process] = None
+        self._conn: Optional[Connection] = None
+        self._documents = 0
+
+    def _worker(self) -> Connection:
+        """Return the connection to a live worker, starting one if needed."""
+        if self._process is None or not self._process.is_alive():
+            self._stop(kill=True)
+            parent_conn, child_conn = multiprocessing.Pipe()
+            # Daemonic, so a stuck worker never outlives the pipeline
+            self._process = multiprocessing.Process(target=_serve, args=(child_conn,), daemon=True)
+            self._process.start()
+            child_conn.close()
+            self._conn = parent_conn
+            self._documents = 0
+        return self._conn
+
+    def _stop(self, kill: bool = False) -> None:
+        """Stop the worker: ask it to exit, or kill it if it may be stuck."""
+        if self._process is not None:
+            if kill:
+                self._process.kill()
+            else:
+                try:
+                    self._conn.send(None)
+                except OSError:
+                    pass
+            self._process.join(timeout=5)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def close(self) -> None:
+        """Shut down the worker process."""
+        self._stop()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Worker handles are per process; a copy starts its own worker
+        state.update(_process=None, _conn=None, _documents=0)
+        return state
+
+    def iter_document(self,
+                      pdf_path: Path,
+                      page_numbers: Optional[Collection] = None
+                      ) -> Iterator[Union[PDFMetadata, PDFPage]]:
+        """
+        Yield a PDF's metadata, then its pages, extracted in the worker.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: Only read these (1-based) pages
+
+        Yields:
+            PDFMetadata, then PDFPage objects
+
+        Raises:
+            PDFExtractionTimeout: If the metadata or a page takes longer than
+                page_timeout, or the document longer than document_timeout
+            PDFExtractionError: If extraction fails or the worker dies
+            FileNotFoundError: If PDF file doesn't exist
+        """
+        conn = self._worker()
+        conn.send((pdf_path, sorted(page_numbers) if page_numbers is not None else None))
+        self._documents += 1
+        remaining = self.document_timeout
+        finished = False
+        total_pages = 0
+        timing = _ExtractionTiming()
+        try:
+            while True:
+                wait = min(self.page_timeout, remaining)
+                started = time.monotonic()
+                ready = conn.poll(wait)
+                remaining -= time.monotonic() - started
+                if not ready:
+                    limit = "document" if remaining <= 0 else "page"
+                    raise PDFExtractionTimeout(
+                        f"PDF extraction of {pdf_path} exceeded the {limit} deadline "
+                        f"({self.document_timeout if limit == 'document' else self.page_timeout}s)"
+                    )
+                try:
+                    message = conn.recv()
+                except EOFError as e:
+                    raise PDFExtractionError(f"Extraction worker exited while reading {pdf_path}") from e
+                if message[0] == "done":
+                    finished = True
+                    return
+                if message[0] == "error":
+                    finished = True
+                    raise message[1]
+                item, seconds = message[1], message[2]
+                if isinstance(item, PDFMetadata):
+                    total_pages = item.page_count
+                else:
+                    if self.progress_callback:
+                        self.progress_callback(item.number, total_pages)
+                    self._record_page_time(pdf_path, item, seconds, timing)
+                yield item
+        finally:
+            self._record_document_time(pdf_path, timing)
+            if not finished:
+                # Timed out, worker died or the caller stopped early: the
+                # worker may be stuck or mid-document, so replace it
+                logger.warning(f"Killing extraction worker after unfinished document {pdf_path}")
+                self._stop(kill=True)
+            elif self._documents >= self.max_documents_per_worker:
+                logger.debug("Recycling extraction worker")
+                self._stop()
+
+    def extract_text(self, pdf_path: Path) -> Tuple[List[PDFPage], PDFMetadata]:
+        """
+        Extract text and metadata from a PDF file in the worker.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Tuple of (list of PDFPage objects, PDFMetadata object)
+        """
+        document = self.iter_document(pdf_path)
+        try:
+            metadata = next(document)
+            return list(document), metadata
+        finally:
+            document.close()
@@ -0,0 +1,214 @@
+"""
+Incremental re-ingestion of changed PDFs using per-page content hashes.
+
+After a document is ingested, a DocumentManifest records the hash of its
+file, the hash of every extracted page and the ID and page span of every
+chunk stored in the vector store. When the file changes, plan_reingest
+diffs the new page hashes against the manifest and returns only the work
+that is needed: which pages to re-chunk and embed, and which vector IDs are
+stale and must be deleted.
+
+Chunks are kept within fixed segments of segment_pages pages (see
+SemanticChunker.stream_chunks), so a changed page only invalidates the
+chunks of its own segment. Pages are compared by page number: inserting or
+removing a page in the middle of a document marks every later segment as
+changed.
+
+Manifests are stored as one JSON file per document, like RecoveryManager's
+operation state.
+
+Usage Example:
+    >>> store = ManifestStore(Path("data/recovery/manifests"))
+    >>> old = store.load("data/handbook.pdf")
+    >>> plan = plan_reingest(old, page_hashes, segment_pages=1,
+    ...                      chunk_overlap=50, size_unit="chars")
+    >>> print(f"Re-chunking {len(plan.page_numbers)} pages")
+"""
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+import hashlib
+import json
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA256 hex digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_id(source: str, page_start: int, ordinal: int, text: str) -> str:
+    """
+    Build a stable, document-scoped vector ID for a chunk.
+
+    Args:
+        source: Path of the source document
+        page_start: First page of the chunk
+        ordinal: Position of the chunk among chunks starting on that page
+        text: Chunk text
+
+    Returns:
+        Hex digest that only changes when the chunk's content or place does
+    """
+    return hash_text(f"{source}\0{page_start}\0{ordinal}\0{text}")
+
+
+@dataclass
+class ChunkRecord:
+    """A chunk stored in the vector store for a document."""
+    id: str
+    page_start: int
+    page_end: int
+
+
+@dataclass
+class DocumentManifest:
+    """Content hashes and stored chunks of an ingested document."""
+    source: str
+    file_hash: str
+    chunk_size: int
+    chunk_overlap: int
+    size_unit: str
+    segment_pages: int
+    page_hashes: Dict[int, str]
+    chunks: List[ChunkRecord] = field(default_factory=list)
+    # Repeated lines stripped by the chunk filter (None: no filter or not recorded)
+    boilerplate: Optional[List[str]] = None
+
+    def is_current(self, file_hash: str, segment_pages: int,
+                   chunk_overlap: int, size_unit: str) -> bool:
+        """Whether this manifest already describes the file with these settings."""
+        return (
+            self.file_hash == file_hash
+            and self.segment_pages == segment_pages
+            and self.chunk_overlap == chunk_overlap
+            and self.size_unit == size_unit
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert manifest to dictionary for persistence."""
+        data = asdict(self)
+        data['page_hashes'] = {str(page): digest for page, digest in self.page_hashes.items()}
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DocumentManifest':
+        """Create manifest from dictionary."""
+        data = dict(data)
+        data['page_hashes'] = {int(page): digest for page, digest in data['page_hashes'].items()}
+        data['chunks'] = [ChunkRecord(**chunk) for chunk in data['chunks']]
+        return cls(**data)
+
+
+@dataclass
+class ReingestPlan:
+    """Work needed to bring a document's stored chunks up to date."""
+    page_numbers: Set[int]       # Pages to re-chunk, embed and upsert
+    stale_chunk_ids: List[str]   # Vector IDs to delete
+    kept_chunks: List[ChunkRecord]
+    chunk_size: Optional[int]    # Chunk size to reuse; None allows optimization
+    full: bool                   # True if the whole document is re-ingested
+
+    @property
+    def unchanged(self) -> bool:
+        """Whether there is nothing to re-chunk or delete."""
+        return not self.page_numbers and not self.stale_chunk_ids
+
+
+def plan_reingest(old: Optional[DocumentManifest],
+                  page_hashes: Dict[int, str],
+                  segment_pages: int,
+                  chunk_overlap: int,
+                  size_unit: str) -> ReingestPlan:
+    """
+    Diff new page hashes against a stored manifest.
+
+    A segment is dirty if any of its pages was added, changed or removed.
+    Its pages are re-chunked and the chunks that started in it are stale.
+    The whole document is re-ingested if there is no manifest or it was
+    chunked with different settings.
+
+    Args:
+        old: Manifest from the previous ingest, if any
+        page_hashes: Hash of every page in the current file
+        segment_pages: Segment size chunks are kept within
+        chunk_overlap: Chunk overlap the chunker will use
+        size_unit: Size unit the chunker will use
+
+    Returns:
+        ReingestPlan describing the pages to process and vectors to delete
+    """
+    compatible = (
+        old is not None
+        and old.segment_pages == segment_pages
+        and old.chunk_overlap == chunk_overlap
+        and old.size_unit == size_unit
+    )
+    if not compatible:
+        return ReingestPlan(
+            page_numbers=set(page_hashes),
+            stale_chunk_ids=[chunk.id for chunk in old.chunks] if old else [],
+            kept_chunks=[],
+            chunk_size=None,
+            full=True,
+        )
+
+    def segment(page: int) -> int:
+        return (page - 1) // segment_pages
+
+    changed = {page for page, digest in page_hashes.items() if old.page_hashes.get(page) != digest}
+    removed = set(old.page_hashes) - set(page_hashes)
+    dirty = {segment(page) for page in changed | removed}
+
+    stale = [chunk for chunk in old.chunks if segment(chunk.page_start) in dirty]
+    return ReingestPlan(
+        page_numbers={page for page in page_hashes if segment(page) in dirty},
+        stale_chunk_ids=[chunk.id for chunk in stale],
+        kept_chunks=[chunk for chunk in old.chunks if segment(chunk.page_start) not in dirty],
+        chunk_size=old.chunk_size,
+        full=False,
+    )
+
+
+class ManifestStore:
+    """Persists DocumentManifests as one JSON file per document."""
+
+    def __init__(self, manifest_dir: Path):
+        """
+        Initialize the manifest store.
+
+        Args:
+            manifest_dir: Directory for manifest files
+        """
+        self.manifest_dir = manifest_dir
+        self.manifest_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, source: str) -> Path:
+        """Manifest file for a document path."""
+        return self.manifest_dir / f"{hash_text(source)[:32]}.json"
+
+    def load(self, source: str) -> Optional[DocumentManifest]:
+        """Load the manifest for a document, or None if it has none."""
+        path = self._path(source)
+        if not path.exists():
+            return None
+        try:
+            with path.open() as f:
+                return DocumentManifest.from_dict(json.load(f))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable manifest for {source}: {e}")
+            return None
+
+    def save(self, manifest: DocumentManifest) -> None:
+        """Save a document's manifest."""
+        with self._path(manifest.source).open('w') as f:
+            json.dump(manifest.to_dict(), f)
+
+    def delete(self, source: str) -> None:
+        """Remove a document's manifest if it exists."""
+        path = self._path(source)
+        if path.exists():
+            path.unlink()
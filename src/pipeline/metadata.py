@@ -0,0 +1,115 @@
+"""
+Compact chunk metadata with interned, shared layers.
+
+Most chunk metadata is the same for every chunk of a document (source,
+title, author, chunk settings, ...) or of a page span (page, is_scanned).
+ChunkMetadata is a mapping that stores only chunk-specific keys itself and
+reads everything else through references to shared layer dicts, so a
+document's common fields exist once in memory however many chunks it has.
+VectorStore persists the shared layers once per collection file.
+
+Shared layers must be treated as read-only. Writing to a ChunkMetadata
+only changes that chunk.
+
+Usage Example:
+    >>> document = {"source": "a.pdf", "title": "A"}
+    >>> meta = ChunkMetadata({"page": 3}, document)
+    >>> meta["title"], meta["page"]
+    ('A', 3)
+    >>> meta.layers[0] is document
+    True
+"""
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class ChunkMetadata(MutableMapping):
+    """Chunk metadata layered over shared document and page metadata."""
+
+    __slots__ = ("_own", "_layers")
+
+    def __init__(self, own: Optional[Dict[str, Any]] = None, *layers: Mapping):
+        """
+        Initialize the metadata.
+
+        Args:
+            own: Chunk-specific entries (taken over, not copied)
+            *layers: Shared mappings read after own, first match wins
+        """
+        self._own = own or None
+        self._layers = layers
+
+    @property
+    def own(self) -> Dict[str, Any]:
+        """Chunk-specific entries."""
+        return self._own or {}
+
+    @property
+    def layers(self) -> Tuple[Mapping, ...]:
+        """Shared mappings this metadata reads through to."""
+        return self._layers
+
+    def __getitem__(self, key: str) -> Any:
+        if self._own is not None and key in self._own:
+            return self._own[key]
+        for layer in self._layers:
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._own is None:
+            self._own = {}
+        self._own[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        # Shared layers are never modified; detach this chunk from them
+        detached = dict(self)
+        del detached[key]
+        self._own, self._layers = detached or None, ()
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for mapping in (*reversed(self._layers), self.own):
+            for key in mapping:
+                if key not in seen:
+                    seen.add(key)
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return (
+            (self._own is not None and key in self._own)
+            or any(key in layer for layer in self._layers)
+        )
+
+    def __repr__(self) -> str:
+        return f"ChunkMetadata({dict(self)!r})"
+
+    def __reduce__(self):
+        return (ChunkMetadata, (self._own, *self._layers))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten into a plain dictionary."""
+        return dict(self)
+
+
+def with_layer(metadata: Mapping, layer: Dict[str, Any]) -> ChunkMetadata:
+    """
+    Add a shared layer to chunk metadata without copying the existing layers.
+
+    Args:
+        metadata: Chunk metadata (a ChunkMetadata or any mapping)
+        layer: Shared entries to add; they take precedence over the existing
+            layers but not over chunk-specific entries
+
+    Returns:
+        New ChunkMetadata reading through to layer and the original layers
+    """
+    if isinstance(metadata, ChunkMetadata):
+        return ChunkMetadata(dict(metadata.own), layer, *metadata.layers)
+    return ChunkMetadata(dict(metadata), layer)
@@ -8,10 +8,24 @@ monitoring.
 
 Key Features:
     - Batch processing of multiple PDFs
+    - Streaming chunking: chunks are inserted in batch_size batches as
+      they are produced, keeping memory bounded on very large PDFs
     - Automatic retry with exponential backoff
     - State persistence for recovery from failures
     - Comprehensive metrics and monitoring
     - Duplicate detection to avoid reprocessing
+    - Incremental re-ingestion: with incremental=True only pages whose
+      content hash changed are re-chunked, embedded and upserted
+    - Extraction deadlines: with ChunkPipeline(extractor=IsolatedExtractor())
+      a hanging PDF is killed and recorded as a failure
+    - Extraction cache: with an extraction_cache, page text is parsed once
+      per file version and re-read from disk on re-chunking or retries
+    - Non-blocking: extraction, chunking, token counting and file hashing
+      run in an executor, so ingesting inside the API never stalls request
+      handling; a ProcessPoolExecutor chunks whole files in worker processes
+    - Staged ingestion: process_directory runs extract, embed and store as
+      concurrent stages joined by bounded queues, reporting per-stage
+      throughput and queue depth in ProcessingStats.stages
 
 Usage Example:
     >>> from pathlib import Path
@@ -55,18 +69,32 @@ See Also:
     - VectorStore: For vector database operations
     - RecoveryManager: For state persistence details
 """
-from dataclasses import dataclass
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Set
+from typing import AsyncIterator, Callable, Iterator, List, Dict, Any, Optional, Set, Tuple
 import asyncio
 import time
 from datetime import datetime
 
-from src.pipeline.chunker import ChunkPipeline, TextChunk
-from src.database.vector_store import VectorStore
+from src.pipeline.chunker import ChunkPipeline, TextChunk, summarize_lengths
+from src.pipeline.extraction_cache import CachedExtractor, ExtractionCache
+from src.pipeline.incremental import (
+    ChunkRecord, DocumentManifest, ManifestStore, ReingestPlan, chunk_id, hash_text,
+    plan_reingest
+)
+from src.pipeline.metadata import with_layer
+from src.pipeline.pdf_errors import PDFExtractionError, PDFExtractionTimeout
+from src.pipeline.pdf_extractor import PDFExtractor, PDFPage
+from src.database.document_registry import DocumentRegistry
+from src.database.vector_store import Document, VectorStore
 from src.utils.logging import get_logger
 from src.pipeline.recovery import RecoveryManager, with_retry
 from src.pipeline.monitoring import monitor, Metric, MetricType
+from src.pipeline.tokenizer import Tokenizer, count_tokens
 
 logger = get_logger(__name__)
 
@@ -82,6 +110,12 @@ class ProcessingStats:
     processing_time: float
     errors: Dict[str, str]  # file -> error message
     retry_successes: int    # Files that succeeded after retries
+    pages_reprocessed: int = 0  # Pages re-chunked by incremental re-ingest
+    chunks_deleted: int = 0     # Stale vectors removed by incremental re-ingest
+    chunks_skipped: int = 0     # Low-information chunks dropped by the chunk filter
+    boilerplate_lines: int = 0  # Repeated page lines stripped by the chunk filter
+    extraction_timeouts: int = 0  # Files that failed on an extraction deadline
+    stages: Dict[str, Dict[str, float]] = field(default_factory=dict)  # Staged ingest report
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert stats to dictionary for persistence."""
@@ -93,7 +127,13 @@ class ProcessingStats:
             'total_tokens': self.total_tokens,
             'processing_time': self.processing_time,
             'errors': self.errors,
-            'retry_successes': self.retry_successes
+            'retry_successes': self.retry_successes,
+            'pages_reprocessed': self.pages_reprocessed,
+            'chunks_deleted': self.chunks_deleted,
+            'chunks_skipped': self.chunks_skipped,
+            'boilerplate_lines': self.boilerplate_lines,
+            'extraction_timeouts': self.extraction_timeouts,
+            'stages': self.stages
         }
         
     def update_metrics(self) -> None:
@@ -106,6 +146,10 @@ class ProcessingStats:
             Metric("pipeline_total_tokens", self.total_tokens, MetricType.COUNTER),
             Metric("pipeline_processing_time", self.processing_time, MetricType.GAUGE),
             Metric("pipeline_retry_successes", self.retry_successes, MetricType.COUNTER),
+            Metric("pipeline_pages_reprocessed", self.pages_reprocessed, MetricType.COUNTER),
+            Metric("pipeline_chunks_deleted", self.chunks_deleted, MetricType.COUNTER),
+            Metric("pipeline_chunks_skipped", self.chunks_skipped, MetricType.COUNTER),
+            Metric("pipeline_extraction_timeouts", self.extraction_timeouts, MetricType.COUNTER),
             Metric(
                 "pipeline_success_rate",
                 self.successful_files / max(self.total_files, 1),
@@ -113,10 +157,75 @@ class ProcessingStats:
             )
         ]
         
+        for stage, report in self.stages.items():
+            metrics.append(Metric(
+                "pipeline_stage_throughput", report["throughput"], MetricType.GAUGE,
+                labels={"stage": stage}
+            ))
+            metrics.append(Metric(
+                "pipeline_stage_max_queue_depth", report["max_queue_depth"], MetricType.GAUGE,
+                labels={"stage": stage}
+            ))
+        
         for metric in metrics:
             monitor.record_metric(metric)
 
 
+@dataclass
+class StageStats:
+    """Counters for one stage of the staged ingestion pipeline."""
+    workers: int
+    items: int = 0              # Chunks that left the stage
+    busy_time: float = 0.0      # Seconds workers spent working (not waiting)
+    queue_samples: int = 0
+    queue_depth_total: int = 0
+    max_queue_depth: int = 0    # Deepest input queue seen by a producer
+
+    def sample_queue(self, depth: int) -> None:
+        """Record the depth of this stage's input queue."""
+        self.queue_samples += 1
+        self.queue_depth_total += depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def report(self, elapsed: float) -> Dict[str, float]:
+        """Summarize the stage over a run that took elapsed seconds."""
+        return {
+            'workers': self.workers,
+            'items': self.items,
+            'busy_time': self.busy_time,
+            'throughput': self.items / elapsed if elapsed > 0 else 0.0,
+            'utilization': self.busy_time / (elapsed * self.workers) if elapsed > 0 else 0.0,
+            'mean_queue_depth': self.queue_depth_total / max(self.queue_samples, 1),
+            'max_queue_depth': self.max_queue_depth
+        }
+
+
+@dataclass
+class _FileJob:
+    """Bookkeeping for one file while its chunks move through the pipeline."""
+    pdf_path: Path
+    operation_id: str
+    start_time: float
+    labels: Dict[str, str]
+    plan: Optional[ReingestPlan] = None
+    manifest: Optional[DocumentManifest] = None
+    chunk_count: int = 0
+    token_count: int = 0
+    lengths: List[int] = field(default_factory=list)
+    ordinals: Dict[int, int] = field(default_factory=dict)
+    chunk_time: float = 0.0
+    pending_batches: int = 0   # Batches queued for embedding or storing
+    chunked: bool = False      # All batches have been produced
+    chunk_size: Optional[int] = None  # Chunk size the file was chunked with
+    failed: bool = False
+    finished: bool = False
+    # Metadata layer shared by every chunk of the file
+    source_layer: Dict[str, str] = field(init=False)
+
+    def __post_init__(self):
+        self.source_layer = {"source_file": str(self.pdf_path)}
+
+
 class PipelineOrchestrator:
     """Orchestrates the document processing pipeline with resilient error recovery."""
     
@@ -124,19 +233,64 @@ class PipelineOrchestrator:
                  chunk_pipeline: ChunkPipeline,
                  vector_store: VectorStore,
                  batch_size: int = 32,
-                 state_dir: Optional[Path] = None):
+                 state_dir: Optional[Path] = None,
+                 incremental: bool = False,
+                 segment_pages: int = 1,
+                 extraction_cache: Optional[ExtractionCache] = None,
+                 executor: Optional[Executor] = None,
+                 extract_workers: int = 1,
+                 embed_workers: int = 2,
+                 store_workers: int = 1,
+                 queue_size: int = 4):
         """
         Initialize the orchestrator.
         
         Args:
             chunk_pipeline: Pipeline for processing PDFs into chunks
             vector_store: Vector store for saving embeddings
-            batch_size: Number of chunks to process at once
+            batch_size: Number of chunks to embed and insert at once
             state_dir: Directory for storing recovery state
+            incremental: Record per-page content hashes and, when a file
+                changes, only re-ingest the pages that changed
+            segment_pages: In incremental mode, chunks never cross segments
+                of this many pages; a changed page re-ingests its segment
+            extraction_cache: Optional cache of extracted page text; the
+                chunk pipeline's extractor is wrapped so documents are read
+                from the cache first and cached on a miss
+            executor: Executor for extraction and chunking. None uses the
+                event loop's default thread pool; a ThreadPoolExecutor
+                streams chunks in batches, a ProcessPoolExecutor chunks
+                each whole file in a worker process (holding that file's
+                chunks in memory). Other blocking work always runs in a
+                thread.
+            extract_workers: Files extracted and chunked concurrently by
+                process_directory. More than one requires a
+                ProcessPoolExecutor, where each file gets its own copy of
+                the chunker and extractor
+            embed_workers: Chunk batches embedded concurrently
+            store_workers: Chunk batches indexed concurrently
+            queue_size: Chunk batches buffered between stages before the
+                previous stage waits
         """
+        if min(extract_workers, embed_workers, store_workers, queue_size) < 1:
+            raise ValueError("Stage worker counts and queue_size must be at least 1")
+        if extract_workers > 1 and not isinstance(executor, ProcessPoolExecutor):
+            # Threads would share the chunker's per-file chunk_size and the
+            # extractor (an IsolatedExtractor has a single pipe)
+            raise ValueError("extract_workers > 1 requires a ProcessPoolExecutor")
+        if extraction_cache is not None:
+            chunk_pipeline.extractor = CachedExtractor(extraction_cache, chunk_pipeline.extractor)
         self.chunk_pipeline = chunk_pipeline
         self.vector_store = vector_store
         self.batch_size = batch_size
+        self.executor = executor
+        self.extract_workers = extract_workers
+        self.embed_workers = embed_workers
+        self.store_workers = store_workers
+        self.queue_size = queue_size
+        # Incremental planning reads pages with the shared extractor, so
+        # concurrent extract workers plan one file at a time
+        self._plan_lock = asyncio.Lock()
         self.stats = ProcessingStats(0, 0, 0, 0, 0, 0.0, {}, 0)
         
         # Initialize recovery manager
@@ -144,14 +298,67 @@ class PipelineOrchestrator:
             state_dir = Path("data/recovery")
         self.recovery = RecoveryManager(state_dir)
         
+        # Per-document page and chunk hashes for incremental re-ingestion
+        self.segment_pages = segment_pages
+        self.manifests = ManifestStore(state_dir / "manifests") if incremental else None
+        
         # Track processed files to avoid duplicates
         self.processed_files: Set[str] = set()
         
+    def _count_tokens(self, text: str) -> int:
+        """Count tokens in a chunk, reusing the chunker's memoized tokenizer if any."""
+        chunker = getattr(self.chunk_pipeline, "chunker", None)
+        if isinstance(getattr(chunker, "length_function", None), Tokenizer):
+            return chunker.length_function(text)
+        return count_tokens(text)
+
+    async def _run_blocking(self, func: Callable, *args: Any) -> Any:
+        """Run a blocking call off the event loop, in a thread of the executor if it has threads."""
+        executor = None if isinstance(self.executor, ProcessPoolExecutor) else self.executor
+        return await asyncio.get_running_loop().run_in_executor(executor, partial(func, *args))
+
+    def _next_batch(self, stream: Iterator[TextChunk]) -> List[Tuple[TextChunk, int]]:
+        """Pull up to batch_size chunks and count their tokens (runs in a worker thread)."""
+        return [(chunk, self._count_tokens(chunk.text)) for chunk in islice(stream, self.batch_size)]
+
+    @with_retry(max_retries=2, initial_delay=1.0,
+                permanent_errors=(PDFExtractionError, FileNotFoundError, ValueError))
+    async def _chunk_in_process(self, pdf_path: Path, options: Dict[str, Any]) -> List[TextChunk]:
+        """Chunk a whole file in the process executor, retrying crashed workers."""
+        result = await asyncio.get_running_loop().run_in_executor(
+            self.executor, self.chunk_pipeline.file_task(pdf_path, **options)
+        )
+        return self.chunk_pipeline.collect_task(pdf_path, result)
+
+    async def _chunk_batches(self,
+                             pdf_path: Path,
+                             **options: Any) -> AsyncIterator[List[Tuple[TextChunk, int]]]:
+        """
+        Extract and chunk a file off the event loop.
+
+        Yields:
+            Lists of up to batch_size (chunk, token count) pairs
+        """
+        if isinstance(self.executor, ProcessPoolExecutor):
+            stream = iter(await self._chunk_in_process(pdf_path, options))
+        else:
+            stream = self.chunk_pipeline.iter_file(pdf_path, **options)
+        try:
+            while batch := await self._run_blocking(self._next_batch, stream):
+                yield batch
+        finally:
+            # Closing releases the PDF (or kills an isolated worker), so do
+            # it off the loop as well
+            close = getattr(stream, "close", None)
+            if close is not None:
+                await self._run_blocking(close)
+
     @with_retry(max_retries=3, initial_delay=1.0)
     async def _add_to_vector_store(
         self,
         texts: List[str],
-        metadata_list: List[Dict[str, Any]]
+        metadata_list: List[Dict[str, Any]],
+        ids: Optional[List[str]] = None
     ) -> List[str]:
         """
         Add documents to vector store with retry logic.
@@ -159,6 +366,7 @@ class PipelineOrchestrator:
         Args:
             texts: List of text chunks
             metadata_list: List of metadata dictionaries
+            ids: Optional document IDs (existing IDs are replaced)
             
         Returns:
             List of document IDs
@@ -166,143 +374,512 @@ class PipelineOrchestrator:
         return await self.vector_store.add_documents(
             texts=texts,
             metadata_list=metadata_list,
+            ids=ids,
             batch_size=self.batch_size
         )
-        
-    async def process_pdf(self, pdf_path: Path) -> bool:
+
+    def _plan_reingest(self, pdf_path: Path) -> Optional[Tuple[ReingestPlan, DocumentManifest]]:
         """
-        Process a single PDF file with error recovery.
-        
-        Args:
-            pdf_path: Path to PDF file
-            
+        Diff a file against its manifest for incremental re-ingestion.
+
         Returns:
-            bool: True if processing was successful
+            None if the file is unchanged since its last ingest, otherwise
+            the plan and the new manifest (chunks still to be filled in)
         """
+        chunker = self.chunk_pipeline.chunker
+        file_hash = DocumentRegistry.compute_file_hash(pdf_path)
+        old = self.manifests.load(str(pdf_path))
+        if old is not None and old.is_current(
+            file_hash, self.segment_pages, chunker.chunk_overlap, chunker.size_unit
+        ):
+            return None
+
+        extractor = getattr(self.chunk_pipeline, "extractor", None) or PDFExtractor()
+        chunk_filter = getattr(self.chunk_pipeline, "chunk_filter", None)
+        page_hashes: Dict[int, str] = {}
+        sample: List[PDFPage] = []
+        for page in extractor.iter_pages(pdf_path):
+            page_hashes[page.number] = hash_text(page.text)
+            if chunk_filter is not None and len(sample) < chunk_filter.sample_pages:
+                sample.append(page)
+        plan = plan_reingest(
+            old, page_hashes, self.segment_pages, chunker.chunk_overlap, chunker.size_unit
+        )
+        # Changed pages alone are too few to learn boilerplate from: keep
+        # the lines the kept chunks were stripped with, or learn them from
+        # the start of the whole document like a full ingest does
+        boilerplate = None
+        if chunk_filter is not None:
+            if not plan.full and old is not None and old.boilerplate is not None:
+                boilerplate = old.boilerplate
+            else:
+                boilerplate = sorted(chunk_filter.learn_boilerplate(sample))
+        manifest = DocumentManifest(
+            source=str(pdf_path),
+            file_hash=file_hash,
+            chunk_size=chunker.chunk_size,
+            chunk_overlap=chunker.chunk_overlap,
+            size_unit=chunker.size_unit,
+            segment_pages=self.segment_pages,
+            page_hashes=page_hashes,
+            chunks=list(plan.kept_chunks),
+            boilerplate=boilerplate,
+        )
+        return plan, manifest
+        
+    def _start_file(self, pdf_path: Path) -> _FileJob:
+        """Start tracking a file for recovery and monitoring."""
         pdf_str = str(pdf_path)
-        if pdf_str in self.processed_files:
-            logger.info(f"Skipping already processed file: {pdf_path}")
-            return True
-            
-        # Start tracking operation
         recovery_state = self.recovery.start_operation(
             "process_pdf",
             {"pdf_path": pdf_str}
         )
+        return _FileJob(
+            pdf_path=pdf_path,
+            operation_id=recovery_state.operation_id,
+            start_time=time.time(),
+            labels={"file": pdf_str}
+        )
+
+    async def _plan_file(self, job: _FileJob) -> bool:
+        """
+        Plan incremental re-ingestion of a file, if enabled.
+
+        Returns:
+            False if the file is unchanged and was marked complete
+        """
+        if self.manifests is None:
+            return True
+        async with self._plan_lock:
+            reingest = await self._run_blocking(self._plan_reingest, job.pdf_path)
+        if reingest is None:
+            logger.info(f"Skipping unchanged file: {job.pdf_path}")
+            self.processed_files.add(str(job.pdf_path))
+            self.recovery.update_operation(job.operation_id, "completed")
+            return False
+        job.plan, job.manifest = reingest
+        return True
+
+    def _file_batches(self, job: _FileJob) -> AsyncIterator[List[Tuple[TextChunk, int]]]:
+        """Chunk batches for a file, limited to changed pages when re-ingesting."""
+        if job.plan is None:
+            return self._chunk_batches(job.pdf_path)
+        options: Dict[str, Any] = {}
+        if job.manifest.boilerplate is not None:
+            options['boilerplate'] = job.manifest.boilerplate
+        return self._chunk_batches(
+            job.pdf_path,
+            page_numbers=job.plan.page_numbers,
+            segment_pages=self.segment_pages,
+            chunk_size=job.plan.chunk_size,
+            **options
+        )
+
+    def _prepare_batch(
+        self,
+        job: _FileJob,
+        batch: List[Tuple[TextChunk, int]]
+    ) -> Tuple[List[str], List[Dict[str, Any]], Optional[List[str]]]:
+        """
+        Count a batch of chunks and build its vector store input.
+
+        Returns:
+            Tuple of (texts, metadata, ids); ids are only set when
+            re-ingesting incrementally
+        """
+        pdf_str = str(job.pdf_path)
+        source_layer = job.source_layer
+        texts: List[str] = []
+        metadata: List[Dict[str, Any]] = []
+        ids: Optional[List[str]] = [] if job.manifest is not None else None
+        for chunk, tokens in batch:
+            if job.chunk_size is None:
+                # The chunk's own settings, also right when chunked in a worker process
+                job.chunk_size = chunk.metadata.get('chunk_size')
+            job.chunk_count += 1
+            job.lengths.append(len(chunk.text))
+            # Tokens were counted with the chunker's tokenizer when it sizes in tokens
+            job.token_count += tokens
+            texts.append(chunk.text)
+            metadata.append(with_layer(chunk.metadata, source_layer))
+            if job.manifest is not None:
+                page_start, page_end = chunk.page_span
+                ordinal = job.ordinals.get(page_start, 0)
+                job.ordinals[page_start] = ordinal + 1
+                ids.append(chunk_id(pdf_str, page_start, ordinal, chunk.text))
+                job.manifest.chunks.append(ChunkRecord(ids[-1], page_start, page_end))
+        return texts, metadata, ids
+
+    def _record_chunk_size(self, job: _FileJob) -> None:
+        """Remember the chunk size once a file's chunk stream has finished."""
+        if job.chunk_size is None:
+            # No chunks carried it (e.g. all filtered out)
+            chunker = getattr(self.chunk_pipeline, "chunker", None)
+            job.chunk_size = getattr(chunker, "chunk_size", None)
+
+    async def _finish_file(self, job: _FileJob) -> None:
+        """
+        Record a file whose chunks have all been stored.
+
+        Raises:
+            ValueError: If the document produced no chunks at all
+        """
+        pdf_path, pdf_str, labels = job.pdf_path, str(job.pdf_path), job.labels
+        plan, manifest = job.plan, job.manifest
+        monitor.record_metric(Metric(
+            "chunk_extraction_duration_seconds",
+            job.chunk_time,
+            MetricType.HISTOGRAM,
+            labels=labels
+        ))
         
-        # Start monitoring
-        start_time = time.time()
-        labels = {"file": pdf_str}
+        # Chunks dropped by the pipeline's boilerplate filter, if any
+        filter_stats = getattr(self.chunk_pipeline, "filter_stats", {}).get(pdf_str)
+        if filter_stats is not None:
+            self.stats.chunks_skipped += filter_stats.chunks_skipped
+            self.stats.boilerplate_lines += filter_stats.boilerplate_lines
         
-        try:
-            # Get chunks from the document
-            with monitor.track_operation_time("chunk_extraction", labels):
-                chunks = self.chunk_pipeline.process_file(pdf_path)
-            
-            if not chunks:
+        if not job.chunk_count and (plan is None or plan.full):
+            if filter_stats is None or not filter_stats.chunks_skipped:
                 raise ValueError("No chunks extracted from document")
-                
-            # Record chunking metrics
+            logger.warning(f"Every chunk of {pdf_path} was filtered as low-information")
+        
+        if plan is not None:
+            # Delete vectors of changed and removed pages that were not
+            # re-created with the same ID, then record the new hashes
+            new_ids = {record.id for record in manifest.chunks}
+            stale_ids = [i for i in plan.stale_chunk_ids if i not in new_ids]
+            if stale_ids:
+                deleted = await self.vector_store.delete_documents(stale_ids)
+                self.stats.chunks_deleted += deleted
+            self.stats.pages_reprocessed += len(plan.page_numbers)
+            manifest.chunk_size = job.chunk_size
+            self.manifests.save(manifest)
             monitor.record_metric(Metric(
-                "pdf_chunk_count",
-                len(chunks),
+                "pdf_pages_reprocessed",
+                len(plan.page_numbers),
                 MetricType.HISTOGRAM,
                 labels=labels
             ))
-                
-            # Prepare batch data
-            texts = [chunk.text for chunk in chunks]
-            metadata = [
-                {**chunk.metadata, "source_file": pdf_str}
-                for chunk in chunks
-            ]
-            
-            # Add to vector store with retries
-            with monitor.track_operation_time("vector_store_insert", labels):
-                doc_ids = await self._add_to_vector_store(texts, metadata)
             
-            # Update stats
-            self.stats.successful_files += 1
-            self.stats.total_chunks += len(chunks)
-            # Estimate tokens (rough approximation)
-            token_count = sum(len(text.split()) * 1.3 for text in texts)
-            self.stats.total_tokens += token_count
-            
-            # Record token metrics
+        # Record chunking metrics
+        monitor.record_metric(Metric(
+            "pdf_chunk_count",
+            job.chunk_count,
+            MetricType.HISTOGRAM,
+            labels=labels
+        ))
+        length_stats = summarize_lengths(job.lengths)
+        for stat in ("mean", "p50", "p95", "max"):
             monitor.record_metric(Metric(
-                "pdf_token_count",
-                token_count,
-                MetricType.HISTOGRAM,
+                f"pdf_chunk_length_{stat}",
+                length_stats[stat],
+                MetricType.GAUGE,
                 labels=labels
             ))
+        
+        # Update stats
+        self.stats.successful_files += 1
+        self.stats.total_chunks += job.chunk_count
+        self.stats.total_tokens += job.token_count
+        
+        # Record token metrics
+        monitor.record_metric(Metric(
+            "pdf_token_count",
+            job.token_count,
+            MetricType.HISTOGRAM,
+            labels=labels
+        ))
+        
+        # Mark as processed
+        self.processed_files.add(pdf_str)
+        
+        # Update recovery state
+        self.recovery.update_operation(
+            job.operation_id,
+            "completed"
+        )
+        
+        # Record processing time
+        processing_time = time.time() - job.start_time
+        monitor.record_metric(Metric(
+            "pdf_processing_time",
+            processing_time,
+            MetricType.HISTOGRAM,
+            labels=labels
+        ))
+        
+        # Update overall stats metrics
+        self.stats.update_metrics()
+        
+        logger.info(
+            f"Successfully processed {pdf_path} - "
+            f"{job.chunk_count} chunks, {job.token_count} tokens, "
+            f"{processing_time:.2f}s"
+        )
+
+    def _fail_file(self, job: _FileJob, error: Exception) -> None:
+        """Record a file that failed in any stage."""
+        pdf_str, labels = str(job.pdf_path), job.labels
+        job.failed = True
+        error_time = time.time() - job.start_time
+        logger.error(f"Failed to process {job.pdf_path}: {str(error)}")
+        self.stats.failed_files += 1
+        self.stats.errors[pdf_str] = str(error)
+        if isinstance(error, PDFExtractionTimeout):
+            self.stats.extraction_timeouts += 1
+        
+        # Record error metrics
+        monitor.record_metric(Metric(
+            "pdf_processing_errors",
+            1,
+            MetricType.COUNTER,
+            labels={**labels, "error": str(error)}
+        ))
+        
+        monitor.record_metric(Metric(
+            "pdf_error_processing_time",
+            error_time,
+            MetricType.HISTOGRAM,
+            labels=labels
+        ))
+        
+        # Update recovery state
+        self.recovery.update_operation(
+            job.operation_id,
+            "failed",
+            str(error)
+        )
+        
+        # Update overall stats metrics
+        self.stats.update_metrics()
+        
+    async def process_pdf(self, pdf_path: Path) -> bool:
+        """
+        Process a single PDF file with error recovery.
+        
+        Args:
+            pdf_path: Path to PDF file
             
-            # Mark as processed
-            self.processed_files.add(pdf_str)
-            
-            # Update recovery state
-            self.recovery.update_operation(
-                recovery_state.operation_id,
-                "completed"
-            )
+        Returns:
+            bool: True if processing was successful
+        """
+        if str(pdf_path) in self.processed_files:
+            logger.info(f"Skipping already processed file: {pdf_path}")
+            return True
             
-            # Record processing time
-            processing_time = time.time() - start_time
-            monitor.record_metric(Metric(
-                "pdf_processing_time",
-                processing_time,
-                MetricType.HISTOGRAM,
-                labels=labels
-            ))
+        job = self._start_file(pdf_path)
+        try:
+            # In incremental mode, only re-chunk pages whose content changed
+            if not await self._plan_file(job):
+                return True
             
-            # Update overall stats metrics
-            self.stats.update_metrics()
+            # Stream chunk batches from the document and insert each as it
+            # arrives, so large PDFs are never fully held in memory
+            chunk_start = time.time()
+            async with aclosing(self._file_batches(job)) as batches:
+                async for batch in batches:
+                    job.chunk_time += time.time() - chunk_start
+                    texts, metadata, ids = self._prepare_batch(job, batch)
+                    # Add to vector store with retries
+                    with monitor.track_operation_time("vector_store_insert", job.labels):
+                        await self._add_to_vector_store(texts, metadata, ids)
+                    chunk_start = time.time()
+                job.chunk_time += time.time() - chunk_start
+            self._record_chunk_size(job)
             
-            logger.info(
-                f"Successfully processed {pdf_path} - "
-                f"{len(chunks)} chunks, {int(token_count)} tokens, "
-                f"{processing_time:.2f}s"
-            )
+            await self._finish_file(job)
             return True
             
         except Exception as e:
-            error_time = time.time() - start_time
-            logger.error(f"Failed to process {pdf_path}: {str(e)}")
-            self.stats.failed_files += 1
-            self.stats.errors[pdf_str] = str(e)
-            
-            # Record error metrics
-            monitor.record_metric(Metric(
-                "pdf_processing_errors",
-                1,
-                MetricType.COUNTER,
-                labels={**labels, "error": str(e)}
-            ))
-            
-            monitor.record_metric(Metric(
-                "pdf_error_processing_time",
-                error_time,
-                MetricType.HISTOGRAM,
-                labels=labels
-            ))
-            
-            # Update recovery state
-            self.recovery.update_operation(
-                recovery_state.operation_id,
-                "failed",
-                str(e)
-            )
-            
-            # Update overall stats metrics
-            self.stats.update_metrics()
-            
+            self._fail_file(job, e)
             return False
-            
+
+    @with_retry(max_retries=3, initial_delay=1.0)
+    async def _embed_batch(
+        self,
+        texts: List[str],
+        metadata_list: List[Dict[str, Any]],
+        ids: Optional[List[str]] = None
+    ) -> List[Document]:
+        """Embed a batch of chunks with retry logic."""
+        return await self.vector_store.embed_documents(
+            texts=texts,
+            metadata_list=metadata_list,
+            ids=ids
+        )
+
+    @with_retry(max_retries=3, initial_delay=1.0)
+    async def _store_batch(self, documents: List[Document]) -> List[str]:
+        """Index a batch of embedded chunks with retry logic."""
+        return await self.vector_store.add_embedded_documents(documents)
+
+    async def _process_staged(self, pdf_files: List[Path]) -> None:
+        """
+        Ingest files through concurrent extract, embed and store stages.
+
+        Extract workers stream each file's chunks (extraction feeds straight
+        into chunking) in batch_size batches; embed workers embed them and
+        store workers index them. Stages are connected by bounded queues,
+        so a slow stage makes the ones before it wait instead of buffering
+        without limit, and a run approaches the throughput of its slowest
+        stage. A file is recorded once its last batch is stored; a failure
+        in any stage fails the file and drops its remaining batches.
+
+        The per-stage report is stored in self.stats.stages.
+
+        Args:
+            pdf_files: Files to ingest
+        """
+        stages = {
+            "extract": StageStats(self.extract_workers),
+            "embed": StageStats(self.embed_workers),
+            "store": StageStats(self.store_workers),
+        }
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        store_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        files = iter(pdf_files)
+        completed = 0
+
+        def report_progress(pdf_path: Path) -> None:
+            nonlocal completed
+            completed += 1
+            monitor.update_progress(
+                operation="process_directory",
+                completed=completed,
+                total=len(pdf_files),
+                current_item=str(pdf_path),
+                error_count=self.stats.failed_files
+            )
+
+        def fail(job: _FileJob, error: Exception) -> None:
+            if not job.failed and not job.finished:
+                self._fail_file(job, error)
+                report_progress(job.pdf_path)
+
+        async def settle(job: _FileJob) -> None:
+            # One of the file's batches was stored or dropped
+            job.pending_batches -= 1
+            if job.chunked and not job.pending_batches and not job.failed and not job.finished:
+                job.finished = True
+                try:
+                    await self._finish_file(job)
+                except Exception as e:
+                    self._fail_file(job, e)
+                report_progress(job.pdf_path)
+
+        async def extract() -> None:
+            stage = stages["extract"]
+            for pdf_path in files:
+                if str(pdf_path) in self.processed_files:
+                    logger.info(f"Skipping already processed file: {pdf_path}")
+                    report_progress(pdf_path)
+                    continue
+                job = self._start_file(pdf_path)
+                try:
+                    # In incremental mode, only re-chunk pages whose content changed
+                    if not await self._plan_file(job):
+                        report_progress(pdf_path)
+                        continue
+                    # Held until the file is fully chunked, so it cannot
+                    # finish while batches are still being produced
+                    job.pending_batches += 1
+                    chunk_start = time.time()
+                    async with aclosing(self._file_batches(job)) as batches:
+                        async for batch in batches:
+                            chunk_time = time.time() - chunk_start
+                            job.chunk_time += chunk_time
+                            stage.busy_time += chunk_time
+                            if job.failed:
+                                break
+                            texts, metadata, ids = self._prepare_batch(job, batch)
+                            stage.items += len(texts)
+                            job.pending_batches += 1
+                            stages["embed"].sample_queue(embed_queue.qsize())
+                            await embed_queue.put((job, texts, metadata, ids))
+                            chunk_start = time.time()
+                        job.chunk_time += time.time() - chunk_start
+                    # Before the next file resets the shared chunker's size
+                    self._record_chunk_size(job)
+                    job.chunked = True
+                except Exception as e:
+                    fail(job, e)
+                await settle(job)
+
+        async def embed() -> None:
+            stage = stages["embed"]
+            while True:
+                job, texts, metadata, ids = await embed_queue.get()
+                try:
+                    if job.failed:
+                        await settle(job)
+                        continue
+                    started = time.time()
+                    try:
+                        documents = await self._embed_batch(texts, metadata, ids)
+                    except Exception as e:
+                        fail(job, e)
+                        await settle(job)
+                        continue
+                    finally:
+                        stage.busy_time += time.time() - started
+                    stage.items += len(documents)
+                    stages["store"].sample_queue(store_queue.qsize())
+                    await store_queue.put((job, documents))
+                finally:
+                    embed_queue.task_done()
+
+        async def store() -> None:
+            stage = stages["store"]
+            while True:
+                job, documents = await store_queue.get()
+                try:
+                    if not job.failed:
+                        started = time.time()
+                        try:
+                            with monitor.track_operation_time("vector_store_insert", job.labels):
+                                await self._store_batch(documents)
+                            stage.items += len(documents)
+                        except Exception as e:
+                            fail(job, e)
+                        finally:
+                            stage.busy_time += time.time() - started
+                    await settle(job)
+                finally:
+                    store_queue.task_done()
+
+        consumers = [asyncio.create_task(embed()) for _ in range(self.embed_workers)]
+        consumers += [asyncio.create_task(store()) for _ in range(self.store_workers)]
+        start_time = time.time()
+        try:
+            await asyncio.gather(*(extract() for _ in range(self.extract_workers)))
+            await embed_queue.join()
+            await store_queue.join()
+        finally:
+            for task in consumers:
+                task.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+
+        elapsed = time.time() - start_time
+        self.stats.stages = {name: stage.report(elapsed) for name, stage in stages.items()}
+        for name, report in self.stats.stages.items():
+            logger.info(
+                f"Stage {name}: {report['items']} chunks, "
+                f"{report['throughput']:.1f} chunks/s, "
+                f"{report['utilization']:.0%} busy with {report['workers']} workers, "
+                f"queue depth mean {report['mean_queue_depth']:.1f} max {report['max_queue_depth']}"
+            )
+
     async def process_directory(self, 
                               dir_path: Path,
                               recursive: bool = True) -> ProcessingStats:
         """
         Process all PDFs in a directory with automatic recovery.
         
+        Incomplete operations from previous runs are retried first, one
+        file at a time; new files then go through the staged pipeline (see
+        _process_staged).
+        
         Args:
             dir_path: Directory containing PDFs
             recursive: Whether to process subdirectories
@@ -362,16 +939,8 @@ class PipelineOrchestrator:
             labels=labels
         ))
         
-        # Process files with progress tracking
-        for i, pdf_path in enumerate(pdf_files, 1):
-            success = await self.process_pdf(pdf_path)
-            monitor.update_progress(
-                operation="process_directory",
-                completed=i,
-                total=len(pdf_files),
-                current_item=str(pdf_path),
-                error_count=self.stats.failed_files
-            )
+        # Process files through the staged pipeline with progress tracking
+        await self._process_staged(pdf_files)
             
         processing_time = time.time() - start_time
         self.stats.processing_time = processing_time
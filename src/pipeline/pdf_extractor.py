@@ -4,12 +4,24 @@ Handles extraction of text and metadata from PDF files using PyMuPDF.
 
 All PDFs should be located within the data directory of the project.
 Use src.utils.paths.get_data_dir() to get the correct path.
+
+iter_document opens a file once and yields its metadata followed by its
+pages, lazily; iter_pages yields just the pages.
+
+Large documents can be extracted in parallel: with max_workers > 1, pages
+are split into batches of min_pages_per_worker pages that worker
+processes extract from their own handle on the file. Results are
+reassembled in page order, and iter_pages keeps at most one batch per
+worker in flight so memory stays bounded.
 """
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Callable
+from typing import Collection, Deque, Dict, Iterator, List, Optional, Tuple, Callable, Union
 import fitz  # PyMuPDF
 from dataclasses import dataclass
 from datetime import datetime
+import os
 import time
 
 from src.utils.paths import get_data_dir, list_pdf_files
@@ -18,10 +30,15 @@ from .pdf_errors import (
     PDFExtractionError, PDFCorruptedError, PDFEncryptedError,
     PDFInvalidFormatError, PDFExtractionTimeout
 )
+from .monitoring import MonitoringSystem, Metric, MetricType
 from .recovery import with_retry_sync
 
 logger = get_logger(__name__)
 
+# Identifies the extracted text format; bump when page text extraction
+# changes so cached extractions (see extraction_cache) are not reused
+EXTRACTOR_VERSION = f"1-pymupdf-{fitz.VersionBind}"
+
 
 @dataclass
 class PDFMetadata:
@@ -44,13 +61,25 @@ class PDFPage:
     text: str
     is_scanned: bool
 
+
+@dataclass
+class _ExtractionTiming:
+    """Pages read and time spent extracting them, for one document."""
+    pages: int = 0
+    seconds: float = 0.0
+
+
 class PDFExtractor:
     """Handles extraction of text and metadata from PDF files."""
     
     def __init__(self, 
                 progress_callback: Optional[Callable[[int, int], None]] = None,
                 max_retries: int = 3,
-                timeout: float = 30.0):
+                timeout: float = 30.0,
+                max_workers: Optional[int] = 1,
+                min_pages_per_worker: int = 50,
+                monitoring: Optional[MonitoringSystem] = None,
+                page_metrics: bool = False):
         """
         Initialize the PDF extractor.
         
@@ -58,10 +87,26 @@ class PDFExtractor:
             progress_callback: Optional callback function(current, total) for progress tracking
             max_retries: Maximum number of retries for failed extractions
             timeout: Timeout in seconds for PDF operations
+            max_workers: Worker processes used to extract a large document;
+                1 extracts in the calling thread, None uses every CPU
+            min_pages_per_worker: Pages extracted per worker task; documents
+                with fewer than twice this many pages are extracted serially
+            monitoring: Optional monitoring system that receives each
+                document's extraction time from iter_document and iter_pages
+            page_metrics: Also record every page's extraction time (one
+                metric write per page, so off by default)
         """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if min_pages_per_worker < 1:
+            raise ValueError("min_pages_per_worker must be at least 1")
         self.progress_callback = progress_callback
         self.max_retries = max_retries
         self.timeout = timeout
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_pages_per_worker = min_pages_per_worker
+        self.monitoring = monitoring
+        self.page_metrics = page_metrics
 
     def extract_metadata(self, pdf_doc: fitz.Document | Path) -> PDFMetadata:
         """
@@ -95,7 +140,7 @@ class PDFExtractor:
                 if not pdf_doc.is_pdf:
                     raise PDFInvalidFormatError(f"Not a valid PDF: {pdf_doc}")
             except fitz.FileDataError as e:
-                raise PDFCorruptedError(f"PDF file is corrupted: {e}")
+                raise PDFCorruptedError(f"PDF file is corrupted: {e}") from e
 
         metadata = pdf_doc.metadata
 
@@ -175,32 +220,207 @@ class PDFExtractor:
             logger.info(f"Starting extraction of {pdf_path} ({metadata.page_count} pages)")
             
         except fitz.FileDataError as e:
-            raise PDFCorruptedError(f"PDF file is corrupted: {e}")
+            raise PDFCorruptedError(f"PDF file is corrupted: {e}") from e
         except Exception as e:
-            raise PDFExtractionError(f"Failed to open PDF file: {e}")
+            raise PDFExtractionError(f"Failed to open PDF file: {e}") from e
             
         # Track overall extraction time
         if time.time() - start_time > self.timeout:
             raise PDFExtractionTimeout(f"PDF extraction timed out after {self.timeout}s")
 
-        for page_num in range(pdf_doc.page_count):
-            if self.progress_callback:
-                self.progress_callback(page_num + 1, pdf_doc.page_count)
+        timing = _ExtractionTiming()
+        try:
+            page_nums = list(range(pdf_doc.page_count))
+            if self._worker_count(len(page_nums)) > 1:
+                pages = list(self._iter_parallel(pdf_path, page_nums, pdf_doc.page_count, timing))
+            else:
+                for page_num in page_nums:
+                    if self.progress_callback:
+                        self.progress_callback(page_num + 1, pdf_doc.page_count)
+
+                    start = time.perf_counter()
+                    page = self._read_page(pdf_doc, page_num)
+                    self._record_page_time(pdf_path, page, time.perf_counter() - start, timing)
+                    pages.append(page)
+        finally:
+            pdf_doc.close()
+            self._record_document_time(pdf_path, timing)
+        return pages, metadata
 
-            page = pdf_doc[page_num]
-            text = page.get_text()
-            
-            # Heuristic for detecting scanned pages
-            is_scanned = len(text.strip()) == 0 and bool(page.get_images())
-            
-            pages.append(PDFPage(
-                number=page_num + 1,
-                text=text,
-                is_scanned=is_scanned
-            ))
+    def iter_document(self,
+                      pdf_path: Path,
+                      page_numbers: Optional[Collection[int]] = None
+                      ) -> Iterator[Union[PDFMetadata, PDFPage]]:
+        """
+        Open a PDF once and lazily yield its metadata, then its pages.
 
-        pdf_doc.close()
-        return pages, metadata
+        The first item is the document's PDFMetadata; PDFPage objects follow
+        in page order, one at a time, so only the current page's text is
+        held in memory. The document is closed when the generator is
+        exhausted or closed (e.g. with contextlib.closing). If the extractor
+        has a monitoring system, the time spent extracting the pages read is
+        recorded once the generator finishes (per page with page_metrics).
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: Only read these (1-based) pages; others are
+                skipped without extracting their text
+
+        Yields:
+            PDFMetadata, then PDFPage objects
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            PDFCorruptedError: If the PDF file is corrupted
+            PDFEncryptedError: If the PDF file is encrypted
+            PDFInvalidFormatError: If file is not a valid PDF
+        """
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        try:
+            pdf_doc = fitz.open(pdf_path)
+        except fitz.FileDataError as e:
+            raise PDFCorruptedError(f"PDF file is corrupted: {e}") from e
+
+        timing = _ExtractionTiming()
+        try:
+            if pdf_doc.needs_pass:
+                raise PDFEncryptedError(f"PDF is encrypted: {pdf_path}")
+            if not pdf_doc.is_pdf:
+                raise PDFInvalidFormatError(f"Not a valid PDF: {pdf_path}")
+
+            yield self.extract_metadata(pdf_doc)
+
+            page_nums = [
+                page_num for page_num in range(pdf_doc.page_count)
+                if page_numbers is None or page_num + 1 in page_numbers
+            ]
+            if self._worker_count(len(page_nums)) > 1:
+                yield from self._iter_parallel(pdf_path, page_nums, pdf_doc.page_count, timing)
+                return
+            for page_num in page_nums:
+                if self.progress_callback:
+                    self.progress_callback(page_num + 1, pdf_doc.page_count)
+                start = time.perf_counter()
+                page = self._read_page(pdf_doc, page_num)
+                self._record_page_time(pdf_path, page, time.perf_counter() - start, timing)
+                yield page
+        finally:
+            pdf_doc.close()
+            self._record_document_time(pdf_path, timing)
+
+    def iter_pages(self,
+                   pdf_path: Path,
+                   page_numbers: Optional[Collection[int]] = None) -> Iterator[PDFPage]:
+        """
+        Lazily yield pages from a PDF file, one at a time.
+
+        Like iter_document without the leading metadata.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_numbers: Only read these (1-based) pages; others are
+                skipped without extracting their text
+
+        Yields:
+            PDFPage objects in page order
+        """
+        document = self.iter_document(pdf_path, page_numbers)
+        try:
+            next(document)
+            yield from document
+        finally:
+            document.close()
+
+    def _record_page_time(self,
+                          pdf_path: Path,
+                          page: PDFPage,
+                          seconds: float,
+                          timing: _ExtractionTiming) -> None:
+        """Add one page's extraction time to its document's total."""
+        timing.pages += 1
+        timing.seconds += seconds
+        if self.monitoring is None or not self.page_metrics:
+            return
+        self.monitoring.record_metric(Metric(
+            "pdf_page_extraction_duration_seconds",
+            seconds,
+            MetricType.HISTOGRAM,
+            labels={"file": str(pdf_path), "page": str(page.number)}
+        ))
+
+    def _record_document_time(self, pdf_path: Path, timing: _ExtractionTiming) -> None:
+        """Report a document's total page extraction time to the monitoring system."""
+        if self.monitoring is None or not timing.pages:
+            return
+        self.monitoring.record_metric(Metric(
+            "pdf_extraction_duration_seconds",
+            timing.seconds,
+            MetricType.HISTOGRAM,
+            labels={"file": str(pdf_path), "pages": str(timing.pages)}
+        ))
+
+    def _worker_count(self, page_count: int) -> int:
+        """Worker processes to extract page_count pages with (1 means serial)."""
+        return max(1, min(self.max_workers, page_count // self.min_pages_per_worker))
+
+    def _iter_parallel(self,
+                       pdf_path: Path,
+                       page_nums: List[int],
+                       total_pages: int,
+                       timing: _ExtractionTiming) -> Iterator[PDFPage]:
+        """
+        Extract pages in worker processes and yield them in page order.
+
+        Pages are split into batches of min_pages_per_worker; one batch per
+        worker is in flight at a time.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_nums: 0-based page numbers to extract, in order
+            total_pages: Page count of the document, for progress reporting
+            timing: Accumulates the pages' extraction times
+        """
+        workers = self._worker_count(len(page_nums))
+        size = self.min_pages_per_worker
+        batches = [page_nums[i:i + size] for i in range(0, len(page_nums), size)]
+        logger.info(
+            f"Extracting {len(page_nums)} pages of {pdf_path} "
+            f"in {len(batches)} batches on {workers} worker processes"
+        )
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            pending: Deque = deque(
+                executor.submit(_extract_pages, pdf_path, batch) for batch in batches[:workers]
+            )
+            next_batch = workers
+            while pending:
+                timed_pages = pending.popleft().result()
+                if next_batch < len(batches):
+                    pending.append(executor.submit(_extract_pages, pdf_path, batches[next_batch]))
+                    next_batch += 1
+                for page, seconds in timed_pages:
+                    if self.progress_callback:
+                        self.progress_callback(page.number, total_pages)
+                    self._record_page_time(pdf_path, page, seconds, timing)
+                    yield page
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _read_page(self, pdf_doc: fitz.Document, page_num: int) -> PDFPage:
+        """Extract the text of one page (0-based page_num)."""
+        page = pdf_doc[page_num]
+        text = page.get_text()
+
+        # Heuristic for detecting scanned pages
+        is_scanned = len(text.strip()) == 0 and bool(page.get_images())
+
+        return PDFPage(
+            number=page_num + 1,
+            text=text,
+            is_scanned=is_scanned
+        )
 
     def process_directory(self, 
                          subdir: Optional[str] = None, 
@@ -268,6 +488,18 @@ class PDFExtractor:
             return None
 
 
+def _extract_pages(pdf_path: Path, page_nums: List[int]) -> List[Tuple[PDFPage, float]]:
+    """Extract a batch of pages (0-based numbers) with their timings in a worker process."""
+    extractor = PDFExtractor()
+    timed_pages = []
+    with fitz.open(pdf_path) as pdf_doc:
+        for page_num in page_nums:
+            start = time.perf_counter()
+            page = extractor._read_page(pdf_doc, page_num)
+            timed_pages.append((page, time.perf_counter() - start))
+    return timed_pages
+
+
 def get_text_statistics(pages: List[PDFPage]) -> Dict[str, int]:
     """
     Calculate basic statistics about the extracted text.
@@ -54,7 +54,7 @@ Retry Strategy:
 
 State Persistence:
     Operation state is persisted to JSON files in the recovery directory:
-    - Each operation gets a unique ID based on timestamp
+    - Each operation gets a unique ID based on timestamp and a sequence number
     - State includes operation type, input data, status, and error info
     - Files are cleaned up after successful completion
     - Pending operations can be resumed after crashes
@@ -70,8 +70,9 @@ See Also:
     - with_retry: For decorating async functions with retry logic
 """
 from dataclasses import dataclass
-from typing import TypeVar, Callable, Any, Optional, Dict
+from typing import TypeVar, Callable, Any, Optional, Dict, Tuple, Type
 import asyncio
+import itertools
 import json
 from pathlib import Path
 import time
@@ -79,6 +80,7 @@ from functools import wraps
 from datetime import datetime
 
 from src.utils.logging import get_logger
+from src.pipeline.circuit_breaker import CircuitOpenError, RetryBudget, retry_budget
 
 logger = get_logger(__name__)
 
@@ -117,16 +119,26 @@ def with_retry(
     max_retries: int = 3,
     initial_delay: float = 1.0,
     max_delay: float = 60.0,
-    exponential_base: float = 2.0
+    exponential_base: float = 2.0,
+    budget: Optional[RetryBudget] = retry_budget,
+    permanent_errors: Tuple[Type[BaseException], ...] = ()
 ) -> Callable:
     """
     Decorator for retrying async operations with exponential backoff.
 
+    Failures caused by an open circuit (CircuitOpenError) or listed in
+    permanent_errors are not retried, and each retry takes a token from the
+    shared retry budget so nested retry layers cannot multiply. Delays use
+    asyncio.sleep, so waiting never blocks the event loop.
+
     Args:
         max_retries: Maximum number of retry attempts
         initial_delay: Initial delay between retries in seconds
         max_delay: Maximum delay between retries in seconds
         exponential_base: Base for exponential backoff calculation
+        budget: Retry budget to draw from (None disables the budget)
+        permanent_errors: Exception types that fail immediately (e.g.
+            invalid input that no retry can fix)
 
     Returns:
         Decorated function with retry logic
@@ -140,11 +152,17 @@ def with_retry(
             for retry in range(max_retries + 1):
                 try:
                     return await func(*args, **kwargs)
+                except (CircuitOpenError, *permanent_errors):
+                    # The service is known to be down or the input is bad; fail fast
+                    raise
                 except Exception as e:
                     last_error = e
                     if retry == max_retries:
                         logger.error(f"Max retries ({max_retries}) reached for {func.__name__}")
                         raise
+                    if budget is not None and not budget.try_acquire():
+                        logger.error(f"Retry budget exhausted for {func.__name__}")
+                        raise
 
                     logger.warning(
                         f"Attempt {retry + 1}/{max_retries} failed for {func.__name__}: {str(e)}"
@@ -171,6 +189,8 @@ def with_retry_sync(
 
     This is the synchronous version of with_retry() decorator, suitable for
     non-async functions that need retry logic with exponential backoff.
+    Delays use time.sleep, so only call such functions from an event loop
+    through an executor (loop.run_in_executor or asyncio.to_thread).
 
     Args:
         max_retries: Maximum number of retry attempts
@@ -229,6 +249,7 @@ class RecoveryManager:
         self.state_dir = state_dir
         self.state_dir.mkdir(parents=True, exist_ok=True)
         self.active_operations: Dict[str, RecoveryState] = {}
+        self._sequence = itertools.count()
         
     def start_operation(
         self,
@@ -246,7 +267,9 @@ class RecoveryManager:
             New recovery state object
         """
         state = RecoveryState(
-            operation_id=f"{operation_type}_{int(time.time())}",
+            # The sequence number keeps IDs unique when operations start
+            # concurrently within the same second
+            operation_id=f"{operation_type}_{int(time.time())}_{next(self._sequence)}",
             start_time=time.time(),
             operation_type=operation_type,
             input_data=input_data,
@@ -0,0 +1,184 @@
+"""
+Fast token counting for chunk sizing and token statistics.
+
+Chunk budgets downstream are in tokens (the embedding model's context and
+the LLM context_size in fastagent.config.yaml), so chunks can be sized in
+tokens instead of characters. Two tokenizers are available:
+
+    - TiktokenTokenizer: exact BPE counts (cl100k_base) when the optional
+      tiktoken package is installed
+    - HeuristicTokenizer: a dependency-free estimate calibrated to slightly
+      over-count English BPE tokens, so chunks sized with it do not overflow
+
+Counts are memoized per text, so paragraphs measured repeatedly while
+chunks are packed are only tokenized once.
+
+Usage Example:
+    >>> from src.pipeline.tokenizer import get_tokenizer
+    >>> tokenizer = get_tokenizer()  # tiktoken if installed, else heuristic
+    >>> n_tokens = tokenizer("Frodo left the Shire.")
+"""
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict
+import re
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Tokenizer names accepted by get_tokenizer()
+TOKENIZERS = ("auto", "tiktoken", "heuristic")
+
+
+class Tokenizer(ABC):
+    """Counts tokens in text, memoizing results per text.
+
+    Tokenizers pickle without their memo (e.g. to reach worker processes).
+    """
+
+    name: str = ""
+
+    # Attributes rebuilt by _setup() instead of being pickled
+    _transient = ("_cached_count",)
+
+    def __init__(self, cache_size: int = 65536):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            cache_size: Number of distinct texts whose counts are memoized
+        """
+        self.cache_size = cache_size
+        self._setup()
+
+    def _setup(self) -> None:
+        """Build the memoized counter."""
+        self._cached_count = lru_cache(maxsize=self.cache_size)(self.count)
+
+    def __getstate__(self) -> dict:
+        return {k: v for k, v in self.__dict__.items() if k not in self._transient}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._setup()
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Count the tokens in a text (uncached)."""
+
+    def __call__(self, text: str) -> int:
+        """Count the tokens in a text, using the memoized result if any."""
+        return self._cached_count(text)
+
+
+class HeuristicTokenizer(Tokenizer):
+    """Dependency-free token estimate.
+
+    Text is pre-tokenized into words, numbers and punctuation the way BPE
+    tokenizers do. Each word counts one token per chars_per_token characters
+    (rounded up), each digit group of three one token, and each punctuation
+    mark one token. For English prose this over-counts cl100k_base by a few
+    percent, which keeps token-sized chunks within budget.
+    """
+
+    name = "heuristic"
+
+    _PIECES = re.compile(r"[^\W\d_]+|\d+|[^\w\s]|_")
+
+    def __init__(self, chars_per_token: int = 5, cache_size: int = 65536):
+        """
+        Initialize the heuristic tokenizer.
+
+        Args:
+            chars_per_token: Characters of a word covered by one token
+            cache_size: Number of distinct texts whose counts are memoized
+        """
+        super().__init__(cache_size)
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        tokens = 0
+        for piece in self._PIECES.findall(text):
+            if piece[0].isdigit():
+                tokens += -(-len(piece) // 3)
+            else:
+                tokens += -(-len(piece) // self.chars_per_token)
+        return tokens
+
+
+class TiktokenTokenizer(Tokenizer):
+    """Exact BPE token counts using tiktoken."""
+
+    name = "tiktoken"
+
+    _transient = ("_cached_count", "_encoding")
+
+    def __init__(self, encoding: str = "cl100k_base", cache_size: int = 65536):
+        """
+        Initialize the tiktoken tokenizer.
+
+        Args:
+            encoding: tiktoken encoding name
+            cache_size: Number of distinct texts whose counts are memoized
+
+        Raises:
+            ValueError: If tiktoken is not installed
+        """
+        if not TIKTOKEN_AVAILABLE:
+            raise ValueError("The tiktoken tokenizer requires tiktoken: pip install tiktoken")
+        self.encoding = encoding
+        super().__init__(cache_size)
+
+    def _setup(self) -> None:
+        self._encoding = tiktoken.get_encoding(self.encoding)
+        super()._setup()
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode_ordinary(text))
+
+
+_shared: Dict[str, Tokenizer] = {}
+
+
+def get_tokenizer(name: str = "auto") -> Tokenizer:
+    """
+    Get a shared tokenizer instance.
+
+    Args:
+        name: "tiktoken", "heuristic", or "auto" (tiktoken if installed,
+            otherwise the heuristic)
+
+    Returns:
+        Tokenizer shared by all callers asking for the same name
+
+    Raises:
+        ValueError: If the name is unknown or tiktoken is requested but not installed
+    """
+    if name not in TOKENIZERS:
+        raise ValueError(f"tokenizer must be one of {TOKENIZERS}, got {name!r}")
+    if name == "auto":
+        name = "tiktoken" if TIKTOKEN_AVAILABLE else "heuristic"
+    if name not in _shared:
+        _shared[name] = TiktokenTokenizer() if name == "tiktoken" else HeuristicTokenizer()
+        logger.debug(f"Using {name} tokenizer for token counts")
+    return _shared[name]
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count tokens with the default tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Token count
+    """
+    return get_tokenizer()(text)
@@ -11,6 +11,9 @@ CONFIG_PATH = os.getenv("CONFIG_PATH", "fastagent.config.yaml")
 
 load_dotenv()
 
+# Base URL of the Ollama server's native API (without the OpenAI-compatible /v1 suffix)
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+
 class ConfigError(Exception):
     """Custom exception for config errors."""
     pass
@@ -50,6 +50,7 @@ except ImportError:
     logging.warning("FastAgent not available. Agent creation will fail.")
 
 from src.utils.config import load_config
+from src.pipeline.circuit_breaker import ollama_breaker
 
 logger = logging.getLogger(__name__)
 
@@ -108,15 +109,17 @@ def initialize_fastagent(
     if verify_connection:
         try:
             import httpx
-            response = httpx.get(
-                base_url.replace("/v1", "/api/tags") if base_url else "http://localhost:11434/api/tags",
-                timeout=5.0
-            )
-            if response.status_code != 200:
-                raise FastAgentError(
-                    f"Ollama not accessible at {base_url or DEFAULT_OLLAMA_BASE_URL}. "
-                    "Make sure Ollama is running."
+            # Shares the Ollama circuit breaker: fails fast while Ollama is known down
+            with ollama_breaker:
+                response = httpx.get(
+                    base_url.replace("/v1", "/api/tags") if base_url else "http://localhost:11434/api/tags",
+                    timeout=5.0
                 )
+                if response.status_code != 200:
+                    raise FastAgentError(
+                        f"Ollama not accessible at {base_url or DEFAULT_OLLAMA_BASE_URL}. "
+                        "Make sure Ollama is running."
+                    )
             logger.info("Ollama connection verified successfully")
         except Exception as e:
             raise FastAgentError(
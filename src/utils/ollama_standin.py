@@ -0,0 +1,460 @@
+"""
+Local Ollama stand-in server for load and latency testing.
+
+Serves the subset of the Ollama API used by Buddharauer so embeddings,
+health checks and agents can be exercised without a live Ollama instance:
+
+Endpoints:
+    - POST /api/embeddings: Legacy single-prompt embeddings ({"embedding": [...]})
+    - POST /api/embed: Batch embeddings ({"embeddings": [[...], ...]})
+    - GET /api/tags: Installed model listing (used by health checks)
+    - POST /v1/chat/completions: OpenAI-compatible chat, optionally streamed
+      as server-sent events (used by FastAgent's generic provider)
+
+Behaviour is controlled by StandinConfig:
+    - Latency distributions per request type (fixed, uniform, normal, lognormal)
+    - Injected error rate and status code
+    - Concurrency limit, like Ollama's OLLAMA_NUM_PARALLEL (requests queue)
+    - Streaming token rate for chat completions
+
+Embeddings come from the offline HashingBackend, so vectors are deterministic
+and texts with shared vocabulary are similar; retrieval results are
+meaningful without a model.
+
+Usage Example - In tests:
+    >>> from src.utils.ollama_standin import StandinConfig, StandinServer, LatencyDistribution
+    >>> config = StandinConfig(embedding_latency=LatencyDistribution.parse("lognormal:0.05,0.5"))
+    >>> with StandinServer(config) as server:
+    ...     backend = OllamaBackend(base_url=server.base_url)
+    ...     generator = EmbeddingGenerator(backend=backend)
+
+Usage Example - Command line:
+    $ python -m src.utils.ollama_standin --port 11435 \\
+        --embedding-latency lognormal:0.05,0.5 --error-rate 0.01 --max-concurrency 4
+    $ OLLAMA_BASE_URL=http://localhost:11435 python -m src.api.main
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.pipeline.embedding_backends import HashingBackend
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MODELS = [
+    "nomic-embed-text:latest",
+    "llama3.2:latest",
+    "qwen2.5:latest",
+    "mistral:7b",
+]
+
+# Filler vocabulary for generated chat responses
+_RESPONSE_WORDS = (
+    "the fellowship set out from Rivendell toward the mountains while "
+    "the ring grew heavier and the road wound ever on"
+).split()
+
+
+@dataclass
+class LatencyDistribution:
+    """Random latency model in seconds.
+
+    Kinds and their params:
+        - fixed: (seconds,)
+        - uniform: (low, high)
+        - normal: (mean, stddev), clipped at zero
+        - lognormal: (median, sigma), heavy-tailed like real model servers
+    """
+    kind: str = "fixed"
+    params: Tuple[float, ...] = (0.0,)
+
+    _ARITY = {"fixed": 1, "uniform": 2, "normal": 2, "lognormal": 2}
+
+    def __post_init__(self):
+        expected = self._ARITY.get(self.kind)
+        if expected is None:
+            raise ValueError(
+                f"Unknown latency distribution {self.kind!r}; "
+                f"available: {', '.join(self._ARITY)}"
+            )
+        if len(self.params) != expected:
+            raise ValueError(f"{self.kind} latency takes {expected} parameter(s)")
+        if any(p < 0 for p in self.params):
+            raise ValueError("Latency parameters must be non-negative")
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """
+        Parse a "kind:p1,p2" specification, e.g. "uniform:0.01,0.1".
+
+        A bare number is treated as a fixed latency.
+
+        Args:
+            spec: Distribution specification
+
+        Returns:
+            LatencyDistribution instance
+
+        Raises:
+            ValueError: If the specification is invalid
+        """
+        kind, _, params = spec.partition(":")
+        if not params:
+            return cls("fixed", (float(kind),))
+        return cls(kind, tuple(float(p) for p in params.split(",")))
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one latency in seconds."""
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(*self.params))
+        median, sigma = self.params
+        return median * math.exp(rng.gauss(0.0, sigma)) if median > 0 else 0.0
+
+
+@dataclass
+class StandinConfig:
+    """Behaviour of the stand-in server."""
+    embedding_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    chat_latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    error_rate: float = 0.0
+    error_status: int = 500
+    max_concurrency: Optional[int] = None
+    tokens_per_second: Optional[float] = 50.0
+    response_tokens: int = 64
+    embedding_dim: int = 768
+    models: List[str] = field(default_factory=lambda: list(DEFAULT_MODELS))
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        if not 0.0 <= self.error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        if self.max_concurrency is not None and self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+
+@dataclass
+class StandinStats:
+    """Request counters exposed on app.state.stats for assertions and reports."""
+    requests: int = 0
+    errors: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    tokens_streamed: int = 0
+
+
+def create_standin_app(config: Optional[StandinConfig] = None) -> FastAPI:
+    """
+    Create the stand-in FastAPI application.
+
+    Args:
+        config: Server behaviour (defaults to zero latency, no errors)
+
+    Returns:
+        FastAPI app serving the Ollama API subset
+    """
+    config = config or StandinConfig()
+    rng = random.Random(config.seed)
+    embedder = HashingBackend(dim=config.embedding_dim)
+    semaphore = asyncio.Semaphore(config.max_concurrency) if config.max_concurrency else None
+    stats = StandinStats()
+
+    app = FastAPI(title="Ollama stand-in")
+    app.state.config = config
+    app.state.stats = stats
+
+    class _Slot:
+        """Concurrency slot held for the lifetime of a request."""
+
+        async def __aenter__(self):
+            if semaphore is not None:
+                await semaphore.acquire()
+            stats.requests += 1
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+
+        async def __aexit__(self, *exc_info):
+            stats.in_flight -= 1
+            if semaphore is not None:
+                semaphore.release()
+
+    def injected_error() -> Optional[JSONResponse]:
+        """Return an error response with probability error_rate."""
+        if config.error_rate and rng.random() < config.error_rate:
+            stats.errors += 1
+            return JSONResponse(
+                {"error": "injected failure from Ollama stand-in"},
+                status_code=config.error_status
+            )
+        return None
+
+    def unknown_model(model: Optional[str]) -> Optional[JSONResponse]:
+        """Mimic Ollama's 404 for models that are not installed."""
+        if model is None:
+            return None
+        names = set(config.models) | {m.split(":")[0] for m in config.models if m.endswith(":latest")}
+        if model not in names:
+            return JSONResponse(
+                {"error": f"model \"{model}\" not found, try pulling it first"},
+                status_code=404
+            )
+        return None
+
+    @app.get("/api/tags")
+    async def tags():
+        return {
+            "models": [
+                {"name": name, "model": name, "size": 0, "details": {}}
+                for name in config.models
+            ]
+        }
+
+    @app.post("/api/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        if error := unknown_model(body.get("model")):
+            return error
+        async with _Slot():
+            await asyncio.sleep(config.embedding_latency.sample(rng))
+            if error := injected_error():
+                return error
+            vector = embedder.embed_batch([body.get("prompt", "")])[0]
+            return {"embedding": vector.tolist()}
+
+    @app.post("/api/embed")
+    async def embed(request: Request):
+        body = await request.json()
+        if error := unknown_model(body.get("model")):
+            return error
+        inputs = body.get("input", "")
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        async with _Slot():
+            await asyncio.sleep(config.embedding_latency.sample(rng))
+            if error := injected_error():
+                return error
+            vectors = embedder.embed_batch(texts) if texts else []
+            return {
+                "model": body.get("model"),
+                "embeddings": [v.tolist() for v in vectors],
+            }
+
+    def response_words(messages: List[Dict[str, Any]], max_tokens: Optional[int]) -> List[str]:
+        """Build a deterministic reply of the configured length."""
+        prompt = next(
+            (m.get("content", "") for m in reversed(messages) if m.get("role") == "user"),
+            ""
+        )
+        count = min(config.response_tokens, max_tokens or config.response_tokens)
+        words = ["Stand-in", "reply", "to:"] + str(prompt).split()[:8]
+        while len(words) < count:
+            words.append(_RESPONSE_WORDS[len(words) % len(_RESPONSE_WORDS)])
+        return words[:count]
+
+    async def token_delay():
+        if config.tokens_per_second:
+            await asyncio.sleep(1.0 / config.tokens_per_second)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", config.models[0])
+        words = response_words(body.get("messages", []), body.get("max_tokens"))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            async with _Slot():
+                await asyncio.sleep(config.chat_latency.sample(rng))
+                if error := injected_error():
+                    return error
+                for _ in words:
+                    await token_delay()
+                stats.tokens_streamed += len(words)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": " ".join(words)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"completion_tokens": len(words)},
+            }
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def stream() -> AsyncIterator[str]:
+            async with _Slot():
+                await asyncio.sleep(config.chat_latency.sample(rng))
+                for i, word in enumerate(words):
+                    await token_delay()
+                    stats.tokens_streamed += 1
+                    delta = {"content": word if i == 0 else f" {word}"}
+                    if i == 0:
+                        delta["role"] = "assistant"
+                    yield chunk(delta)
+                yield chunk({}, "stop")
+                yield "data: [DONE]\n\n"
+
+        # Errors are decided up front so they surface as a status code, not mid-stream
+        if error := injected_error():
+            return error
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+class StandinServer:
+    """Run the stand-in app with uvicorn in a background thread.
+
+    Binds to an ephemeral port by default. Use as a context manager or call
+    start()/stop() explicitly.
+    """
+
+    def __init__(self,
+                 config: Optional[StandinConfig] = None,
+                 host: str = "127.0.0.1",
+                 port: int = 0):
+        """
+        Initialize the server.
+
+        Args:
+            config: Stand-in behaviour
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.app = create_standin_app(config)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the native API, the equivalent of OLLAMA_BASE_URL."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        """Base URL of the OpenAI-compatible API, for GENERIC_BASE_URL."""
+        return f"{self.base_url}/v1"
+
+    @property
+    def stats(self) -> StandinStats:
+        """Request counters of the running app."""
+        return self.app.state.stats
+
+    def start(self, timeout: float = 10.0) -> "StandinServer":
+        """
+        Start serving in a background thread.
+
+        Args:
+            timeout: Seconds to wait for the server to accept connections
+
+        Returns:
+            The started server
+
+        Raises:
+            RuntimeError: If the server does not start in time
+        """
+        import uvicorn
+
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        self.port = sock.getsockname()[1]
+
+        self._server = uvicorn.Server(uvicorn.Config(
+            self.app, log_level="warning", lifespan="off"
+        ))
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [sock]}, daemon=True
+        )
+        self._thread.start()
+
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                self.stop()
+                raise RuntimeError("Ollama stand-in failed to start")
+            time.sleep(0.01)
+        logger.info(f"Ollama stand-in listening on {self.base_url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for its thread to exit."""
+        if self._server is not None:
+            self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10.0)
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the stand-in server from the command line."""
+    parser = argparse.ArgumentParser(description="Local Ollama stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--embedding-latency", default="0",
+                        help="Latency spec, e.g. fixed:0.02, uniform:0.01,0.1, lognormal:0.05,0.5")
+    parser.add_argument("--chat-latency", default="0",
+                        help="Time to first token, same format as --embedding-latency")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--response-tokens", type=int, default=64)
+    parser.add_argument("--embedding-dim", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = StandinConfig(
+        embedding_latency=LatencyDistribution.parse(args.embedding_latency),
+        chat_latency=LatencyDistribution.parse(args.chat_latency),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        max_concurrency=args.max_concurrency,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+        embedding_dim=args.embedding_dim,
+        seed=args.seed,
+    )
+
+    import uvicorn
+    uvicorn.run(create_standin_app(config), host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
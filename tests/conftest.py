@@ -5,4 +5,18 @@ import sys
 # Add the src directory to Python path
 src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if src_path not in sys.path:
-    sys.path.insert(0, src_path)
\ No newline at end of file
+    sys.path.insert(0, src_path)
+
+import pytest
+
+from src.pipeline.circuit_breaker import ollama_breaker, retry_budget
+
+
+@pytest.fixture(autouse=True)
+def reset_ollama_circuit():
+    """Keep the shared Ollama circuit breaker and retry budget isolated per test."""
+    ollama_breaker.reset()
+    retry_budget.reset()
+    yield
+    ollama_breaker.reset()
+    retry_budget.reset()
@@ -18,11 +18,16 @@ Note:
     database operations will be added once the services are fully integrated.
 """
 
+import tempfile
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, AsyncMock
 from src.api.main import app
 from src.api import dependencies
+from src.pipeline.extraction_cache import ExtractionCache
+from src.pipeline.pdf_extractor import PDFMetadata, PDFPage
 
 # Create test client
 client = TestClient(app, raise_server_exceptions=True)
@@ -41,6 +46,10 @@ mock_document_registry.get_by_status = AsyncMock(return_value=[])  # Default: no
 app.dependency_overrides[dependencies.get_vector_store] = lambda: mock_vector_store
 app.dependency_overrides[dependencies.get_document_registry] = lambda: mock_document_registry
 
+# Empty extraction cache: no document has stored content
+extraction_cache = ExtractionCache(Path(tempfile.mkdtemp()))
+app.dependency_overrides[dependencies.get_extraction_cache] = lambda: extraction_cache
+
 
 class TestRootEndpoint:
     """Tests for the root API endpoint."""
@@ -169,6 +178,24 @@ class TestDocumentsEndpoints:
         response = client.get("/api/documents/doc_001/content?format=invalid")
         assert response.status_code == 422
 
+    def test_get_document_content_from_cache(self):
+        """Test content is served from the extraction cache."""
+        metadata = PDFMetadata(
+            title="Sutta", author=None, subject=None, keywords=None, creator=None,
+            producer=None, creation_date=None, modification_date=None, page_count=2
+        )
+        pages = [PDFPage(1, "First page.", False), PDFPage(2, "Second page.", False)]
+        list(extraction_cache.write_through("doc_cached", iter([metadata, *pages])))
+
+        response = client.get("/api/documents/doc_cached/content?format=markdown")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["pages"] == 2
+        assert data["content"] == "# Sutta\n\n## Page 1\n\nFirst page.\n\n## Page 2\n\nSecond page."
+
+        response = client.get("/api/documents/doc_cached/content?format=text")
+        assert response.json()["content"] == "First page.\n\nSecond page."
+
     def test_delete_document_not_found(self):
         """Test deleting a non-existent document."""
         response = client.delete("/api/documents/nonexistent_doc")
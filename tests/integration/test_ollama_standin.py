@@ -0,0 +1,156 @@
+"""
+Integration tests against the local Ollama stand-in server.
+
+These tests run a real HTTP server (uvicorn in a background thread) so the
+embedding generator, health checks and the OpenAI-compatible chat endpoint
+are exercised over the network with controlled latency and failures.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+import src.api.main  # noqa: F401  (loads the routes package before importing a route module)
+from src.api.routes.health import check_ollama_health
+from src.pipeline.embedding_backends import OllamaBackend
+from src.pipeline.embeddings import EmbeddingGenerator, EmbeddingAPIError
+from src.utils.ollama_standin import LatencyDistribution, StandinConfig, StandinServer
+
+
+@pytest.fixture(scope="module")
+def standin():
+    """Stand-in with small realistic latencies."""
+    config = StandinConfig(
+        embedding_latency=LatencyDistribution.parse("uniform:0.005,0.02"),
+        tokens_per_second=200.0,
+        response_tokens=12,
+        embedding_dim=64,
+        seed=1,
+    )
+    with StandinServer(config) as server:
+        yield server
+
+
+def test_latency_distribution_parse():
+    """Latency specs parse and sample within their bounds."""
+    import random
+    rng = random.Random(0)
+
+    assert LatencyDistribution.parse("0.25").sample(rng) == 0.25
+    uniform = LatencyDistribution.parse("uniform:0.1,0.2")
+    assert all(0.1 <= uniform.sample(rng) <= 0.2 for _ in range(100))
+    assert LatencyDistribution.parse("normal:0.0,1.0").sample(rng) >= 0.0
+    assert LatencyDistribution.parse("lognormal:0.05,0.5").sample(rng) > 0.0
+
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("pareto:1,2")
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("uniform:0.1")
+
+
+@pytest.mark.asyncio
+async def test_embedding_generator_against_standin(standin, tmp_path):
+    """EmbeddingGenerator produces deterministic vectors over HTTP."""
+    generator = EmbeddingGenerator(
+        cache_dir=tmp_path, backend=OllamaBackend(base_url=standin.base_url)
+    )
+    texts = [f"Gandalf passage {i}" for i in range(10)]
+
+    embeddings = await generator.batch_generate_embeddings(texts)
+
+    assert set(embeddings) == set(texts)
+    assert all(len(v) == 64 for v in embeddings.values())
+    direct = await OllamaBackend(base_url=standin.base_url).embed(texts[0])
+    assert direct == pytest.approx(embeddings[texts[0]])
+
+
+@pytest.mark.asyncio
+async def test_batch_embed_endpoint(standin):
+    """/api/embed accepts a list of inputs."""
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            f"{standin.base_url}/api/embed",
+            json={"model": "nomic-embed-text", "input": ["one", "two", "three"]}
+        )
+    assert response.status_code == 200
+    assert len(response.json()["embeddings"]) == 3
+
+
+@pytest.mark.asyncio
+async def test_unknown_model_returns_404(standin):
+    """Models that are not installed are rejected like Ollama does."""
+    async with httpx.AsyncClient() as client:
+        response = await client.post(
+            f"{standin.base_url}/api/embeddings",
+            json={"model": "not-pulled", "prompt": "hi"}
+        )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_health_check_against_standin(standin):
+    """check_ollama_health follows the configured base URL."""
+    assert await check_ollama_health(standin.base_url) is True
+    assert await check_ollama_health("http://127.0.0.1:9") is False
+
+
+@pytest.mark.asyncio
+async def test_streaming_chat_completion(standin):
+    """Chat completions stream OpenAI-style SSE chunks at the token rate."""
+    chunks = []
+    async with httpx.AsyncClient() as client:
+        async with client.stream(
+            "POST",
+            f"{standin.openai_base_url}/chat/completions",
+            json={
+                "model": "llama3.2:latest",
+                "stream": True,
+                "messages": [{"role": "user", "content": "Who is Aragorn?"}],
+            },
+        ) as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            async for line in response.aiter_lines():
+                if line.startswith("data: "):
+                    chunks.append(line[6:])
+
+    assert chunks[-1] == "[DONE]"
+    events = [json.loads(c) for c in chunks[:-1]]
+    text = "".join(e["choices"][0]["delta"].get("content", "") for e in events)
+    assert text.startswith("Stand-in reply to: Who is Aragorn?")
+    assert len(text.split()) == 12
+    assert events[-1]["choices"][0]["finish_reason"] == "stop"
+
+
+@pytest.mark.asyncio
+async def test_injected_errors_surface_as_api_errors(tmp_path):
+    """A failing server makes the generator raise after its retries."""
+    with StandinServer(StandinConfig(error_rate=1.0, embedding_dim=8)) as server:
+        generator = EmbeddingGenerator(
+            cache_dir=tmp_path,
+            max_retries=0,
+            backend=OllamaBackend(base_url=server.base_url),
+        )
+        with pytest.raises(EmbeddingAPIError):
+            await generator.generate_embedding("doomed")
+        assert server.stats.errors == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_queues_requests(tmp_path):
+    """max_concurrency caps parallel requests the way OLLAMA_NUM_PARALLEL does."""
+    config = StandinConfig(
+        embedding_latency=LatencyDistribution.parse("0.1"),
+        max_concurrency=2,
+        embedding_dim=8,
+    )
+    with StandinServer(config) as server:
+        backend = OllamaBackend(base_url=server.base_url)
+        start = time.perf_counter()
+        await asyncio.gather(*[backend.embed(f"text {i}") for i in range(6)])
+        elapsed = time.perf_counter() - start
+
+        assert server.stats.max_in_flight == 2
+        assert elapsed >= 0.3
@@ -0,0 +1,161 @@
+"""Tests for embedding-similarity breakpoint chunking."""
+import asyncio
+import numpy as np
+import pytest
+
+from src.pipeline.breakpoint_chunker import BreakpointChunker, adjacent_cosine_distances
+from src.pipeline.embedding_backends import HashingBackend
+from src.pipeline.embeddings import EmbeddingGenerator
+from src.pipeline.pdf_extractor import PDFPage
+
+TOPICS = {"hobbit": [1.0, 0.0, 0.0], "ring": [0.0, 1.0, 0.0], "orc": [0.0, 0.0, 1.0]}
+
+
+def topic_embed(texts):
+    """Embed a sentence as the one-hot vector of the topic word it mentions."""
+    return np.array([
+        next(vec for word, vec in TOPICS.items() if word in text.lower()) for text in texts
+    ])
+
+
+def test_adjacent_cosine_distances():
+    """Distances compare each row with the next in one pass."""
+    vectors = np.array([[1.0, 0.0], [2.0, 0.0], [0.0, 1.0], [0.0, 0.0]])
+    distances = adjacent_cosine_distances(vectors)
+
+    assert distances.shape == (3,)
+    assert distances[0] == pytest.approx(0.0)
+    assert distances[1] == pytest.approx(1.0)
+    assert adjacent_cosine_distances(vectors[:1]).shape == (0,)
+
+
+def test_cuts_at_topic_shifts():
+    """Chunks end where the embedding of the next sentence changes topic."""
+    text = (
+        "Hobbits live in holes. The hobbit ate lunch. A hobbit smoked a pipe. "
+        "The ring was gold. The ring was heavy. "
+        "Orcs marched at night. The orc army grew."
+    )
+    chunker = BreakpointChunker(
+        embed_function=topic_embed, chunk_size=500, min_chunk_size=10, breakpoint_percentile=50
+    )
+    chunks = [c.text for c in chunker.create_chunks(text, page_number=1)]
+
+    assert chunks == [
+        "Hobbits live in holes. The hobbit ate lunch. A hobbit smoked a pipe.",
+        "The ring was gold. The ring was heavy.",
+        "Orcs marched at night. The orc army grew.",
+    ]
+
+
+def test_size_bounds_are_respected():
+    """Chunks stay within chunk_size and breakpoints wait for min_chunk_size."""
+    text = " ".join(
+        f"The {topic} sentence number {i}." for i in range(30) for topic in ("hobbit", "ring")
+    )
+    chunker = BreakpointChunker(
+        embed_function=topic_embed, chunk_size=120, min_chunk_size=60, breakpoint_percentile=50
+    )
+    chunks = [c.text for c in chunker.create_chunks(text, page_number=1)]
+
+    assert all(len(c) <= 120 for c in chunks)
+    assert all(len(c) >= 60 for c in chunks[:-1])
+
+
+def test_streams_pages_in_windows():
+    """Streaming across pages with small windows keeps spans and loses no text."""
+    pages = [
+        PDFPage(1, "The hobbit slept. The hobbit woke.", False),
+        PDFPage(2, "The ring glowed. The ring hummed.\n\nThe orc saw it.", False),
+        PDFPage(3, "The orc ran. The orc hid.", False),
+    ]
+    chunker = BreakpointChunker(
+        embed_function=topic_embed, chunk_size=500, min_chunk_size=1,
+        breakpoint_percentile=50, window_sentences=3
+    )
+    chunks = list(chunker.stream_chunks(pages))
+
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    assert chunks[0].text == "The hobbit slept. The hobbit woke."
+    assert chunks[-1].page_span == (2, 3)
+    assert "The orc saw it." in chunks[-1].text
+    words = " ".join(c.text for c in chunks).split()
+    assert words == " ".join(p.text for p in pages).split()
+
+
+def test_embedding_generator_cache_is_reused(tmp_path):
+    """Sentences are embedded through EmbeddingGenerator and its cache."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path, backend=HashingBackend())
+    chunker = BreakpointChunker(embedding_generator=generator, chunk_size=200, min_chunk_size=20)
+    text = "Frodo carried the ring. Sam carried the food. Gandalf fought the balrog."
+
+    first = chunker.create_chunks(text, page_number=1)
+    second = chunker.create_chunks(text, page_number=1)
+
+    assert [c.text for c in first] == [c.text for c in second]
+    assert len(list(tmp_path.rglob("*.*"))) >= 3
+
+
+@pytest.mark.asyncio
+async def test_windows_share_one_event_loop(tmp_path):
+    """Every window is embedded on the same loop, even when called from async code."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path, backend=HashingBackend())
+    loops = []
+    batch = generator.batch_generate_embeddings
+
+    async def recording_batch(texts):
+        loops.append(asyncio.get_running_loop())
+        return await batch(texts)
+
+    generator.batch_generate_embeddings = recording_batch
+    chunker = BreakpointChunker(
+        embedding_generator=generator, chunk_size=200, min_chunk_size=20, window_sentences=2
+    )
+    pages = [PDFPage(n, f"Page {n} opens. Page {n} goes on. Page {n} ends.", False) for n in (1, 2, 3)]
+
+    assert list(chunker.stream_chunks(pages))
+    assert len(loops) >= 3 and len(set(loops)) == 1
+    assert loops[0] is not asyncio.get_running_loop()
+
+
+def test_requires_an_embedding_source():
+    """Without a generator or function there is nothing to embed with."""
+    with pytest.raises(ValueError):
+        BreakpointChunker()
+
+
+def test_shrunken_size_keeps_room_for_text():
+    """A per-document size below chunk_overlap neither loops nor overflows."""
+    chunker = BreakpointChunker(
+        embed_function=topic_embed, chunk_size=800, chunk_overlap=150, min_chunk_size=20
+    )
+    pages = [PDFPage(1, " ".join(f"The hobbit walked mile {i}." for i in range(40)), False)]
+
+    small = chunker._with_chunk_size(100)
+    chunks = list(small.stream_chunks(pages))
+
+    assert chunks and all(len(c.text) <= 100 for c in chunks)
+    small.chunk_overlap = 100
+    with pytest.raises(ValueError):
+        list(small.stream_chunks(pages))
+
+
+def test_grouping_measures_each_sentence_once():
+    """Chunk lengths are tracked incrementally instead of re-measuring joined text."""
+    calls = []
+
+    def counting_len(text):
+        calls.append(text)
+        return len(text)
+
+    chunker = BreakpointChunker(
+        embed_function=topic_embed, chunk_size=5000, chunk_overlap=0,
+        min_chunk_size=5000, length_function=counting_len
+    )
+    text = " ".join(f"The hobbit sentence number {i}." for i in range(200))
+    calls.clear()
+    chunks = chunker.create_chunks(text, page_number=1)
+
+    assert len(chunks) == 2
+    # Linear in the text, not in the text times the sentences per chunk
+    assert sum(len(measured) for measured in calls) < 3 * len(text)
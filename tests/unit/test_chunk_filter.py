@@ -0,0 +1,78 @@
+"""Tests for boilerplate and low-information chunk filtering."""
+import fitz
+import pytest
+
+from src.pipeline.chunk_filter import ChunkFilter, FilterStats, character_entropy
+from src.pipeline.chunker import ChunkPipeline, SemanticChunker
+from src.pipeline.pdf_extractor import PDFPage
+
+TOPICS = ["budget", "hiring", "facilities", "travel", "research"]
+BODY = "The committee reviewed the {} proposals and approved them for next year."
+
+
+def make_page(number, body):
+    """A page with a running header, a body paragraph and a page number footer."""
+    return PDFPage(number, f"ACME Corp Annual Report\n\n{body}\n\nPage {number} of 5", False)
+
+
+def test_strip_boilerplate_removes_repeated_lines_and_page_numbers():
+    """Headers repeated across pages and page numbers are stripped before chunking."""
+    pages = [make_page(n, BODY.format(TOPICS[n - 1])) for n in range(1, 6)]
+    stats = FilterStats()
+
+    stripped = list(ChunkFilter().strip_boilerplate(iter(pages), stats))
+
+    assert [page.text for page in stripped] == [BODY.format(topic) for topic in TOPICS]
+    assert stats.boilerplate_lines == 10
+
+
+def test_too_few_pages_keep_repeated_lines():
+    """Lines are only boilerplate if they repeat on at least min_repeat_pages pages."""
+    pages = [make_page(n, BODY.format(TOPICS[n - 1])) for n in range(1, 3)]
+
+    stripped = list(ChunkFilter(min_repeat_pages=3).strip_boilerplate(pages, FilterStats()))
+
+    assert all(page.text.startswith("ACME Corp") for page in stripped)
+    assert all("Page" not in page.text for page in stripped)
+
+
+def test_is_informative():
+    """Short, symbol-heavy, repetitive and table-of-contents chunks are dropped."""
+    chunk_filter = ChunkFilter()
+
+    assert chunk_filter.is_informative(BODY.format("budget"))
+    assert not chunk_filter.is_informative("Page 4")
+    assert not chunk_filter.is_informative("12.5 | 13.0 | 14.2 | 15.9 | 16.1 | 17.3")
+    assert not chunk_filter.is_informative("aaaa aaaa aaaa aaaa aaaa aaaa")
+    assert not chunk_filter.is_informative(
+        "Introduction ........ 1\nBackground ........ 4\nMethods ........ 9"
+    )
+    assert character_entropy("") == 0.0
+    with pytest.raises(ValueError):
+        ChunkFilter(min_alpha_ratio=2)
+
+
+def test_pipeline_reports_skipped_chunks(tmp_path):
+    """ChunkPipeline strips boilerplate and counts skipped chunks per document."""
+    pdf_path = tmp_path / "report.pdf"
+    doc = fitz.open()
+    for n in range(1, 6):
+        page = doc.new_page()
+        page.insert_text((72, 72), "ACME Corp Annual Report")
+        page.insert_text((72, 120), BODY.format(TOPICS[n - 1]) if n != 3 else "Notes ........ 12")
+        page.insert_text((72, 760), f"Page {n} of 5")
+    doc.save(pdf_path)
+    doc.close()
+
+    pipeline = ChunkPipeline(
+        SemanticChunker(chunk_size=80, chunk_overlap=0),
+        optimize_chunks=False,
+        chunk_filter=ChunkFilter(),
+    )
+    chunks = pipeline.process_file(pdf_path)
+
+    assert chunks
+    assert not any("ACME" in chunk.text or "Page" in chunk.text for chunk in chunks)
+    assert not any("Notes" in chunk.text for chunk in chunks)
+    assert pipeline.filter_stats[str(pdf_path)].chunks_skipped >= 1
+    assert pipeline.get_stats()["skipped_chunks"] == pipeline.total_skipped
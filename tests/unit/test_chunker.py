@@ -1,6 +1,10 @@
 """Tests for semantic chunking module."""
 import pytest
-from src.pipeline.chunker import SemanticChunker, TextChunk, get_optimal_chunk_size
+from src.pipeline.chunker import (
+    SemanticChunker, TextChunk, chunk_length_stats, deserialize_chunks,
+    get_optimal_chunk_size, serialize_chunks
+)
+from src.pipeline.pdf_extractor import PDFPage
 
 SAMPLE_TEXT = """
 This is the first paragraph.
@@ -68,4 +72,136 @@ def test_optimal_chunk_size():
     assert size >= 500
     
     size = get_optimal_chunk_size(SAMPLE_TEXT, target_chunks=2, max_size=300)
-    assert size <= 300
\ No newline at end of file
+    assert size <= 300
+
+def test_long_paragraph_is_split_within_bound():
+    """A paragraph with only single newlines and no blank lines is still bounded."""
+    text = "\n".join(f"Line {i} of a long page that pdf extraction emitted." for i in range(200))
+    chunker = SemanticChunker(chunk_size=300, chunk_overlap=30)
+    chunks = chunker.create_chunks(text, page_number=1)
+
+    assert len(chunks) > 1
+    assert all(len(chunk.text) <= 300 for chunk in chunks)
+    assert chunks[0].text.startswith("Line 0 of")
+
+
+def test_recursive_split_falls_back_to_sentences_words_and_hard_cuts():
+    """Sentences, then words, then hard cuts are used when coarser splits do not fit."""
+    chunker = SemanticChunker(chunk_size=40, chunk_overlap=0)
+
+    sentences = chunker._split_text("First sentence here. Second one! Third is a question?")
+    assert sentences == ["First sentence here. Second one!", "Third is a question?"]
+
+    words = chunker._split_text("word " * 30)
+    assert all(len(c) <= 40 for c in words)
+    assert all(not c.startswith(" ") and "wor d" not in c for c in words)
+
+    cuts = chunker._split_text("x" * 100)
+    assert cuts == ["x" * 40, "x" * 40, "x" * 20]
+
+
+def test_chunk_length_stats():
+    """Chunk length distribution is summarized per document."""
+    chunker = SemanticChunker(chunk_size=100, chunk_overlap=0)
+    chunks = chunker.create_chunks("a" * 250, page_number=1)
+    stats = chunk_length_stats(chunks)
+
+    assert stats["count"] == 3
+    assert stats["max"] == 100
+    assert stats["min"] == 50
+    assert stats["mean"] == pytest.approx(250 / 3)
+    assert chunk_length_stats([])["count"] == 0
+
+
+def test_stream_chunks_carries_paragraphs_across_pages():
+    """A paragraph split by a page break is kept together and records its page span."""
+    pages = iter([
+        PDFPage(1, "Opening paragraph.\n\nThis sentence runs onto", False),
+        PDFPage(2, "the second page.\n\nShort page.", False),
+        PDFPage(3, "", True),
+        PDFPage(4, "Tiny.", False),
+    ])
+    chunker = SemanticChunker(chunk_size=500, chunk_overlap=0)
+    chunks = list(chunker.stream_chunks(pages, {"source": "doc.pdf"}))
+
+    assert len(chunks) == 1
+    assert "runs onto the second page." in chunks[0].text
+    assert chunks[0].page_span == (1, 4)
+    assert chunks[0].metadata["page_start"] == 1
+    assert chunks[0].metadata["page_end"] == 4
+    assert chunks[0].metadata["source"] == "doc.pdf"
+
+
+def test_stream_chunks_stays_within_chunk_size():
+    """Streamed chunks are numbered across the document and bounded by chunk_size."""
+    pages = [PDFPage(n, "A full sentence of text. " * 15, False) for n in range(1, 6)]
+    chunker = SemanticChunker(chunk_size=120, chunk_overlap=20)
+    chunks = list(chunker.stream_chunks(pages))
+
+    assert len(chunks) > 5
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    assert all(len(c.text) <= 120 for c in chunks)
+    assert all(c.page_span[0] <= c.page_span[1] for c in chunks)
+
+
+def test_serialized_chunk_batch_round_trip():
+    """Serialized batches store shared metadata once and rebuild identical chunks."""
+    chunker = SemanticChunker(chunk_size=100, chunk_overlap=10)
+    pages = [PDFPage(n, "Some sentence on a page. " * 10, False) for n in range(1, 4)]
+    chunks = list(chunker.stream_chunks(pages, {"source": "doc.pdf", "title": "T"}))
+
+    batch = serialize_chunks(chunks)
+
+    assert isinstance(batch, bytes)
+    assert deserialize_chunks(batch) == chunks
+    assert deserialize_chunks(serialize_chunks([])) == []
+
+
+def test_streamed_chunks_share_metadata_layers():
+    """Chunks reference one document dict and one dict per page span."""
+    pages = [PDFPage(n, "A full sentence of text. " * 15, False) for n in range(1, 4)]
+    chunker = SemanticChunker(chunk_size=120, chunk_overlap=20)
+    chunks = list(chunker.stream_chunks(pages, {"source": "doc.pdf"}, segment_pages=1))
+
+    documents = {id(c.metadata.layers[-1]) for c in chunks}
+    spans = {id(c.metadata.layers[0]) for c in chunks}
+    assert len(documents) == 1
+    assert len(spans) == 3
+    assert chunks[0].metadata.own == {}
+    assert not hasattr(chunks[0], "__dict__")
+
+    chunks[0].metadata["note"] = "x"
+    del chunks[0].metadata["source"]
+    assert chunks[0].metadata.to_dict()["note"] == "x"
+    assert "source" not in chunks[0].metadata
+    assert chunks[1].metadata["source"] == "doc.pdf"
+    assert "note" not in chunks[1].metadata
+
+
+def test_optimized_size_below_overlap_scales_overlap(tmp_path):
+    """An optimized chunk size under chunk_overlap still terminates within bounds."""
+    import fitz
+
+    pdf_path = tmp_path / "short.pdf"
+    doc = fitz.open()
+    for n in range(3):
+        page = doc.new_page()
+        sentences = [f"Sentence {i} on page {n + 1} talks about the weather." for i in range(12)]
+        page.insert_textbox(fitz.Rect(72, 72, 540, 770), " ".join(sentences), fontsize=9)
+    doc.save(pdf_path)
+    doc.close()
+    chunker = SemanticChunker(chunk_size=800, chunk_overlap=150)
+
+    chunks = chunker.process_pdf(pdf_path)
+
+    size, overlap = chunks[0].metadata['chunk_size'], chunks[0].metadata['chunk_overlap']
+    assert size < 150 and 0 < overlap < size
+    assert all(len(chunk.text) <= size for chunk in chunks)
+    assert (chunker.chunk_size, chunker.chunk_overlap) == (800, 150)
+
+    # A chunker left without room for text fails instead of looping
+    chunker.chunk_overlap = 800
+    with pytest.raises(ValueError):
+        list(chunker.stream_chunks([PDFPage(1, "Some text.", False)]))
+    with pytest.raises(ValueError):
+        chunker._hard_split("Some text.", 0)
@@ -2,8 +2,10 @@
 Tests for the integration between PDF extraction and chunking.
 """
 import pytest
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from src.pipeline.chunker import SemanticChunker, ChunkPipeline, TextChunk
+from src.pipeline.chunker import SemanticChunker, ChunkPipeline, TextChunk, deserialize_chunks
 from src.pipeline.pdf_extractor import PDFExtractor
 
 
@@ -50,8 +52,25 @@ def test_chunk_size_optimization(chunker, sample_pdf_path):
     # Process with optimization
     chunks_after = chunker.process_pdf(sample_pdf_path, optimize_chunks=True)
     
-    assert chunker.chunk_size != original_size
     assert len(chunks_after) > 0
+    assert chunks_after[0].metadata['chunk_size'] != original_size
+    # The optimized size applied to that document only
+    assert chunker.chunk_size == original_size
+    assert chunker.process_pdf(sample_pdf_path, optimize_chunks=False)[0].metadata['chunk_size'] == original_size
+
+
+def test_concurrent_documents_keep_their_own_chunk_size(chunker, sample_pdf_path):
+    """Concurrent iter_chunks calls on one chunker do not share a chunk size."""
+    def chunk(size):
+        return list(chunker.iter_chunks(sample_pdf_path, chunk_size=size))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        small, large = executor.map(chunk, [100, 180])
+
+    assert {c.metadata['chunk_size'] for c in small} == {100}
+    assert {c.metadata['chunk_size'] for c in large} == {180}
+    assert all(len(c.text) <= 100 for c in small)
+    assert chunker.chunk_size == 200
 
 
 def test_pipeline_processes_multiple_files(pipeline, tmp_path):
@@ -121,4 +140,45 @@ def test_stats_tracking(pipeline, tmp_path):
     assert 'total_chunks' in stats
     assert 'avg_chunks_per_file' in stats
     assert isinstance(stats['files_processed'], int)
-    assert isinstance(stats['total_chunks'], int)
\ No newline at end of file
+    assert isinstance(stats['total_chunks'], int)
+
+
+def test_parallel_process_directory(chunker, sample_pdf_path, tmp_path):
+    """Worker processes chunk each file without changing the shared chunker."""
+    for i in range(3):
+        shutil.copy(sample_pdf_path, tmp_path / f"doc{i}.pdf")
+    (tmp_path / "bad.pdf").write_bytes(b"Not a PDF file")
+    original_size = chunker.chunk_size
+    pipeline = ChunkPipeline(chunker, optimize_chunks=True, max_workers=2)
+
+    batches = pipeline.process_directory_batches(tmp_path)
+    assert pipeline.chunker.chunk_size == original_size
+    sequential = chunker.process_pdf(sample_pdf_path)
+
+    assert sorted(Path(p).name for p in batches) == ["doc0.pdf", "doc1.pdf", "doc2.pdf"]
+    assert all(isinstance(batch, bytes) for batch in batches.values())
+    chunks = deserialize_chunks(batches[str(tmp_path / "doc0.pdf")])
+    assert [c.text for c in chunks] == [c.text for c in sequential]
+    assert chunks[0].metadata["source"] == str(tmp_path / "doc0.pdf")
+    assert pipeline.get_stats()["files_processed"] == 3
+    assert len(pipeline.process_directory(tmp_path)) == 3
+
+
+def test_iter_chunks_streams_lazily(chunker, sample_pdf_path):
+    """iter_chunks yields the same chunks as process_pdf without building a list."""
+    stream = chunker.iter_chunks(sample_pdf_path, optimize_chunks=False)
+
+    assert not isinstance(stream, list)
+    streamed = list(stream)
+    assert [c.text for c in streamed] == [
+        c.text for c in chunker.process_pdf(sample_pdf_path, optimize_chunks=False)
+    ]
+
+
+def test_pipeline_iter_file_updates_stats(pipeline, sample_pdf_path):
+    """Stats are recorded once a streamed file has been fully consumed."""
+    chunks = list(pipeline.iter_file(sample_pdf_path))
+
+    assert pipeline.get_stats()['files_processed'] == 1
+    assert pipeline.get_stats()['total_chunks'] == len(chunks)
+    assert pipeline.document_stats[str(sample_pdf_path)]['count'] == len(chunks)
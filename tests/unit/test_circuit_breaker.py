@@ -0,0 +1,200 @@
+"""Tests for the Ollama circuit breaker and shared retry budget."""
+import httpx
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.pipeline.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RetryBudget,
+    is_connection_failure,
+    ollama_breaker,
+)
+from src.pipeline.embeddings import EmbeddingGenerator, EmbeddingCircuitOpenError
+from src.pipeline.recovery import with_retry
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fail(breaker: CircuitBreaker, times: int = 1):
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            with breaker:
+                raise ConnectionError("down")
+
+
+def test_breaker_opens_after_threshold_and_fails_fast():
+    """Consecutive failures open the circuit; calls are then rejected."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=3, recovery_timeout=10.0, clock=clock)
+
+    _fail(breaker, 2)
+    assert breaker.state is CircuitState.CLOSED
+    _fail(breaker)
+    assert breaker.state is CircuitState.OPEN
+
+    clock.now = 4.0
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == pytest.approx(6.0)
+    assert breaker.snapshot()["rejected_calls"] == 1
+
+
+def test_half_open_probe_closes_or_reopens():
+    """After the timeout one probe is allowed; its outcome decides the state."""
+    clock = FakeClock()
+    breaker = CircuitBreaker("test", failure_threshold=1, recovery_timeout=5.0, clock=clock)
+    _fail(breaker)
+
+    clock.now = 5.0
+    assert breaker.state is CircuitState.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # Only one probe at a time
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    clock.now = 10.0
+    with breaker:
+        pass
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_client_errors_do_not_open_circuit():
+    """HTTP 4xx responses mean the service is up."""
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    response = httpx.Response(404, request=httpx.Request("POST", "http://x"))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        with breaker:
+            response.raise_for_status()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_guard_counts_only_connection_failures():
+    """A guarded call's own errors leave the circuit alone; timeouts open it."""
+    breaker = CircuitBreaker("test", failure_threshold=1)
+
+    with pytest.raises(ValueError):
+        with breaker.guard(is_connection_failure):
+            raise ValueError("tool failed")
+    assert breaker.state is CircuitState.CLOSED
+
+    with pytest.raises(TimeoutError):
+        with breaker.guard(is_connection_failure):
+            raise TimeoutError("model timed out")
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_transition_metric_recorded_outside_lock():
+    """Metric file I/O never runs while other callers wait on the breaker."""
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    held = []
+
+    with patch("src.pipeline.circuit_breaker.monitor") as mock_monitor:
+        mock_monitor.record_metric.side_effect = lambda metric: held.append(breaker._lock.locked())
+        _fail(breaker)
+
+    assert held == [False]
+
+
+def test_retry_budget_refills_and_deposits():
+    """Retries are capped by tokens refilled over time and by successes."""
+    clock = FakeClock()
+    budget = RetryBudget(capacity=2, ratio=0.5, min_per_second=0.1, clock=clock)
+
+    assert budget.try_acquire() and budget.try_acquire()
+    assert not budget.try_acquire()
+    assert budget.exhausted == 1
+
+    budget.deposit()
+    budget.deposit()
+    assert budget.try_acquire()
+
+    clock.now = 10.0
+    assert budget.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_with_retry_does_not_retry_open_circuit():
+    """CircuitOpenError propagates immediately from with_retry."""
+    calls = 0
+
+    @with_retry(max_retries=3, initial_delay=0.0)
+    async def guarded():
+        nonlocal calls
+        calls += 1
+        raise CircuitOpenError("ollama", 30.0)
+
+    with pytest.raises(CircuitOpenError):
+        await guarded()
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_with_retry_stops_when_budget_exhausted():
+    """Retries stop as soon as the shared budget runs out."""
+    calls = 0
+    budget = RetryBudget(capacity=1, min_per_second=0.0)
+
+    @with_retry(max_retries=5, initial_delay=0.0, budget=budget)
+    async def flaky():
+        nonlocal calls
+        calls += 1
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await flaky()
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_embeddings_fail_fast_once_circuit_opens(tmp_path):
+    """After the breaker opens, embedding calls never reach the API."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path, max_retries=0)
+
+    with patch('httpx.AsyncClient') as mock_client:
+        client = AsyncMock()
+        client.post.side_effect = httpx.ConnectError("connection refused")
+        mock_client.return_value.__aenter__.return_value = client
+
+        for i in range(ollama_breaker.failure_threshold):
+            with pytest.raises(Exception):
+                await generator.generate_embedding(f"text {i}")
+        calls = client.post.call_count
+
+        with pytest.raises(EmbeddingCircuitOpenError):
+            await generator.generate_embedding("another text")
+        assert client.post.call_count == calls
+
+    assert ollama_breaker.state is CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_health_endpoint_reports_circuit_state():
+    """The health check skips Ollama while open and reports the breaker."""
+    import src.api.main  # noqa: F401  (loads the routes package before importing a route module)
+    from src.api.routes.health import health_check
+
+    for _ in range(ollama_breaker.failure_threshold):
+        ollama_breaker.record_failure()
+
+    vector_store = Mock()
+    vector_store.get_collection_stats.return_value = {"document_count": 3}
+    with patch('httpx.AsyncClient') as mock_client:
+        result = await health_check(vector_store=vector_store, registry=Mock())
+        mock_client.assert_not_called()
+
+    assert result.ollama_connected is False
+    assert result.status == "degraded"
+    assert result.ollama_circuit.state == "open"
+    assert result.ollama_circuit.retry_after_seconds > 0
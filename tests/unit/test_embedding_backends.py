@@ -0,0 +1,133 @@
+"""Tests for pluggable embedding backends and cache namespacing."""
+import json
+import hashlib
+import pytest
+import numpy as np
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.pipeline.embeddings import EmbeddingGenerator
+from src.pipeline.embedding_backends import (
+    HashingBackend,
+    OllamaBackend,
+    create_backend,
+)
+
+
+@pytest.mark.asyncio
+async def test_hashing_backend_is_deterministic_and_normalized():
+    """Hashing embeddings are stable, unit length and reflect shared vocabulary."""
+    backend = HashingBackend(dim=64)
+    first = await backend.embed("Frodo carried the ring to Mordor")
+    again = await HashingBackend(dim=64).embed("Frodo carried the ring to Mordor")
+    related = await backend.embed("the ring was carried by Frodo")
+    unrelated = await backend.embed("Quarterly tax filing deadlines")
+
+    assert first == again
+    assert len(first) == 64
+    assert np.linalg.norm(first) == pytest.approx(1.0, rel=1e-5)
+    assert np.dot(first, related) > np.dot(first, unrelated)
+
+
+@pytest.mark.asyncio
+async def test_hashing_backend_empty_text():
+    """Texts without tokens embed to the zero vector instead of failing."""
+    vector = await HashingBackend(dim=16).embed("   ")
+    assert vector == [0.0] * 16
+
+
+def test_create_backend():
+    """Backends are created by name and unknown names are rejected."""
+    backend = create_backend("ollama", model="mxbai-embed-large", base_url="http://gpu:11434/")
+    assert isinstance(backend, OllamaBackend)
+    assert backend.embeddings_url == "http://gpu:11434/api/embeddings"
+    assert isinstance(create_backend("HASHING", dim=8), HashingBackend)
+
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        create_backend("word2vec")
+
+
+def test_cache_is_namespaced_per_backend_and_model(tmp_path):
+    """Different backends and models never share cache directories."""
+    ollama = EmbeddingGenerator(cache_dir=tmp_path)
+    other_model = EmbeddingGenerator(
+        cache_dir=tmp_path, backend=OllamaBackend(model="mxbai-embed-large:latest"))
+    hashing = EmbeddingGenerator(cache_dir=tmp_path, backend=HashingBackend(dim=8))
+    hashing_wide = EmbeddingGenerator(cache_dir=tmp_path, backend=HashingBackend(dim=16))
+
+    dirs = {g.cache_dir for g in (ollama, other_model, hashing, hashing_wide)}
+    assert len(dirs) == 4
+    assert all(d.parent == tmp_path for d in dirs)
+    assert other_model.cache_dir.name == "ollama__mxbai-embed-large_latest"
+
+
+@pytest.mark.asyncio
+async def test_generator_with_hashing_backend(tmp_path):
+    """The hashing backend runs through the generator without any HTTP calls."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path, backend=HashingBackend(dim=32))
+
+    with patch('httpx.AsyncClient') as mock_client:
+        embeddings = await generator.batch_generate_embeddings(["one ring", "two towers"])
+        mock_client.assert_not_called()
+
+    assert len(embeddings) == 2
+    assert all(len(v) == 32 for v in embeddings.values())
+    cached = await generator.cache.get("one ring")
+    assert cached.tolist() == pytest.approx(embeddings["one ring"], rel=1e-3, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_legacy_cache_entries_are_read_and_promoted(tmp_path):
+    """Flat cache files from before namespacing still serve the default backend."""
+    text = "Legacy cached text"
+    legacy_file = tmp_path / f"{hashlib.sha256(text.encode()).hexdigest()}.json"
+    legacy_file.write_text(json.dumps({"text": text, "embedding": [0.5, 0.25], "timestamp": 0}))
+
+    generator = EmbeddingGenerator(cache_dir=tmp_path)
+    with patch('httpx.AsyncClient') as mock_client:
+        assert await generator.generate_embedding(text) == [0.5, 0.25]
+        mock_client.assert_not_called()
+    assert (generator.cache_dir / f"{legacy_file.stem}.emb").exists()
+    assert legacy_file.exists()
+
+    # Other backends must not see vectors produced by nomic-embed-text
+    hashing = EmbeddingGenerator(cache_dir=tmp_path, backend=HashingBackend(dim=8))
+    assert await hashing.cache.get(text) is None
+
+
+def test_from_config(monkeypatch, tmp_path):
+    """Backend and model are selected from config with env overrides."""
+    config = {"embeddings": {"backend": "hashing", "model": "fh", "dim": 24}}
+    generator = EmbeddingGenerator.from_config(config, cache_dir=tmp_path)
+    assert isinstance(generator.backend, HashingBackend)
+    assert generator.backend.dim == 24
+    assert generator.model == "fh"
+
+    config["embeddings_backend"] = "ollama"
+    config["embeddings"] = {"model": "nomic-embed-text", "base_url": "http://remote:11434"}
+    config["embeddings_model"] = "all-minilm"
+    generator = EmbeddingGenerator.from_config(config, cache_dir=tmp_path, timeout=5.0)
+    assert isinstance(generator.backend, OllamaBackend)
+    assert generator.model == "all-minilm"
+    assert generator.backend.base_url == "http://remote:11434"
+    assert generator.backend.timeout == 5.0
+
+
+@pytest.mark.asyncio
+async def test_ollama_backend_uses_configured_model(tmp_path):
+    """The Ollama backend posts the configured model to the configured URL."""
+    backend = OllamaBackend(model="all-minilm", base_url="http://remote:11434")
+    generator = EmbeddingGenerator(cache_dir=tmp_path, backend=backend)
+
+    response = MagicMock()
+    response.json.return_value = {"embedding": [0.1, 0.2]}
+    response.raise_for_status = MagicMock()
+    with patch('httpx.AsyncClient') as mock_client:
+        client = AsyncMock()
+        client.post.return_value = response
+        mock_client.return_value.__aenter__.return_value = client
+
+        assert await generator.generate_embedding("hello") == [0.1, 0.2]
+
+    url = client.post.call_args.args[0]
+    assert url == "http://remote:11434/api/embeddings"
+    assert client.post.call_args.kwargs["json"] == {"model": "all-minilm", "prompt": "hello"}
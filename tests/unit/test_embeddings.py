@@ -1,9 +1,9 @@
 """Tests for embedding generation."""
 import pytest
 from pathlib import Path
-import json
 import hashlib
 from src.pipeline.embeddings import EmbeddingGenerator
+from src.pipeline.embeddings_cache import read_entry
 
 
 @pytest.fixture
@@ -35,18 +35,17 @@ async def test_embedding_caching(embedding_generator):
     
     # Get cache path and verify file exists
     text_hash = hashlib.sha256(text.encode()).hexdigest()
-    cache_path = embedding_generator.cache_dir / f"{text_hash}.json"
+    cache_path = embedding_generator.cache_dir / f"{text_hash}.emb"
     assert cache_path.exists()
     
-    # Read cached data
-    with cache_path.open() as f:
-        cached_data = json.load(f)
-    assert cached_data["text"] == text
-    assert cached_data["embedding"] == embedding1
+    # Read cached data (float16 by default, keyed by the text's hash)
+    cached_entry = read_entry(cache_path)
+    assert cached_entry.text_hash == text_hash
+    assert cached_entry.embedding.tolist() == pytest.approx(embedding1, rel=1e-3, abs=1e-3)
     
     # Generate second time (should hit cache)
     embedding2 = await embedding_generator.generate_embedding(text)
-    assert embedding2 == embedding1
+    assert embedding2 == pytest.approx(embedding1, rel=1e-3, abs=1e-3)
 
 
 @pytest.mark.asyncio
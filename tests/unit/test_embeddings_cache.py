@@ -2,8 +2,16 @@
 import pytest
 from pathlib import Path
 import json
+import os
+import time
 import asyncio
-from src.pipeline.embeddings_cache import EmbeddingsCache
+import warnings
+from unittest.mock import patch
+
+import numpy as np
+from src.pipeline.embeddings_cache import (
+    EmbeddingsCache, ZSTD_AVAILABLE, decode_entry, encode_entry, read_entry
+)
 
 
 @pytest.fixture
@@ -30,7 +38,7 @@ async def test_cache_operations(embeddings_cache):
     # Put and retrieve
     await embeddings_cache.put(text, embedding)
     cached = await embeddings_cache.get(text)
-    assert cached == embedding
+    assert cached.tolist() == pytest.approx(embedding, rel=1e-3)
 
 
 @pytest.mark.asyncio
@@ -48,7 +56,9 @@ async def test_batch_operations(embeddings_cache):
     
     # Get batch
     cached = await embeddings_cache.get_batch(texts)
-    assert cached == embeddings
+    assert {t: e.tolist() for t, e in cached.items()} == {
+        t: pytest.approx(e, rel=1e-3) for t, e in embeddings.items()
+    }
     
     # Get uncached
     uncached = embeddings_cache.get_uncached_texts(texts + ["text4"])
@@ -70,7 +80,8 @@ async def test_concurrent_writes(embeddings_cache):
     
     # Should have one of the embeddings
     cached = await embeddings_cache.get(text)
-    assert cached in (embedding1, embedding2)
+    assert cached.tolist() in (pytest.approx(embedding1, rel=1e-3),
+                               pytest.approx(embedding2, rel=1e-3))
 
 
 @pytest.mark.asyncio
@@ -89,7 +100,7 @@ async def test_corrupted_cache(embeddings_cache, cache_dir):
     
     # Should be able to write new data
     await embeddings_cache.put(text, embedding)
-    assert await embeddings_cache.get(text) == embedding
+    assert (await embeddings_cache.get(text)).tolist() == pytest.approx(embedding, rel=1e-3)
 
 
 @pytest.mark.asyncio
@@ -100,13 +111,13 @@ async def test_cache_metadata(embeddings_cache):
     
     await embeddings_cache.put(text, embedding)
     
-    # Read raw cache file
-    cache_path = embeddings_cache._get_cache_path(text)
-    data = json.loads(cache_path.read_text())
-    
-    assert data["text"] == text
-    assert data["embedding"] == embedding
-    assert "timestamp" in data
+    # Read raw cache file; only the text's hash is stored by default
+    entry = read_entry(embeddings_cache._get_cache_path(text))
+
+    assert entry.text is None
+    assert entry.text_hash == EmbeddingsCache.text_hash(text)
+    assert entry.embedding.tolist() == pytest.approx(embedding, rel=1e-3)
+    assert entry.timestamp > 0
 
 
 def test_cache_directory_creation(cache_dir):
@@ -114,4 +125,198 @@ def test_cache_directory_creation(cache_dir):
     assert not cache_dir.exists()
     EmbeddingsCache(cache_dir)
     assert cache_dir.exists()
-    assert cache_dir.is_dir()
\ No newline at end of file
+    assert cache_dir.is_dir()
+
+@pytest.mark.asyncio
+async def test_gc_evicts_least_recently_used_in_bulk(cache_dir):
+    """Exceeding max_entries evicts LRU entries down to the low-water mark."""
+    cache = EmbeddingsCache(cache_dir, max_entries=10, low_water=0.5)
+    for i in range(10):
+        await cache.put(f"text{i}", [float(i)])
+    # Touch the oldest entry so it becomes most recently used
+    assert await cache.get("text0") == [0.0]
+
+    await cache.put("text10", [10.0])
+    await cache.close()
+
+    assert cache.stats()["entries"] == 5
+    assert cache.evictions == 6
+    assert await cache.get("text0") == [0.0]
+    assert await cache.get("text1") is None
+    assert len(list(cache_dir.glob("*.emb"))) == 5
+
+
+@pytest.mark.asyncio
+async def test_gc_respects_byte_cap(cache_dir):
+    """The byte cap is enforced from the index's size accounting."""
+    cache = EmbeddingsCache(cache_dir, max_bytes=2000, low_water=0.5)
+    for i in range(40):
+        await cache.put(f"text{i}", [0.1] * 8)
+        await cache.close()
+
+    assert cache.total_bytes <= 2000
+    assert cache.total_bytes == sum(p.stat().st_size for p in cache_dir.glob("*.emb"))
+
+
+@pytest.mark.asyncio
+async def test_index_restores_lru_order_on_reopen(cache_dir):
+    """A reopened cache knows its entries, sizes and access order."""
+    cache = EmbeddingsCache(cache_dir)
+    for i in range(3):
+        await cache.put(f"text{i}", [float(i)])
+    newest = cache._get_cache_path("text0")
+    os.utime(newest, (time.time() + 10, time.time() + 10))
+
+    reopened = EmbeddingsCache(cache_dir)
+    assert reopened.total_bytes == cache.total_bytes
+    assert list(reopened._index)[-1] == newest.stem
+
+
+@pytest.mark.asyncio
+async def test_startup_integrity_sweep(cache_dir):
+    """verify_on_start removes corrupted entries in the background."""
+    cache = EmbeddingsCache(cache_dir)
+    await cache.put("good", [0.5])
+    cache._get_cache_path("bad").write_text("{truncated")
+
+    swept = EmbeddingsCache(cache_dir, verify_on_start=True)
+    assert swept.stats()["entries"] == 2
+    assert await swept.get("good") == [0.5]
+    await swept.close()
+
+    assert swept.corrupt_entries == 1
+    assert swept.stats()["entries"] == 1
+    assert not cache._get_cache_path("bad").exists()
+
+
+@pytest.mark.asyncio
+async def test_misses_never_touch_filesystem(cache_dir):
+    """Membership is answered in memory for guaranteed misses."""
+    cache = EmbeddingsCache(cache_dir)
+    await cache.put("cached", [1.0])
+
+    with patch('aiofiles.open', side_effect=AssertionError("opened a file")), \
+            patch.object(Path, 'exists', side_effect=AssertionError("stat a file")):
+        assert cache.get_uncached_texts(["cached", "new1", "new2"]) == {"new1", "new2"}
+        assert await cache.get("new1") is None
+        cached = await cache.get_batch(["new1", "new2"])
+    assert cached == {}
+
+
+@pytest.mark.asyncio
+async def test_membership_tracks_eviction_and_legacy_entries(tmp_path):
+    """Evicted keys become misses; legacy entries count as present."""
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    legacy_text = "from before namespacing"
+    legacy_key = EmbeddingsCache.text_hash(legacy_text)
+    (legacy / f"{legacy_key}.json").write_text(json.dumps({"embedding": [0.25]}))
+
+    cache = EmbeddingsCache(tmp_path / "ns", legacy_dir=legacy, max_entries=2, low_water=0.5)
+    for i in range(3):
+        await cache.put(f"text{i}", [float(i)])
+    await cache.close()
+
+    assert cache.get_uncached_texts(["text0", "text1", "text2", legacy_text]) == {"text0", "text1"}
+    assert await cache.get(legacy_text) == [0.25]
+
+
+@pytest.mark.asyncio
+async def test_bloom_membership(cache_dir):
+    """Bloom mode answers misses in memory and confirms hits on disk."""
+    seed = EmbeddingsCache(cache_dir)
+    for i in range(50):
+        await seed.put(f"text{i}", [float(i)])
+
+    cache = EmbeddingsCache(cache_dir, membership="bloom")
+    assert cache.stats()["membership"] == "bloom"
+    assert cache.stats()["entries"] == 50
+    assert not cache._index  # No per-key LRU index without size caps
+
+    await cache.put("late", [9.0])
+    texts = [f"text{i}" for i in range(50)] + ["late", "missing"]
+    assert cache.get_uncached_texts(texts) == {"missing"}
+    assert await cache.get("text7") == [7.0]
+    assert cache.stats()["entries"] == 51
+
+
+def test_bloom_filter_false_positive_rate():
+    """The filter has no false negatives and roughly its target error rate."""
+    from src.pipeline.embeddings_cache import BloomFilter
+
+    keys = [EmbeddingsCache.text_hash(f"member {i}") for i in range(5000)]
+    others = [EmbeddingsCache.text_hash(f"other {i}") for i in range(5000)]
+    bloom = BloomFilter(5000, error_rate=0.01)
+    bloom.add_many(keys[:2500])
+    for key in keys[2500:]:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert sum(key in bloom for key in others) / len(others) < 0.03
+
+
+@pytest.mark.asyncio
+async def test_binary_entries_decode_to_float32_arrays(cache_dir):
+    """float16 entries are half the size of float32 ones and read back as float32."""
+    embedding = np.random.default_rng(0).normal(size=768).tolist()
+    half = EmbeddingsCache(cache_dir / "f16")
+    full = EmbeddingsCache(cache_dir / "f32", dtype="float32")
+    await half.put("text", embedding)
+    await full.put("text", embedding)
+
+    cached = await half.get("text")
+    assert cached.dtype == np.float32
+    assert cached.tolist() == pytest.approx(embedding, rel=1e-3, abs=1e-3)
+    assert (await full.get("text")).tolist() == pytest.approx(embedding, rel=1e-6)
+    assert half.total_bytes < full.total_bytes * 0.55
+    assert len(json.dumps(embedding)) > 4 * full.total_bytes
+
+
+def test_store_text_and_out_of_range_values():
+    """The text is kept only when requested; huge values fall back to float32."""
+    assert decode_entry(encode_entry("secret", [1.0])).text is None
+    assert decode_entry(encode_entry("secret", [1.0], store_text=True)).text == "secret"
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert decode_entry(encode_entry("big", [1e6])).embedding.tolist() == [1e6]
+        assert decode_entry(encode_entry("big", [-1e6, 0.5])).embedding.tolist() == [-1e6, 0.5]
+
+
+@pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard not installed")
+@pytest.mark.asyncio
+async def test_zstd_compressed_entries(cache_dir):
+    """zstd entries round-trip and are smaller for compressible vectors."""
+    embedding = [0.0] * 700 + [0.5] * 68
+    plain = EmbeddingsCache(cache_dir / "plain")
+    packed = EmbeddingsCache(cache_dir / "zstd", compression="zstd")
+    await plain.put("text", embedding)
+    await packed.put("text", embedding)
+
+    assert (await packed.get("text")).tolist() == embedding
+    assert packed.total_bytes < plain.total_bytes
+
+
+def test_invalid_storage_options(cache_dir):
+    """Unknown dtypes and compression modes are rejected."""
+    with pytest.raises(ValueError):
+        EmbeddingsCache(cache_dir, dtype="int8")
+    with pytest.raises(ValueError):
+        EmbeddingsCache(cache_dir, compression="lz4")
+
+
+@pytest.mark.asyncio
+async def test_json_entries_are_rewritten_as_binary(cache_dir):
+    """Entries in the older JSON format are read and converted on hit."""
+    cache_dir.mkdir()
+    text = "written by an older version"
+    json_path = cache_dir / f"{EmbeddingsCache.text_hash(text)}.json"
+    json_path.write_text(json.dumps({"text": text, "embedding": [0.5, 0.25], "timestamp": 0}))
+
+    cache = EmbeddingsCache(cache_dir)
+    assert cache.get_uncached_texts([text]) == set()
+    assert (await cache.get(text)).tolist() == [0.5, 0.25]
+
+    assert not json_path.exists()
+    assert cache._get_cache_path(text).exists()
+    assert cache.stats()["entries"] == 1
+    assert cache.total_bytes == cache._get_cache_path(text).stat().st_size
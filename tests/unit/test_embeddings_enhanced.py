@@ -6,8 +6,8 @@ from unittest.mock import Mock, patch, AsyncMock
 import httpx
 
 from src.pipeline.embeddings import (
-    EmbeddingGenerator, EmbeddingError, EmbeddingAPIError,
-    EmbeddingTimeoutError
+    EmbeddingGenerator, EmbeddingAPIError,
+    EmbeddingTimeoutError, EmbeddingInputTooLongError, estimate_token_count
 )
 
 
@@ -48,7 +48,7 @@ async def test_successful_embedding_generation(embedding_generator):
     with patch('httpx.AsyncClient.post', 
               return_value=mock_api_response(embedding=mock_embedding)):
         result = await embedding_generator.generate_embedding("test text")
-        assert result == mock_embedding
+        assert result == pytest.approx(mock_embedding, rel=1e-3)
 
 
 @pytest.mark.asyncio
@@ -88,7 +88,7 @@ async def test_embedding_caching(embedding_generator):
 
         result2 = await embedding_generator.generate_embedding(text)
         assert mock_instance.post.call_count == 0  # Should not call API
-        assert result2 == result1  # Should return cached value
+        assert result2 == pytest.approx(result1, rel=1e-3)  # Should return cached value
 
 
 @pytest.mark.asyncio
@@ -105,7 +105,7 @@ async def test_batch_processing(embedding_generator):
         
         assert len(results) == len(texts)
         for text, expected in zip(texts, mock_embeddings):
-            assert results[text] == expected
+            assert results[text] == pytest.approx(expected, rel=1e-3)
 
 
 @pytest.mark.asyncio
@@ -121,7 +121,7 @@ async def test_error_handling_and_retries(embedding_generator):
     
     with patch('httpx.AsyncClient.post', side_effect=responses):
         result = await embedding_generator.generate_embedding("test text")
-        assert result == mock_embedding
+        assert result == pytest.approx(mock_embedding, rel=1e-3)
 
 
 @pytest.mark.asyncio
@@ -317,4 +317,249 @@ async def test_batch_error_logging_for_many_errors(embedding_generator):
             # Should log "and X more errors" since we have > 5 errors
             warning_calls = [str(call) for call in mock_logger.warning.call_args_list]
             has_more_errors_msg = any("more errors" in str(call) for call in warning_calls)
-            assert has_more_errors_msg or len(texts) - len(results) > 5
\ No newline at end of file
+            assert has_more_errors_msg or len(texts) - len(results) > 5
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced(tmp_path):
+    """Test that concurrent requests for the same text share one API call."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache")
+
+    async def slow_post(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return mock_api_response(embedding=[0.1, 0.2])
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=slow_post)
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        results = await asyncio.gather(*[
+            generator.generate_embedding("same text") for _ in range(5)
+        ])
+
+    assert mock_instance.post.call_count == 1
+    assert all(result == [0.1, 0.2] for result in results)
+    assert generator.coalesced_requests == 4
+    assert not generator._inflight
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers(tmp_path):
+    """Test that cancelling the first caller leaves the shared request running."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache")
+
+    async def slow_post(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return mock_api_response(embedding=[0.1, 0.2])
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=slow_post)
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        leader = asyncio.create_task(generator.generate_embedding("same text"))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(generator.generate_embedding("same text"))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        assert await follower == [0.1, 0.2]
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    assert mock_instance.post.call_count == 1
+    assert generator.coalesced_requests == 1
+    assert not generator._inflight
+
+
+@pytest.mark.asyncio
+async def test_coalesced_failure_propagates_to_all_callers(tmp_path):
+    """Test that a failed shared request raises for every waiting caller."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", max_retries=0)
+
+    async def failing_post(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise httpx.HTTPError("Error")
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=failing_post)
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        results = await asyncio.gather(
+            generator.generate_embedding("failing text"),
+            generator.generate_embedding("failing text"),
+            return_exceptions=True
+        )
+
+    assert mock_instance.post.call_count == 1
+    assert all(isinstance(result, EmbeddingAPIError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_batch_collapses_duplicate_texts(tmp_path):
+    """Test that duplicate texts in one batch are only dispatched once."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", batch_size=2)
+    texts = ["alpha", "beta", "alpha", "alpha", "beta"]
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=mock_api_response(embedding=[0.5]))
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        results = await generator.batch_generate_embeddings(texts)
+
+    assert mock_instance.post.call_count == 2
+    assert set(results) == {"alpha", "beta"}
+
+
+@pytest.mark.asyncio
+async def test_stream_embeddings_yields_in_completion_order(tmp_path):
+    """Test that streamed embeddings arrive as soon as each one completes."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", batch_size=3)
+    delays = {"slow": 0.15, "medium": 0.05, "fast": 0.0}
+
+    async def delayed_post(url, json=None, **kwargs):
+        await asyncio.sleep(delays[json["prompt"]])
+        return mock_api_response(embedding=[delays[json["prompt"]]])
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=delayed_post)
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        results = [
+            item async for item in generator.stream_embeddings(["slow", "medium", "fast"])
+        ]
+
+    assert [index for index, _, _ in results] == [2, 1, 0]
+    assert results[0] == (2, "fast", [0.0])
+
+
+@pytest.mark.asyncio
+async def test_stream_embeddings_cached_and_duplicates(tmp_path):
+    """Test that cached texts come first and duplicates are yielded per index."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache")
+    await generator.cache.put("cached", [1.0])
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=mock_api_response(embedding=[2.0]))
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        results = [
+            item async for item in generator.stream_embeddings(["new", "cached", "new"])
+        ]
+
+    assert mock_instance.post.call_count == 1
+    assert results[0] == (1, "cached", [1.0])
+    assert sorted(index for index, _, _ in results) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stream_embeddings_bounded_buffer(tmp_path):
+    """Test that workers pause when the consumer stops draining results."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", batch_size=4)
+    texts = [f"buffered {i}" for i in range(10)]
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=mock_api_response(embedding=[0.1]))
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        stream = generator.stream_embeddings(texts, buffer_size=2)
+        await stream.__anext__()
+        await asyncio.sleep(0.05)
+        # One consumed, two buffered, one blocked per remaining worker
+        assert mock_instance.post.call_count < len(texts)
+        await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_embeddings_error_handling(tmp_path):
+    """Test that stream errors raise unless ignore_errors is set."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", max_retries=0)
+
+    async def mock_post(url, json=None, **kwargs):
+        if json["prompt"] == "bad":
+            raise httpx.HTTPError("Error")
+        return mock_api_response(embedding=[0.3])
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(side_effect=mock_post)
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        results = [
+            item async for item in generator.stream_embeddings(
+                ["good", "bad"], ignore_errors=True)
+        ]
+        assert results == [(0, "good", [0.3])]
+
+        with pytest.raises(EmbeddingAPIError):
+            async for _ in generator.stream_embeddings(["bad"]):
+                pass
+
+
+def test_bucket_by_length_groups_similar_texts(tmp_path):
+    """Test that dispatch batches group texts of similar estimated length."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", batch_size=2)
+    texts = ["x" * 4000, "c" * 12, "a" * 4, "y" * 3000, "b" * 8]
+
+    batches = generator._bucket_by_length(texts)
+
+    assert batches == [["a" * 4], ["b" * 8, "c" * 12], ["y" * 3000, "x" * 4000]]
+
+
+@pytest.mark.asyncio
+async def test_long_inputs_are_truncated_and_counted(tmp_path):
+    """Test that inputs over max_tokens are truncated before dispatch."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", max_tokens=10)
+    long_text = "word " * 100
+
+    with patch('httpx.AsyncClient') as mock_client:
+        mock_instance = AsyncMock()
+        mock_instance.post = AsyncMock(return_value=mock_api_response(embedding=[0.1]))
+        mock_instance.__aenter__.return_value = mock_instance
+        mock_instance.__aexit__.return_value = None
+        mock_client.return_value = mock_instance
+
+        await generator.generate_embedding(long_text)
+        await generator.generate_embedding("short")
+
+    sent = mock_instance.post.call_args_list[0].kwargs["json"]["prompt"]
+    assert estimate_token_count(sent) <= 10
+    assert generator.truncated_inputs == 1
+    # Cached under the original text
+    assert (await generator.cache.get(long_text)).tolist() == pytest.approx([0.1], rel=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_truncation_policy_error(tmp_path):
+    """Test that the error policy rejects over-long inputs without calling the API."""
+    generator = EmbeddingGenerator(
+        cache_dir=tmp_path / "cache", max_tokens=10, truncation_policy="error")
+
+    with patch('httpx.AsyncClient') as mock_client:
+        with pytest.raises(EmbeddingInputTooLongError):
+            await generator.generate_embedding("word " * 100)
+        mock_client.assert_not_called()
+
+    with pytest.raises(ValueError):
+        EmbeddingGenerator(cache_dir=tmp_path / "cache", truncation_policy="drop")
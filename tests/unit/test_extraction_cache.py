@@ -0,0 +1,129 @@
+"""Tests for the persistent extracted-text cache."""
+import gzip
+from unittest.mock import AsyncMock, Mock
+
+import fitz
+import pytest
+
+from src.database.document_registry import DocumentRegistry
+from src.database.vector_store import VectorStore
+from src.pipeline.chunker import ChunkPipeline, SemanticChunker
+from src.pipeline.extraction_cache import CachedExtractor, ExtractionCache
+from src.pipeline.orchestrator import PipelineOrchestrator
+from src.pipeline.pdf_errors import PDFExtractionError
+from src.pipeline.pdf_extractor import PDFExtractor
+
+
+def write_pdf(path, page_texts):
+    """Write a PDF with one text line per page."""
+    doc = fitz.open()
+    for text in page_texts:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_cached_extractor_round_trip(tmp_path):
+    """A full extraction is cached and later served without the inner extractor."""
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["First page.", "Second page.", "Third page."])
+    cache = ExtractionCache(tmp_path / "cache")
+    extractor = CachedExtractor(cache)
+
+    pages, metadata = extractor.extract_text(pdf_path)
+    assert (extractor.hits, extractor.misses) == (0, 1)
+    assert pages == PDFExtractor().extract_pages(pdf_path)
+
+    extractor.inner = Mock(spec=PDFExtractor)
+    cached_pages, cached_metadata = extractor.extract_text(pdf_path)
+    assert (extractor.hits, extractor.misses) == (1, 1)
+    assert cached_pages == pages and cached_metadata == metadata
+    assert [p.number for p in extractor.iter_pages(pdf_path, page_numbers={2})] == [2]
+    extractor.inner.iter_document.assert_not_called()
+
+    file_hash = DocumentRegistry.compute_file_hash(pdf_path)
+    assert cache.load(file_hash)[1] == pages
+
+
+def test_partial_and_interrupted_extractions_are_not_cached(tmp_path):
+    """Only complete, all-page extractions produce cache entries."""
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["First page.", "Second page."])
+    cache = ExtractionCache(tmp_path / "cache")
+    extractor = CachedExtractor(cache)
+    file_hash = extractor.file_hash(pdf_path)
+
+    list(extractor.iter_pages(pdf_path, page_numbers={1}))
+    assert cache.load(file_hash) is None
+
+    document = extractor.iter_document(pdf_path)
+    next(document)
+    document.close()
+    assert cache.load(file_hash) is None
+    assert list((tmp_path / "cache").iterdir()) == []
+
+
+def test_version_mismatch_and_corrupt_entries(tmp_path):
+    """Entries from another extractor version are ignored; corrupt ones are dropped."""
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["First page.", "Second page."])
+    CachedExtractor(ExtractionCache(tmp_path / "cache", version="old")).extract_text(pdf_path)
+    file_hash = DocumentRegistry.compute_file_hash(pdf_path)
+
+    cache = ExtractionCache(tmp_path / "cache")
+    assert cache.load(file_hash) is None
+
+    CachedExtractor(cache).extract_text(pdf_path)
+    path = tmp_path / "cache" / f"{file_hash}.jsonl.gz"
+    path.write_bytes(path.read_bytes()[:-8])
+    document = cache.iter_document(file_hash)
+    with pytest.raises(PDFExtractionError):
+        list(document)
+    assert not path.exists()
+
+
+def test_unstarted_stream_holds_no_file_and_writers_do_not_collide(tmp_path, monkeypatch):
+    """Cached streams open their file lazily; concurrent writers use separate temp files."""
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["First page.", "Second page."])
+    cache = ExtractionCache(tmp_path / "cache")
+    file_hash = DocumentRegistry.compute_file_hash(pdf_path)
+
+    first = cache.write_through(file_hash, PDFExtractor().iter_document(pdf_path))
+    second = cache.write_through(file_hash, PDFExtractor().iter_document(pdf_path))
+    next(first)
+    next(second)
+    assert len(list((tmp_path / "cache").glob("*.tmp"))) == 2
+    list(first)
+    list(second)
+    assert [p.name for p in (tmp_path / "cache").iterdir()] == [f"{file_hash}.jsonl.gz"]
+
+    opened = []
+    real_open = gzip.open
+    monkeypatch.setattr(
+        gzip, "open", lambda *args, **kwargs: opened.append(real_open(*args, **kwargs)) or opened[-1]
+    )
+    document = cache.iter_document(file_hash)
+    assert len(opened) == 1 and opened[0].closed
+    assert [p.number for p in list(document)[1:]] == [1, 2]
+    assert len(opened) == 2 and opened[1].closed
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_reuses_cached_text(tmp_path):
+    """Re-processing a file with new chunk settings reads pages from the cache."""
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["A perfectly ordinary page of text.", "Another ordinary page."])
+    store = Mock(spec=VectorStore)
+    store.add_documents = AsyncMock(return_value=[])
+    cache = ExtractionCache(tmp_path / "cache")
+
+    for chunk_size in (200, 100):
+        pipeline = ChunkPipeline(SemanticChunker(chunk_size=chunk_size, chunk_overlap=0))
+        orchestrator = PipelineOrchestrator(
+            pipeline, store, state_dir=tmp_path / "state", extraction_cache=cache
+        )
+        assert await orchestrator.process_pdf(pdf_path)
+
+    assert isinstance(pipeline.extractor, CachedExtractor)
+    assert (pipeline.extractor.hits, pipeline.extractor.misses) == (1, 0)
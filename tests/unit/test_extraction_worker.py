@@ -0,0 +1,109 @@
+"""Tests for PDF extraction in an isolated worker process."""
+import multiprocessing
+import time
+from unittest.mock import AsyncMock, Mock
+
+import fitz
+import pytest
+
+from src.database.vector_store import VectorStore
+from src.pipeline.chunker import ChunkPipeline, SemanticChunker
+from src.pipeline.extraction_worker import IsolatedExtractor
+from src.pipeline.orchestrator import PipelineOrchestrator
+from src.pipeline.pdf_errors import PDFExtractionTimeout
+from src.pipeline.pdf_extractor import PDFExtractor
+
+# Patches made in the test process only reach the worker when it is forked
+requires_fork = pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="worker must inherit patched extraction"
+)
+
+
+def write_pdf(path, page_texts):
+    """Write a PDF with one text line per page."""
+    doc = fitz.open()
+    for text in page_texts:
+        doc.new_page().insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_isolated_extraction_matches_in_process_and_recycles(tmp_path):
+    """The worker returns the same pages and is replaced after N documents."""
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, ["First page.", "Second page.", "Third page."])
+    extractor = IsolatedExtractor(max_documents_per_worker=2)
+    try:
+        pages, metadata = extractor.extract_text(pdf_path)
+        assert pages == PDFExtractor().extract_pages(pdf_path)
+        assert metadata.page_count == 3
+        first_worker = extractor._process
+
+        assert [p.number for p in extractor.iter_pages(pdf_path, page_numbers={2})] == [2]
+        assert extractor._process is None  # recycled after two documents
+
+        with pytest.raises(FileNotFoundError):
+            extractor.extract_text(tmp_path / "missing.pdf")
+        assert extractor._process is not first_worker and extractor._process.is_alive()
+    finally:
+        extractor.close()
+
+
+@requires_fork
+def test_hanging_page_is_killed(tmp_path, monkeypatch):
+    """A page that never finishes times out and the worker is replaced."""
+    pdf_path = tmp_path / "hang.pdf"
+    write_pdf(pdf_path, ["Fine page.", "Hanging page."])
+    read_page = PDFExtractor._read_page
+
+    def slow_read(self, pdf_doc, page_num):
+        if page_num == 1:
+            time.sleep(60)
+        return read_page(self, pdf_doc, page_num)
+
+    monkeypatch.setattr(PDFExtractor, "_read_page", slow_read)
+    extractor = IsolatedExtractor(page_timeout=0.5)
+    try:
+        document = extractor.iter_document(pdf_path)
+        next(document)
+        assert next(document).number == 1
+        started = time.monotonic()
+        with pytest.raises(PDFExtractionTimeout):
+            next(document)
+        assert time.monotonic() - started < 5
+        assert extractor._process is None
+    finally:
+        extractor.close()
+
+
+@requires_fork
+@pytest.mark.asyncio
+async def test_orchestrator_records_timeout_and_continues(tmp_path, monkeypatch):
+    """A timed-out file is a failure and the next file is still processed."""
+    good, bad = tmp_path / "good.pdf", tmp_path / "bad.pdf"
+    write_pdf(good, ["A perfectly ordinary page of text."])
+    write_pdf(bad, ["This page hangs the parser."])
+    read_page = PDFExtractor._read_page
+
+    def slow_read(self, pdf_doc, page_num):
+        if "hangs" in pdf_doc[page_num].get_text():
+            time.sleep(60)
+        return read_page(self, pdf_doc, page_num)
+
+    monkeypatch.setattr(PDFExtractor, "_read_page", slow_read)
+    store = Mock(spec=VectorStore)
+    store.add_documents = AsyncMock(return_value=[])
+    extractor = IsolatedExtractor(page_timeout=0.5)
+    pipeline = ChunkPipeline(SemanticChunker(chunk_size=200, chunk_overlap=0), extractor=extractor)
+    orchestrator = PipelineOrchestrator(pipeline, store, state_dir=tmp_path / "state")
+    try:
+        assert not await orchestrator.process_pdf(bad)
+        assert await orchestrator.process_pdf(good)
+    finally:
+        extractor.close()
+
+    stats = orchestrator.get_stats()
+    assert stats.extraction_timeouts == 1
+    assert str(bad) in stats.errors
+    assert stats.successful_files == 1
@@ -0,0 +1,78 @@
+"""Tests for incremental page-level re-ingestion planning."""
+from src.pipeline.incremental import (
+    ChunkRecord, DocumentManifest, ManifestStore, chunk_id, hash_text, plan_reingest
+)
+
+
+def make_manifest(page_texts, segment_pages=1):
+    """Build a manifest with one chunk starting on each page."""
+    return DocumentManifest(
+        source="doc.pdf",
+        file_hash="abc",
+        chunk_size=500,
+        chunk_overlap=50,
+        size_unit="chars",
+        segment_pages=segment_pages,
+        page_hashes={n: hash_text(t) for n, t in enumerate(page_texts, 1)},
+        chunks=[ChunkRecord(f"c{n}", n, n) for n in range(1, len(page_texts) + 1)],
+    )
+
+
+def test_plan_only_changed_pages():
+    """Only changed pages are re-chunked and only their chunks are stale."""
+    old = make_manifest(["a", "b", "c", "d"])
+    new_hashes = {1: hash_text("a"), 2: hash_text("B"), 3: hash_text("c"), 4: hash_text("d")}
+
+    plan = plan_reingest(old, new_hashes, segment_pages=1, chunk_overlap=50, size_unit="chars")
+
+    assert plan.page_numbers == {2}
+    assert plan.stale_chunk_ids == ["c2"]
+    assert [c.id for c in plan.kept_chunks] == ["c1", "c3", "c4"]
+    assert plan.chunk_size == 500
+    assert not plan.full
+
+
+def test_plan_segments_and_removed_pages():
+    """A change dirties its whole segment and removed pages delete their chunks."""
+    old = make_manifest(["a", "b", "c", "d", "e"], segment_pages=2)
+    new_hashes = {1: hash_text("a"), 2: hash_text("b"), 3: hash_text("X"), 4: hash_text("d")}
+
+    plan = plan_reingest(old, new_hashes, segment_pages=2, chunk_overlap=50, size_unit="chars")
+
+    assert plan.page_numbers == {3, 4}
+    assert plan.stale_chunk_ids == ["c3", "c4", "c5"]
+
+
+def test_plan_full_when_new_or_settings_changed():
+    """Missing manifests or different chunk settings re-ingest everything."""
+    hashes = {1: hash_text("a"), 2: hash_text("b")}
+
+    first = plan_reingest(None, hashes, segment_pages=1, chunk_overlap=50, size_unit="chars")
+    assert first.full and first.page_numbers == {1, 2} and first.stale_chunk_ids == []
+
+    old = make_manifest(["a", "b"])
+    changed = plan_reingest(old, hashes, segment_pages=1, chunk_overlap=10, size_unit="chars")
+    assert changed.full and changed.stale_chunk_ids == ["c1", "c2"]
+    assert plan_reingest(old, hashes, 1, 50, "chars").unchanged
+
+
+def test_manifest_store_round_trip(tmp_path):
+    """Manifests persist to disk and unreadable files are ignored."""
+    store = ManifestStore(tmp_path / "manifests")
+    manifest = make_manifest(["a", "b"])
+
+    store.save(manifest)
+    assert store.load("doc.pdf") == manifest
+    assert store.load("other.pdf") is None
+
+    store._path("doc.pdf").write_text("{not json")
+    assert store.load("doc.pdf") is None
+    store.delete("doc.pdf")
+    assert not store._path("doc.pdf").exists()
+
+
+def test_chunk_id_is_document_scoped():
+    """Identical text in different documents or places gets different IDs."""
+    assert chunk_id("a.pdf", 1, 0, "text") == chunk_id("a.pdf", 1, 0, "text")
+    assert chunk_id("a.pdf", 1, 0, "text") != chunk_id("b.pdf", 1, 0, "text")
+    assert chunk_id("a.pdf", 1, 0, "text") != chunk_id("a.pdf", 2, 0, "text")
@@ -2,10 +2,18 @@
 import pytest
 from pathlib import Path
 import asyncio
+import json
 import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import AsyncMock, Mock
+
+import fitz
 
 from src.pipeline.orchestrator import PipelineOrchestrator, ProcessingStats
+from src.pipeline.chunk_filter import ChunkFilter
 from src.pipeline.chunker import ChunkPipeline, SemanticChunker
+from src.pipeline.pdf_extractor import PDFExtractor, PDFPage
 from src.database.vector_store import VectorStore
 
 
@@ -100,4 +108,330 @@ async def test_batched_processing(orchestrator, test_files):
     stats = await orchestrator.process_directory(test_files)
     
     # Since batch_size=2, chunks should be processed in batches of 2
-    assert stats.total_chunks > 0
\ No newline at end of file
+    assert stats.total_chunks > 0
+
+@pytest.mark.asyncio
+async def test_streamed_chunks_inserted_in_batches(orchestrator, test_files, monkeypatch):
+    """Chunks are sent to the vector store in batch_size batches as they stream in."""
+    batches = []
+
+    async def record_batch(texts, metadata_list, ids=None):
+        batches.append(len(texts))
+        return [str(i) for i in range(len(texts))]
+
+    monkeypatch.setattr(orchestrator, "_add_to_vector_store", record_batch)
+    orchestrator.chunk_pipeline.chunker.chunk_size = 40
+    orchestrator.chunk_pipeline.optimize_chunks = False
+    pdf_path = next(test_files.glob("*.pdf"))
+    text = "Sentence number one. " * 20
+    monkeypatch.setattr(
+        orchestrator.chunk_pipeline.chunker, "iter_chunks",
+        lambda path, **kwargs: orchestrator.chunk_pipeline.chunker.stream_chunks(
+            [PDFPage(1, text, False)], {"source": str(path)}
+        )
+    )
+
+    assert await orchestrator.process_pdf(pdf_path)
+    assert all(size <= 2 for size in batches)
+    assert sum(batches) == orchestrator.get_stats().total_chunks > 2
+
+
+def write_pdf(path, page_texts):
+    """Write a PDF with one text line per page."""
+    doc = fitz.open()
+    for text in page_texts:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.mark.asyncio
+async def test_incremental_reingest_only_changed_pages(chunk_pipeline, tmp_path):
+    """Re-ingesting a changed PDF embeds only its changed pages and deletes stale vectors."""
+    store = Mock(spec=VectorStore)
+    store.add_documents = AsyncMock(side_effect=lambda texts, metadata_list, ids, batch_size: ids)
+    store.delete_documents = AsyncMock(side_effect=lambda ids: len(ids))
+    pdf_path = tmp_path / "handbook.pdf"
+    pages = [f"Page {n} policy text." for n in range(1, 6)]
+    write_pdf(pdf_path, pages)
+
+    def new_orchestrator():
+        return PipelineOrchestrator(
+            chunk_pipeline, store, batch_size=50,
+            state_dir=tmp_path / "state", incremental=True
+        )
+
+    assert await new_orchestrator().process_pdf(pdf_path)
+    first_ids = store.add_documents.call_args.kwargs["ids"]
+    assert len(first_ids) == 5
+
+    # Unchanged file: nothing is embedded
+    assert await new_orchestrator().process_pdf(pdf_path)
+    assert store.add_documents.call_count == 1
+
+    pages[1] = "Page 2 has been revised."
+    write_pdf(pdf_path, pages[:4])
+    orchestrator = new_orchestrator()
+    assert await orchestrator.process_pdf(pdf_path)
+
+    texts = store.add_documents.call_args.kwargs["texts"]
+    assert texts == ["Page 2 has been revised."]
+    deleted = store.delete_documents.call_args.args[0]
+    assert sorted(deleted) == sorted([first_ids[1], first_ids[4]])
+    assert orchestrator.get_stats().pages_reprocessed == 1
+    assert orchestrator.get_stats().chunks_deleted == 2
+
+
+@pytest.mark.asyncio
+async def test_incremental_reingest_strips_learned_boilerplate(tmp_path):
+    """Changed pages are stripped with the boilerplate learned from the whole document."""
+    store = Mock(spec=VectorStore)
+    store.add_documents = AsyncMock(side_effect=lambda texts, metadata_list, ids, batch_size: ids)
+    store.delete_documents = AsyncMock(side_effect=lambda ids: len(ids))
+    pdf_path = tmp_path / "handbook.pdf"
+    topics = ["leave", "travel", "security", "hiring", "payroll", "training"]
+    pages = [f"ACME Employee Handbook\nThis page explains the {topic} policy." for topic in topics]
+    write_pdf(pdf_path, pages)
+    pipeline = ChunkPipeline(
+        SemanticChunker(chunk_size=200, chunk_overlap=0),
+        optimize_chunks=False,
+        chunk_filter=ChunkFilter()
+    )
+
+    def new_orchestrator():
+        return PipelineOrchestrator(
+            pipeline, store, state_dir=tmp_path / "state", incremental=True
+        )
+
+    assert await new_orchestrator().process_pdf(pdf_path)
+    assert not any("ACME" in text for text in store.add_documents.call_args.kwargs["texts"])
+
+    pages[1] = "ACME Employee Handbook\nThis page explains the revised travel policy."
+    write_pdf(pdf_path, pages)
+    orchestrator = new_orchestrator()
+    assert await orchestrator.process_pdf(pdf_path)
+
+    assert store.add_documents.call_args.kwargs["texts"] == ["This page explains the revised travel policy."]
+    manifest = orchestrator.manifests.load(str(pdf_path))
+    assert manifest.boilerplate == ["acme employee handbook"]
+
+
+@pytest.mark.asyncio
+async def test_filtered_chunks_are_counted(tmp_path):
+    """Chunks dropped by the pipeline's chunk filter are reported in the stats."""
+    store = Mock(spec=VectorStore)
+    store.add_documents = AsyncMock(return_value=[])
+    pdf_path = tmp_path / "contents.pdf"
+    write_pdf(pdf_path, ["Chapter one introduces the project goals.", "Index ........ 12"])
+    chunker = SemanticChunker(chunk_size=45, chunk_overlap=0)
+    pipeline = ChunkPipeline(chunker, optimize_chunks=False, chunk_filter=ChunkFilter())
+    orchestrator = PipelineOrchestrator(pipeline, store, state_dir=tmp_path / "state")
+
+    assert await orchestrator.process_pdf(pdf_path)
+
+    assert store.add_documents.call_args.kwargs["texts"] == ["Chapter one introduces the project goals."]
+    assert orchestrator.get_stats().chunks_skipped == 1
+    assert orchestrator.get_stats().to_dict()["chunks_skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_extraction_does_not_block_event_loop(tmp_path, monkeypatch):
+    """Blocking extraction runs in an executor, so other coroutines keep running."""
+    store = Mock(spec=VectorStore)
+    store.add_documents = AsyncMock(return_value=[])
+    pdf_path = tmp_path / "slow.pdf"
+    write_pdf(pdf_path, ["First slow page.", "Second slow page.", "Third slow page."])
+    read_page = PDFExtractor._read_page
+
+    def slow_read(self, pdf_doc, page_num):
+        time.sleep(0.2)
+        return read_page(self, pdf_doc, page_num)
+
+    monkeypatch.setattr(PDFExtractor, "_read_page", slow_read)
+    pipeline = ChunkPipeline(SemanticChunker(chunk_size=200, chunk_overlap=0))
+    orchestrator = PipelineOrchestrator(pipeline, store, state_dir=tmp_path / "state")
+
+    lags = []
+
+    async def ticker():
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - started - 0.01)
+
+    task = asyncio.create_task(ticker())
+    assert await orchestrator.process_pdf(pdf_path)
+    task.cancel()
+
+    assert len(lags) > 20
+    assert max(lags) < 0.1
+
+
+@pytest.mark.asyncio
+async def test_process_executor_chunks_whole_file(tmp_path):
+    """With a ProcessPoolExecutor each file is chunked in a worker process."""
+    store = Mock(spec=VectorStore)
+    store.add_documents = AsyncMock(return_value=[])
+    pdf_path = tmp_path / "doc.pdf"
+    write_pdf(pdf_path, [f"Page {n} discusses topic number {n}." for n in range(1, 6)])
+    pipeline = ChunkPipeline(SemanticChunker(chunk_size=60, chunk_overlap=0), optimize_chunks=False)
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        orchestrator = PipelineOrchestrator(
+            pipeline, store, batch_size=2, state_dir=tmp_path / "state", executor=executor
+        )
+        assert await orchestrator.process_pdf(pdf_path)
+        assert not await orchestrator.process_pdf(tmp_path / "missing.pdf")
+
+    texts = [t for call in store.add_documents.call_args_list for t in call.kwargs["texts"]]
+    assert texts == [chunk.text for chunk in pipeline.process_file(pdf_path)]
+    assert all(len(call.kwargs["texts"]) <= 2 for call in store.add_documents.call_args_list)
+    assert orchestrator.get_stats().total_chunks == len(texts)
+    assert pipeline.total_processed == 2  # worker file plus process_file above
+
+
+def staged_store(events, fail_on=None):
+    """Mock store whose embed step is slow and records what it embeds."""
+    store = Mock(spec=VectorStore)
+
+    async def embed_documents(texts, metadata_list, ids=None):
+        events.append(("embed", texts))
+        await asyncio.sleep(0.02)
+        if fail_on and any(fail_on in text for text in texts):
+            raise ValueError("embedding failed")
+        return [Mock(text=text) for text in texts]
+
+    async def add_embedded_documents(documents):
+        events.append(("store", [doc.text for doc in documents]))
+        return [str(i) for i in range(len(documents))]
+
+    store.embed_documents = AsyncMock(side_effect=embed_documents)
+    store.add_embedded_documents = AsyncMock(side_effect=add_embedded_documents)
+    return store
+
+
+@pytest.fixture
+def staged_files(tmp_path):
+    """Four five-page PDFs, one of them poisoned for the embed stage."""
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    for name in ("a", "b", "c", "d"):
+        marker = "poison" if name == "c" else "topic"
+        write_pdf(
+            pdf_dir / f"{name}.pdf",
+            [f"Document {name} page {n} covers {marker} {n}." for n in range(1, 6)]
+        )
+    return pdf_dir
+
+
+@pytest.mark.asyncio
+async def test_staged_directory_overlaps_stages_with_backpressure(staged_files, tmp_path, monkeypatch):
+    """Embedding starts before extraction ends, and bounded queues hold extraction back."""
+    events = []
+    read_page = PDFExtractor._read_page
+
+    def recording_read(self, pdf_doc, page_num):
+        events.append(("extract", page_num))
+        return read_page(self, pdf_doc, page_num)
+
+    monkeypatch.setattr(PDFExtractor, "_read_page", recording_read)
+    store = staged_store(events)
+    pipeline = ChunkPipeline(SemanticChunker(chunk_size=45, chunk_overlap=0), optimize_chunks=False)
+    orchestrator = PipelineOrchestrator(
+        pipeline, store, batch_size=2, state_dir=tmp_path / "state",
+        embed_workers=1, queue_size=1
+    )
+    backlog = []
+    prepare_batch = orchestrator._prepare_batch
+
+    def counting_prepare(job, batch):
+        # Batches produced minus batches whose embedding has started
+        produced = len(backlog) + 1
+        backlog.append(produced - sum(kind == "embed" for kind, _ in events))
+        return prepare_batch(job, batch)
+
+    monkeypatch.setattr(orchestrator, "_prepare_batch", counting_prepare)
+
+    stats = await orchestrator.process_directory(staged_files)
+
+    assert stats.successful_files == 4 and stats.failed_files == 0
+    kinds = [kind for kind, _ in events]
+    assert kinds.index("embed") < len(kinds) - 1 - kinds[::-1].index("extract")
+    # At most one batch queued and one waiting to be put, plus the new one
+    assert max(backlog) <= 3
+    assert set(stats.stages) == {"extract", "embed", "store"}
+    for report in stats.stages.values():
+        assert report["items"] == stats.total_chunks
+        assert report["throughput"] > 0
+        assert report["max_queue_depth"] <= 1
+    assert stats.to_dict()["stages"]["embed"]["workers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_staged_failure_fails_only_its_file(staged_files, tmp_path, monkeypatch):
+    """A batch failing to embed fails its file, drops its batches and records the failure."""
+    events = []
+    store = staged_store(events, fail_on="poison")
+    pipeline = ChunkPipeline(SemanticChunker(chunk_size=45, chunk_overlap=0), optimize_chunks=False)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        orchestrator = PipelineOrchestrator(
+            pipeline, store, batch_size=2, state_dir=tmp_path / "state",
+            executor=executor, extract_workers=2, embed_workers=2
+        )
+        # Skip the retry backoff
+        monkeypatch.setattr(orchestrator, "_embed_batch", store.embed_documents)
+
+        stats = await orchestrator.process_directory(staged_files)
+
+    poisoned = str(staged_files / "c.pdf")
+    assert stats.successful_files == 3 and stats.failed_files == 1
+    assert list(stats.errors) == [poisoned]
+    stored = [text for kind, texts in events if kind == "store" for text in texts]
+    assert stored and not any("poison" in text for text in stored)
+    assert poisoned not in orchestrator.processed_files
+    states = [json.loads(path.read_text()) for path in (tmp_path / "state").glob("*.json")]
+    assert [(state["input_data"]["pdf_path"], state["status"]) for state in states] == [
+        (poisoned, "failed")
+    ]
+
+
+def write_dense_pdf(path, text, pages):
+    """Write a PDF whose pages are filled with wrapped text."""
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page().insert_textbox(fitz.Rect(36, 36, 576, 806), text, fontsize=6)
+    doc.save(path)
+    doc.close()
+
+
+@pytest.mark.asyncio
+async def test_staged_manifests_record_each_files_chunk_size(tmp_path):
+    """A file's manifest keeps its own chunk size after the next file re-optimizes the chunker."""
+    pdf_dir = tmp_path / "pdfs"
+    pdf_dir.mkdir()
+    write_dense_pdf(pdf_dir / "a_dense.pdf", "Dense policy paragraph with many words. " * 120, 3)
+    write_pdf(pdf_dir / "b_sparse.pdf", ["Short page one.", "Short page two.", "Short page three."])
+    events = []
+    store = staged_store(events)
+    pipeline = ChunkPipeline(SemanticChunker(chunk_size=200, chunk_overlap=0))
+    orchestrator = PipelineOrchestrator(
+        pipeline, store, batch_size=2, state_dir=tmp_path / "state", incremental=True
+    )
+
+    stats = await orchestrator.process_directory(pdf_dir)
+
+    assert stats.successful_files == 2
+    sizes = {}
+    for path in sorted(pdf_dir.glob("*.pdf")):
+        expected = ChunkPipeline(SemanticChunker(chunk_size=200, chunk_overlap=0)).process_file(path)
+        sizes[path.name] = orchestrator.manifests.load(str(path)).chunk_size
+        assert sizes[path.name] == expected[0].metadata["chunk_size"]
+    assert sizes["a_dense.pdf"] > sizes["b_sparse.pdf"]
+
+
+def test_threaded_extract_workers_are_rejected(chunk_pipeline, tmp_path):
+    """Several extract workers would share one chunker and extractor in threads."""
+    store = Mock(spec=VectorStore)
+    with pytest.raises(ValueError):
+        PipelineOrchestrator(chunk_pipeline, store, state_dir=tmp_path / "state", extract_workers=2)
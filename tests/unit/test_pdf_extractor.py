@@ -76,4 +76,71 @@ def test_text_statistics():
     assert stats["total_pages"] == 3
     assert stats["scanned_pages"] == 1
     assert stats["empty_pages"] == 1
-    assert stats["total_chars"] == len("Page one content") + len("Page three")
\ No newline at end of file
+    assert stats["total_chars"] == len("Page one content") + len("Page three")
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    """Worker processes extract page batches that are reassembled in order."""
+    import fitz
+
+    pdf_path = tmp_path / "long.pdf"
+    doc = fitz.open()
+    for n in range(1, 11):
+        doc.new_page().insert_text((72, 72), f"Text of page {n}.")
+    doc.save(pdf_path)
+    doc.close()
+
+    progress = []
+    serial = PDFExtractor()
+    parallel = PDFExtractor(
+        progress_callback=lambda current, total: progress.append(current),
+        max_workers=2,
+        min_pages_per_worker=3
+    )
+
+    pages, metadata = parallel.extract_text(pdf_path)
+    assert pages == serial.extract_pages(pdf_path)
+    assert [page.number for page in pages] == list(range(1, 11))
+    assert progress == list(range(1, 11))
+    assert metadata.page_count == 10
+
+    selected = list(parallel.iter_pages(pdf_path, page_numbers={2, 3, 5, 7, 8, 9, 10}))
+    assert [page.number for page in selected] == [2, 3, 5, 7, 8, 9, 10]
+    assert selected[0].text.strip() == "Text of page 2."
+
+    with pytest.raises(ValueError):
+        PDFExtractor(min_pages_per_worker=0)
+
+
+def test_iter_document_opens_once_and_reports_extraction_time(tmp_path, monkeypatch):
+    """Metadata comes first, pages follow lazily and the file is closed on close()."""
+    import fitz
+    from src.pipeline.monitoring import MonitoringSystem
+
+    pdf_path = tmp_path / "doc.pdf"
+    doc = fitz.open()
+    for n in range(1, 4):
+        doc.new_page().insert_text((72, 72), f"Text of page {n}.")
+    doc.save(pdf_path)
+    doc.close()
+
+    opened = []
+    real_open = fitz.open
+    monkeypatch.setattr(fitz, "open", lambda *args: opened.append(real_open(*args)) or opened[-1])
+    monitoring = MonitoringSystem(metrics_dir=tmp_path / "metrics")
+
+    document = PDFExtractor(monitoring=monitoring).iter_document(pdf_path)
+    metadata = next(document)
+    first_page = next(document)
+    document.close()
+
+    assert isinstance(metadata, PDFMetadata) and metadata.page_count == 3
+    assert first_page.number == 1
+    assert len(opened) == 1 and opened[0].is_closed
+    metric = monitoring.get_metric("pdf_extraction_duration_seconds")
+    assert metric.labels == {"file": str(pdf_path), "pages": "1"}
+    assert monitoring.get_metric("pdf_page_extraction_duration_seconds") is None
+
+    list(PDFExtractor(monitoring=monitoring, page_metrics=True).iter_pages(pdf_path))
+    metric = monitoring.get_metric("pdf_page_extraction_duration_seconds")
+    assert metric.labels == {"file": str(pdf_path), "page": "3"}
+    assert monitoring.get_metric("pdf_extraction_duration_seconds").labels["pages"] == "3"
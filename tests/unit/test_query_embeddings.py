@@ -0,0 +1,92 @@
+"""Tests for the query-embedding fast path."""
+import pytest
+from unittest.mock import patch
+
+import src.api.main  # noqa: F401  (loads the routes package before importing main's helpers)
+from src.api.main import warm_query_embeddings
+from src.database.query_logger import QueryLogger
+from src.pipeline.embedding_backends import HashingBackend
+from src.pipeline.embeddings import EmbeddingGenerator, normalize_query
+
+
+class CountingBackend(HashingBackend):
+    """Hashing backend that records the texts it embeds."""
+
+    def __init__(self, **kwargs):
+        super().__init__(dim=16, **kwargs)
+        self.calls = []
+
+    async def embed(self, text):
+        self.calls.append(text)
+        return await super().embed(text)
+
+
+@pytest.fixture
+def generator(tmp_path):
+    return EmbeddingGenerator(cache_dir=tmp_path, backend=CountingBackend(), query_cache_size=3)
+
+
+def test_normalize_query():
+    """Case, width and whitespace variations normalize to one string."""
+    assert normalize_query("  Who is\tGANDALF?\n") == "who is gandalf?"
+    assert normalize_query("Ｗｈｏ ｉｓ Gandalf?") == "who is gandalf?"
+
+
+@pytest.mark.asyncio
+async def test_query_variants_share_one_embedding(generator):
+    """Trivial variations are served from the in-memory query cache."""
+    first = await generator.embed_query("Who is Gandalf?")
+    second = await generator.embed_query("  who IS   gandalf? ")
+
+    assert second is first
+    assert generator.backend.calls == ["who is gandalf?"]
+    assert (generator.query_cache_hits, generator.query_cache_misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_query_cache_is_bounded_lru(generator):
+    """The least recently used query is evicted when the cache is full."""
+    for query in ("a", "b", "c"):
+        await generator.embed_query(query)
+    await generator.embed_query("a")
+    await generator.embed_query("d")
+
+    assert list(generator._query_cache) == ["c", "a", "d"]
+
+
+@pytest.mark.asyncio
+async def test_warmup_from_popular_queries(generator, tmp_path):
+    """Popular logged queries are embedded ahead of the first search."""
+    query_logger = QueryLogger(str(tmp_path / "queries.db"))
+    await query_logger.initialize()
+    for query, times in (("Who is Frodo?", 3), ("Where is Mordor?", 2), ("What is mithril?", 1)):
+        for _ in range(times):
+            await query_logger.log_query(session_id="s", query=query)
+
+    assert await warm_query_embeddings(generator, query_logger, limit=2) == 2
+    assert set(generator._query_cache) == {"who is frodo?", "where is mordor?"}
+    # The most popular query is the most recently used
+    assert list(generator._query_cache)[-1] == "who is frodo?"
+
+    generator.backend.calls.clear()
+    with patch('httpx.AsyncClient') as mock_client:
+        await generator.embed_query("who is FRODO?")
+        mock_client.assert_not_called()
+    assert generator.backend.calls == []
+
+
+@pytest.mark.asyncio
+async def test_vector_store_search_uses_query_cache(tmp_path):
+    """VectorStore.search embeds queries through the normalized fast path."""
+    from src.database.vector_store import VectorStore
+
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", backend=CountingBackend())
+    store = VectorStore(persist_directory=str(tmp_path / "db"), embedding_generator=generator)
+    await store.add_documents(["Gandalf the Grey", "The Shire"], [{}, {}], ["d1", "d2"])
+
+    await store.search(["Gandalf the Grey"], n_results=1)
+    generator.backend.calls.clear()
+    results = await store.search(["gandalf  THE grey"], n_results=1)
+
+    assert generator.backend.calls == []
+    assert results["ids"][0] == ["d1"]
@@ -42,6 +42,14 @@ def recovery_manager(tmp_path):
     return RecoveryManager(tmp_path)
 
 
+def test_concurrent_operations_get_unique_ids(recovery_manager):
+    """Operations started within the same second do not overwrite each other."""
+    states = [recovery_manager.start_operation("process_pdf", {"n": n}) for n in range(3)]
+
+    assert len({state.operation_id for state in states}) == 3
+    assert len(recovery_manager.list_incomplete_operations()) == 3
+
+
 def test_recovery_manager_operations(recovery_manager):
     """Test RecoveryManager operation tracking."""
     # Start operation
@@ -87,9 +95,9 @@ async def test_retry_decorator():
 def mock_chunk_pipeline():
     """Create a mock ChunkPipeline."""
     pipeline = Mock(spec=ChunkPipeline)
-    pipeline.process_file.return_value = [
+    pipeline.iter_file.side_effect = lambda pdf_path: iter([
         TextChunk("test text", 1, 0, 1, {"test": "metadata"})
-    ]
+    ])
     return pipeline
 
 
@@ -133,7 +141,7 @@ async def test_orchestrator_recovery(tmp_path, mock_chunk_pipeline, mock_vector_
     assert stats.retry_successes == 1, f"Expected 1 retry success, got {stats.retry_successes}"
     assert stats.successful_files == 1, f"Expected 1 successful file, got {stats.successful_files}"
     assert stats.failed_files == 0, f"Expected 0 failed files, got {stats.failed_files}"
-    assert mock_chunk_pipeline.process_file.call_count == 1
+    assert mock_chunk_pipeline.iter_file.call_count == 1
     assert mock_vector_store.add_documents.call_count == 1
 
 
@@ -162,7 +170,7 @@ async def test_orchestrator_duplicate_prevention(
     await orchestrator.process_pdf(test_pdf)
     
     # Verify single processing
-    assert mock_chunk_pipeline.process_file.call_count == 1
+    assert mock_chunk_pipeline.iter_file.call_count == 1
     assert mock_vector_store.add_documents.call_count == 1
 
 
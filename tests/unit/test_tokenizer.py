@@ -0,0 +1,73 @@
+"""Tests for token counting and token-based chunk sizing."""
+import pickle
+
+import pytest
+
+from src.pipeline.chunker import SemanticChunker
+from src.pipeline.tokenizer import (
+    HeuristicTokenizer,
+    TIKTOKEN_AVAILABLE,
+    get_tokenizer,
+)
+
+PROSE = (
+    "Frodo Baggins left the Shire in the autumn of 3018, carrying the One Ring. "
+    "Gandalf had warned him that the Black Riders were searching for Baggins.\n"
+) * 40
+
+
+def test_heuristic_counts_words_numbers_and_punctuation():
+    """Short words are one token; long words, digits and punctuation add more."""
+    tokenizer = HeuristicTokenizer()
+    assert tokenizer("") == 0
+    assert tokenizer("the ring") == 2
+    assert tokenizer("extraordinary!") == 4  # 13 chars -> 3, plus "!"
+    assert tokenizer("3018") == 2
+
+
+def test_tokenizer_memoizes_and_pickles():
+    """Counts are cached per text and tokenizers survive pickling."""
+    tokenizer = HeuristicTokenizer()
+    tokenizer("a paragraph")
+    tokenizer("a paragraph")
+    assert tokenizer._cached_count.cache_info().hits == 1
+
+    clone = pickle.loads(pickle.dumps(tokenizer))
+    assert clone("a paragraph") == tokenizer("a paragraph")
+
+
+def test_get_tokenizer():
+    """Names resolve to shared instances; unknown names are rejected."""
+    assert get_tokenizer("heuristic") is get_tokenizer("heuristic")
+    expected = "tiktoken" if TIKTOKEN_AVAILABLE else "heuristic"
+    assert get_tokenizer("auto").name == expected
+    with pytest.raises(ValueError):
+        get_tokenizer("sentencepiece")
+
+
+def test_token_sized_chunks_fill_but_never_exceed_budget():
+    """Token-mode chunks stay within chunk_size tokens and pack it tightly."""
+    tokenizer = get_tokenizer("heuristic")
+    chunker = SemanticChunker(chunk_size=120, chunk_overlap=10,
+                              size_unit="tokens", tokenizer="heuristic")
+    chunks = chunker.create_chunks(PROSE, page_number=1)
+
+    sizes = [tokenizer(chunk.text) for chunk in chunks]
+    assert max(sizes) <= 120
+    assert min(sizes[:-1]) > 60
+    assert chunks[0].metadata["size_unit"] == "tokens"
+
+
+def test_token_mode_hard_cuts_unbroken_text():
+    """Text without any separator is cut by binary search on token length."""
+    chunker = SemanticChunker(chunk_size=20, chunk_overlap=0,
+                              size_unit="tokens", tokenizer="heuristic")
+    pieces = chunker._split_text("x" * 500)
+    assert "".join(pieces) == "x" * 500
+    assert all(get_tokenizer("heuristic")(p) <= 20 for p in pieces)
+    assert len(pieces) == 5
+
+
+def test_invalid_size_unit():
+    with pytest.raises(ValueError):
+        SemanticChunker(size_unit="words")
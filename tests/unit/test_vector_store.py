@@ -17,12 +17,18 @@ the main vector store data.
 Note: These tests require the Ollama service to be running with
 the nomic-embed-text model available.
 """
+import asyncio
+import json
 import pytest
 import tempfile
+import numpy as np
 from pathlib import Path
 from typing import List, Dict
 
 from src.database.vector_store import VectorStore, Document
+from src.pipeline.embedding_backends import HashingBackend
+from src.pipeline.embeddings import EmbeddingGenerator
+from src.pipeline.metadata import ChunkMetadata
 
 
 @pytest.fixture
@@ -89,6 +95,62 @@ async def test_add_with_custom_ids(vector_store: VectorStore):
     assert stats["total_documents"] == 2
 
 
+@pytest.mark.asyncio
+async def test_upsert_and_delete_documents(tmp_path):
+    """Re-adding an ID replaces the stored document; deleted IDs are removed."""
+    vector_store = VectorStore(
+        persist_directory=tmp_path / "db",
+        embedding_generator=EmbeddingGenerator(cache_dir=tmp_path / "cache", backend=HashingBackend())
+    )
+    await vector_store.add_documents(
+        ["Old text", "Other text"], [{"v": 1}, {"v": 1}], ids=["id1", "id2"]
+    )
+    await vector_store.add_documents(["New text"], [{"v": 2}], ids=["id1"])
+
+    assert vector_store.get_collection_stats()["total_documents"] == 2
+    assert vector_store.get_by_id("id1").text == "New text"
+
+    assert await vector_store.delete_documents(["id1", "missing"]) == 1
+    assert vector_store.get_by_id("id1") is None
+    assert VectorStore(persist_directory=vector_store.persist_directory).get_by_id("id2")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_flushes_persist_latest_collection(tmp_path):
+    """Concurrent writers are serialized, so the file always ends with every document."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", backend=HashingBackend())
+    vector_store = VectorStore(persist_directory=tmp_path / "db", embedding_generator=generator)
+    documents = await vector_store.embed_documents(
+        [f"Text {n}" for n in range(8)], [{"n": n} for n in range(8)]
+    )
+
+    await asyncio.gather(*(vector_store.add_embedded_documents([doc]) for doc in documents))
+
+    reloaded = VectorStore(persist_directory=tmp_path / "db", embedding_generator=generator)
+    assert reloaded.get_collection_stats()["total_documents"] == 8
+    assert not list((tmp_path / "db").glob("*.tmp"))
+
+
+@pytest.mark.asyncio
+async def test_embed_then_add_embedded_documents(tmp_path):
+    """Embedding and indexing as separate steps matches add_documents."""
+    generator = EmbeddingGenerator(cache_dir=tmp_path / "cache", backend=HashingBackend())
+    staged = VectorStore(persist_directory=tmp_path / "staged", embedding_generator=generator)
+    direct = VectorStore(persist_directory=tmp_path / "direct", embedding_generator=generator)
+    texts, metadata = ["First text", "Second text"], [{"n": 1}, {"n": 2}]
+
+    documents = await staged.embed_documents(texts, metadata)
+    assert staged.get_collection_stats()["total_documents"] == 0
+    ids = await staged.add_embedded_documents(documents)
+
+    assert ids == await direct.add_documents(texts, metadata)
+    # The second store reads the first one's vectors back from the compressed embedding cache
+    for doc_id in ids:
+        assert np.allclose(staged.get_by_id(doc_id).embedding, direct.get_by_id(doc_id).embedding, atol=1e-3)
+    with pytest.raises(ValueError):
+        await staged.add_embedded_documents([])
+
+
 @pytest.mark.asyncio
 async def test_search_with_filters(vector_store: VectorStore):
     """Test searching with metadata filters."""
@@ -283,4 +345,30 @@ async def test_add_documents_with_retry_error_logging(vector_store: VectorStore)
             await vector_store.add_documents_with_retry(
                 texts=["Test"],
                 metadata_list=[{"source": "test"}]
-            )
\ No newline at end of file
+            )
+
+@pytest.mark.asyncio
+async def test_shared_metadata_layers_persist_once(tmp_path):
+    """Shared metadata layers are written once and restored as shared objects."""
+    vector_store = VectorStore(
+        persist_directory=tmp_path / "db",
+        embedding_generator=EmbeddingGenerator(cache_dir=tmp_path / "cache", backend=HashingBackend())
+    )
+    document = {"source": "doc.pdf", "title": "Doc"}
+    metadata_list = [ChunkMetadata({"n": n}, document) for n in range(3)] + [{"plain": True}]
+    await vector_store.add_documents(["a", "b", "c", "d"], metadata_list, ids=["1", "2", "3", "4"])
+
+    saved = json.loads(vector_store.collection_path.read_text())
+    assert saved["shared"] == [document]
+
+    reloaded = VectorStore(
+        persist_directory=tmp_path / "db", embedding_generator=vector_store.embedding_generator
+    )
+    docs = reloaded.get_by_ids(["1", "2", "4"])
+    assert dict(docs[0].metadata) == {"source": "doc.pdf", "title": "Doc", "n": 0}
+    assert docs[0].metadata.layers[0] is docs[1].metadata.layers[0]
+    assert docs[2].metadata == {"plain": True}
+
+    results = await reloaded.search(["a"], n_results=4, where={"source": "doc.pdf"})
+    assert len(results["ids"][0]) == 3
+    assert all(type(m) is dict for m in results["metadatas"][0])